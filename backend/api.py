@@ -5,6 +5,7 @@ from backend.endpoints import (
     assembly_mirror,
     copy_design,
     generate_assembly,
+    jobs,
     linked_documents,
     references,
     update_featurescripts,
@@ -13,7 +14,6 @@ from onshape_api.endpoints import documents, versions
 from onshape_api.endpoints.documents import ElementType
 from onshape_api.exceptions import ApiError
 
-
 router = flask.Blueprint("api", __name__, url_prefix="/api", static_folder="dist")
 
 
@@ -39,6 +39,7 @@ router.register_blueprint(linked_documents.router)
 router.register_blueprint(references.router)
 router.register_blueprint(copy_design.router)
 router.register_blueprint(update_featurescripts.router)
+router.register_blueprint(jobs.router)
 
 
 @router.get("/default-name/<element_type>" + connect.instance_route("wv"))
@@ -48,7 +49,7 @@ def default_name(element_type: str, **kwargs):
     Route Args:
         element_type: The type of element to fetch. One of part-studio, assembly, or version.
     """
-    db = database.Database()
+    db = database.get_database()
     api = connect.get_api(db)
     document_path = connect.get_route_instance_path("wv")
     if element_type == "version":
@@ -3,14 +3,46 @@ from typing import Any, Iterable
 import onshape_api
 from onshape_api.endpoints.assemblies import get_assembly, get_assembly_features
 
+PART_KEYS = ("documentId", "elementId", "partId", "configuration", "documentVersion")
+"""The keys which identify the part an instance is of."""
+
+
+def get_part_key(instance_or_part: dict) -> tuple:
+    """Returns a hashable key which is equal for a part and each of its instances."""
+    return tuple(instance_or_part.get(key, None) for key in PART_KEYS)
+
 
 class Assembly:
-    """Contains information from Onshape about an assembly."""
+    """Contains information from Onshape about an assembly.
+
+    Parts, instances, and mate connectors are indexed once on construction, so lookups take constant time.
+    """
 
     def __init__(self, assembly_data: dict, path: onshape_api.ElementPath) -> None:
         self.assembly_data = assembly_data
         self.path = path
 
+        self._parts_by_key: dict[tuple, dict] = {}
+        for part in self.get_parts():
+            self._parts_by_key.setdefault(get_part_key(part), part)
+        self._instances_by_id = dict(
+            (instance["id"], instance) for instance in self.get_instances()
+        )
+
+        self._part_paths_to_mate_ids: dict[onshape_api.PartPath, list[str]] = {}
+        self._mate_ids_to_part_paths: dict[str, list[onshape_api.PartPath]] = {}
+        for part in self._parts_by_key.values():
+            mate_ids = [
+                mate_connector["featureId"]
+                for mate_connector in part.get("mateConnectors", [])
+            ]
+            if not mate_ids:
+                continue
+            part_path = self.resolve_part_path(part)
+            self._part_paths_to_mate_ids.setdefault(part_path, []).extend(mate_ids)
+            for mate_id in mate_ids:
+                self._mate_ids_to_part_paths.setdefault(mate_id, []).append(part_path)
+
     def get_parts(self) -> list:
         return self.assembly_data.get("parts", [])
 
@@ -18,42 +50,38 @@ class Assembly:
         """Returns the part corresponding to a given instance.
 
         The instance must be for a part.
+
+        Raises:
+            ValueError: If the assembly has no part matching instance.
         """
-        return next(
-            part
-            for part in self.get_parts()
-            if are_keys_equal(
-                instance,
-                part,
-                "partId",
-                "configuration",
-                "documentId",
-                "elementId",
-                "documentVersion",
+        part = self._parts_by_key.get(get_part_key(instance))
+        if part is None:
+            raise ValueError(
+                "Failed to find the part of instance {}".format(instance.get("id"))
             )
-        )
+        return part
 
     def get_instances(self) -> list[dict]:
         return self.assembly_data["rootAssembly"].get("instances", [])
 
+    def get_instance(self, instance_id: str) -> dict | None:
+        """Returns the instance of the root assembly with the given id, or None if there isn't one."""
+        return self._instances_by_id.get(instance_id)
+
     def extract_unique_part_studios(self) -> set[onshape_api.ElementPath]:
         """Constructs a set of unique part studio paths in the assembly."""
-        return set(self.resolve_path(part) for part in self.get_parts())
+        return set(self.resolve_path(part) for part in self._parts_by_key.values())
 
     def get_part_paths_to_mate_ids(self) -> dict[onshape_api.PartPath, list[str]]:
-        """Constructs a dict which maps part paths to a list of the unique mate ids owned by each part."""
+        """Returns a dict which maps part paths to a list of the unique mate ids owned by each part.
 
-        result = {}
-        for part in self.get_parts():
-            part_path = onshape_api.PartPath.from_path(
-                self.resolve_path(part), part["partId"]
-            )
-            for mate_connector in part.get("mateConnectors", []):
-                mate_id = mate_connector["featureId"]
-                values = result.get(part_path, [])
-                values.append(mate_id)
-                result[part_path] = values
-        return result
+        Parts without mate connectors are omitted. The dict is shared, so callers shouldn't modify it.
+        """
+        return self._part_paths_to_mate_ids
+
+    def get_mate_connector_part_paths(self, mate_id: str) -> list[onshape_api.PartPath]:
+        """Returns the paths of the parts owning the mate connector with the given feature id."""
+        return self._mate_ids_to_part_paths.get(mate_id, [])
 
     def resolve_part_path(self, instance_or_part: dict) -> onshape_api.PartPath:
         """Constructs a part path to a given instance or part.
@@ -92,49 +120,100 @@ def assembly(api: onshape_api.Api, assembly_path: onshape_api.ElementPath) -> As
     return Assembly(assembly_data, assembly_path)
 
 
-def are_keys_equal(first: dict, second: dict, *keys: Iterable[str]) -> bool:
-    """Returns true if the value of each key in first and second are equal."""
-    return all(first.get(key, None) == second.get(key, None) for key in keys)
+class AssemblyFeatures:
+    """Contains the features of an assembly.
 
+    The mate connectors used by fastened mates are indexed once on construction, so checking whether a mate
+    connector is used takes constant time.
+    """
 
-class AssemblyFeatures:
     def __init__(self, features: dict) -> None:
         self.features = features
+        self._parameters = dict(
+            (feature["featureId"], get_parameters(feature))
+            for feature in self.get_features()
+            if "featureId" in feature
+        )
+        self._used_mate_connectors: dict[str, set[str]] = {}
+        for feature in self.get_fastened_mates():
+            parameters = self.get_feature_parameters(feature)
+            queries = get_parameter(feature, "mateConnectorsQuery", parameters)[
+                "queries"
+            ]
+            for query in queries:
+                if query.get("path"):
+                    self._used_mate_connectors.setdefault(query["path"][0], set()).add(
+                        query["featureId"]
+                    )
 
     def get_features(self) -> list[dict]:
         return self.features.get("features", [])
 
+    def get_feature_parameters(self, feature: dict) -> dict[str, Any]:
+        """Returns a dict mapping the parameter ids of a feature of the assembly to its parameters."""
+        parameters = self._parameters.get(feature.get("featureId", None))
+        return get_parameters(feature) if parameters is None else parameters
+
     def get_fastened_mates(self) -> Iterable[dict]:
         for feature in self.get_features():
-            if is_fastened_mate(feature):
+            if is_fastened_mate(feature, self.get_feature_parameters(feature)):
                 yield feature
 
+    def get_used_mate_connectors(self, instance: dict) -> set[str]:
+        """Returns the ids of the mate connectors of an instance which are used in a fastened mate feature."""
+        return self._used_mate_connectors.get(instance["id"], set())
+
+    def get_unused_mate_connectors(
+        self, instance: dict, mate_ids: Iterable[str]
+    ) -> list[str]:
+        """Returns the mate_ids of an instance which aren't used in a fastened mate feature, in order."""
+        used = self.get_used_mate_connectors(instance)
+        return [mate_id for mate_id in mate_ids if mate_id not in used]
+
     def is_mate_connector_used(self, instance: dict, mate_id: str) -> bool:
         """Returns true if the mate connector is already used in a fastened mate feature."""
-        # We could remove O(N^2) algo by returning a dict mapping instance ids to used mate connectors
-        for feature in self.get_fastened_mates():
-            queries = get_parameter(feature, "mateConnectorsQuery")
-            if any(
-                query["featureId"] == mate_id and query["path"][0] == instance["id"]
-                for query in queries
-            ):
-                return True
-        return False
+        return mate_id in self.get_used_mate_connectors(instance)
+
+
+def get_parameters(feature: dict) -> dict[str, Any]:
+    """Returns a dict mapping the parameter ids of a feature to its parameters."""
+    return dict(
+        (parameter["parameterId"], parameter)
+        for parameter in feature.get("parameters", [])
+        if "parameterId" in parameter
+    )
 
 
-def is_fastened_mate(feature: dict) -> bool:
-    """Returns true if feature is a fastened mate."""
+def is_fastened_mate(feature: dict, parameters: dict[str, Any] | None = None) -> bool:
+    """Returns true if feature is a fastened mate.
+
+    Args:
+        parameters: The parameters of feature (see get_parameters), if already known.
+    """
     if feature.get("featureType", None) != "mate":
         return False
-    mate_type = get_parameter(feature, "mateType")
+    if parameters is None:
+        parameters = get_parameters(feature)
+    mate_type = parameters.get("mateType")
     return mate_type != None and mate_type.get("value", None) == "FASTENED"
 
 
-def get_parameter(feature: dict, parameter_id: str) -> Any:
-    for parameter in feature.get("parameters", []):
-        if parameter.get("parameterId", None) == parameter_id:
-            return parameter
-    raise ValueError("Failed to find parameter {}".format(parameter_id))
+def get_parameter(
+    feature: dict, parameter_id: str, parameters: dict[str, Any] | None = None
+) -> Any:
+    """Returns a parameter of feature.
+
+    Args:
+        parameters: The parameters of feature (see get_parameters), if already known.
+
+    Raises:
+        ValueError: If feature has no parameter with the given id.
+    """
+    if parameters is None:
+        parameters = get_parameters(feature)
+    if parameter_id not in parameters:
+        raise ValueError("Failed to find parameter {}".format(parameter_id))
+    return parameters[parameter_id]
 
 
 def assembly_features(
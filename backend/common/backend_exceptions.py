@@ -1,8 +1,14 @@
 from http import HTTPStatus
+from typing import Iterable
 
 from onshape_api.api.api_base import Api
 from onshape_api.endpoints.documents import get_document
-from onshape_api.endpoints.permissions import Permission, get_permissions
+from onshape_api.endpoints.permissions import (
+    MAX_BATCH_WORKERS,
+    Permission,
+    get_permissions,
+    get_permissions_batch,
+)
 from onshape_api.paths.paths import DocumentPath
 
 
@@ -30,10 +36,11 @@ class ClientException(Exception):
     def __init__(
         self,
         message: str,
+        status_code: HTTPStatus = HTTPStatus.BAD_REQUEST,
     ):
         super().__init__()
         self.message = message
-        self.status_code = HTTPStatus.BAD_REQUEST
+        self.status_code = status_code
 
     def to_dict(self):
         return {"type": "CLIENT_EXCEPTION", "message": self.message}
@@ -65,14 +72,43 @@ class MissingPermission(Exception):
 
 def require_permissions(api: Api, path: DocumentPath, *needed_permissions: Permission):
     """Throws an exception if the current user doesn't have given permissions for the given document."""
-    permissions = get_permissions(api, path)
+    _check_permissions(api, path, get_permissions(api, path), needed_permissions)
+
+
+def require_permissions_batch(
+    api: Api,
+    paths: Iterable[DocumentPath],
+    *needed_permissions: Permission,
+    max_workers: int = MAX_BATCH_WORKERS,
+):
+    """Throws an exception if the current user doesn't have given permissions for every document in paths.
+
+    Documents are checked concurrently. If several are missing permissions, the first in paths is reported.
+    """
+    paths = list(paths)
+    permissions = get_permissions_batch(api, paths, max_workers)
+    for path in paths:
+        _check_permissions(api, path, permissions[path.document_id], needed_permissions)
+
+
+def _check_permissions(
+    api: Api,
+    path: DocumentPath,
+    permissions: list[Permission],
+    needed_permissions: Iterable[Permission],
+):
     if permissions == []:
         raise MissingPermission(Permission.READ, path.document_id)
 
     for permission in needed_permissions:
         if permission not in permissions:
-            try:
-                document_name = get_document(api, path)["name"]
-            except:
-                document_name = None
+            document_name = get_document_name(api, path)
             raise MissingPermission(permission, path.document_id, document_name)
+
+
+def get_document_name(api: Api, path: DocumentPath) -> str | None:
+    """Returns the name of a document, or None if it can't be read."""
+    try:
+        return get_document(api, path)["name"]
+    except:
+        return None
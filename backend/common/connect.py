@@ -1,6 +1,7 @@
 """Serves as an abstraction layer for connecting with the Onshape API and the current flask request."""
 
 import enum
+import functools
 from typing import Any
 
 from uuid import uuid4
@@ -9,7 +10,9 @@ from requests_oauthlib import OAuth2Session
 
 from backend.common.database import Database
 import onshape_api
-from backend.common import backend_exceptions, env
+from backend.common import backend_exceptions, env, metrics, token_refresh
+from onshape_api.api.cache import LruCache
+from onshape_api.api.memo import RequestMemo
 from onshape_api.paths.instance_type import InstanceType
 
 
@@ -29,19 +32,44 @@ def save_token(db: Database, token) -> None:
     set_session_data(db, {"token": token})
 
 
+SESSION_CACHE_BYTES = 16_000_000
+
+_session_cache = LruCache(SESSION_CACHE_BYTES)
+"""Caches session data by session id, so most requests don't need to read from Firestore."""
+
+
 def get_session_data(db: Database) -> dict:
     session_id = get_session_id()
+    found, session_data = _session_cache.get(session_id)
+    if found:
+        return session_data
+
     doc_ref = db.sessions.document(document_id=session_id)
     doc = doc_ref.get()
     if not doc.exists or (session_data := doc.to_dict()) is None:
-        session_data = {"token": None}
+        # Not cached, since the user may be signing in using another worker
+        return {"token": None}
+    _session_cache.set(session_id, session_data, env.session_cache_ttl)
     return session_data
 
 
 def set_session_data(db: Database, session_data: dict) -> None:
-    session_id = get_session_id()
+    write_session_data(db, get_session_id(), session_data)
+
+
+def write_session_data(db: Database, session_id: str, session_data: dict) -> None:
+    """Replaces the data of a session in Firestore and the session cache.
+
+    Unlike set_session_data, this may be called outside of a flask request, e.g. by an Api worker thread.
+    """
     doc_ref = db.sessions.document(document_id=session_id)
     doc_ref.set(session_data)
+    cache_session_data(session_id, session_data)
+
+
+def cache_session_data(session_id: str, session_data: dict) -> None:
+    """Replaces the data of a session in the session cache only, e.g. with a token another worker already saved."""
+    _session_cache.set(session_id, session_data, env.session_cache_ttl)
 
 
 base_url = "https://oauth.onshape.com/oauth"
@@ -67,16 +95,26 @@ def get_oauth_session(
         "client_id": env.client_id,
         "client_secret": env.client_secret,
     }
+    session_id = get_session_id()
 
     def _save_token(token) -> None:
-        save_token(db, token)
+        write_session_data(db, session_id, {"token": token})
 
-    return OAuth2Session(
+    def _adopt_token(token) -> None:
+        cache_session_data(session_id, {"token": token})
+
+    # Refreshes are coordinated with other requests for the same session, so the token is refreshed only once
+    return token_refresh.CoordinatedOAuth2Session(
+        db,
+        session_id,
+        _save_token,
         env.client_id,
+        adopt=_adopt_token,
         token=get_token(db),
         auto_refresh_url=token_url,
         auto_refresh_kwargs=refresh_kwargs,
-        token_updater=_save_token,
+        # The token is saved as part of the coordinated refresh
+        token_updater=lambda token: None,
     )
 
 
@@ -88,8 +126,67 @@ def element_route(wvm_param: str = "w"):
     return instance_route(wvm_param) + "/e/<element_id>"
 
 
+def get_request_memo() -> RequestMemo | None:
+    """Returns the memo shared by every Api of the current request, creating it on first use.
+
+    Identical reads made while handling a request are only sent to Onshape once, until a write to the same document.
+    Returns None outside of a request.
+    """
+    if not flask.has_request_context():
+        return None
+    memo = flask.g.get("request_memo")
+    if memo is None:
+        memo = RequestMemo()
+        flask.g.request_memo = memo
+    return memo
+
+
 def get_api(db: Database) -> onshape_api.OAuthApi:
-    return onshape_api.make_oauth_api(get_oauth_session(db))
+    # Every request in a session shares a single rate limit
+    return onshape_api.make_oauth_api(
+        get_oauth_session(db),
+        user_key=get_session_id(),
+        hooks=metrics.get_request_hooks(),
+        memo=get_request_memo(),
+    )
+
+
+def get_async_api(db: Database) -> onshape_api.AsyncOAuthApi:
+    """Returns an AsyncApi for the current session.
+
+    The AsyncApi should be closed (e.g. via async with) before the request finishes.
+    """
+    session_id = get_session_id()
+
+    def _save_token(token) -> None:
+        write_session_data(db, session_id, {"token": token})
+
+    def _adopt_token(token) -> None:
+        cache_session_data(session_id, {"token": token})
+
+    async def _refresh_token(old_token: dict) -> dict:
+        # Refreshed like get_oauth_session, so sync and async requests for the same session share one refresh
+        session = OAuth2Session(env.client_id, token=old_token)
+        refresh = functools.partial(
+            session.refresh_token,
+            token_url,
+            client_id=env.client_id,
+            client_secret=env.client_secret,
+        )
+        return await token_refresh.refresh_once_async(
+            db, session_id, old_token, refresh, _save_token, _adopt_token
+        )
+
+    return onshape_api.make_async_oauth_api(
+        get_token(db),
+        env.client_id,
+        env.client_secret,
+        token_url,
+        token_refresher=_refresh_token,
+        user_key=session_id,
+        hooks=metrics.get_request_hooks(),
+        memo=get_request_memo(),
+    )
 
 
 def get_route_instance_path(wvm_param: str = "w") -> onshape_api.InstancePath:
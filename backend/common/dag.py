@@ -0,0 +1,119 @@
+"""Sorts and executes directed acyclic graphs, e.g. of linked documents.
+
+Graphs map each node to the nodes it depends on. Every dependency must also be a node of the graph.
+"""
+
+from concurrent import futures
+from typing import Callable, Mapping, Sequence, TypeVar
+
+__all__ = ["CycleError", "topological_sort", "run_dag"]
+
+T = TypeVar("T")
+
+
+class CycleError(Exception):
+    """Raised when a graph contains a cycle.
+
+    Attributes:
+        cycle: The nodes of the cycle, in order, starting and ending with the same node.
+    """
+
+    def __init__(self, cycle: list[str]):
+        super().__init__("Cycle detected: " + " -> ".join(cycle))
+        self.cycle = cycle
+
+
+def get_dependents(dependencies: Mapping[str, Sequence[str]]) -> dict[str, list[str]]:
+    """Inverts a graph, mapping each node to the nodes which depend on it."""
+    dependents: dict[str, list[str]] = dict((node, []) for node in dependencies)
+    for node, node_dependencies in dependencies.items():
+        for dependency in node_dependencies:
+            dependents[dependency].append(node)
+    return dependents
+
+
+def topological_sort(dependencies: Mapping[str, Sequence[str]]) -> list[str]:
+    """Returns the nodes of a graph ordered so every node comes after its dependencies.
+
+    Runs in linear time in the size of the graph.
+
+    Raises:
+        CycleError: If the graph contains a cycle.
+    """
+    dependents = get_dependents(dependencies)
+    remaining = dict((node, len(set(deps))) for node, deps in dependencies.items())
+    ready = [node for node, count in remaining.items() if count == 0]
+    order = []
+    while ready:
+        node = ready.pop()
+        order.append(node)
+        for dependent in set(dependents[node]):
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                ready.append(dependent)
+
+    if len(order) < len(dependencies):
+        blocked = set(node for node, count in remaining.items() if count > 0)
+        raise CycleError(find_cycle(dependencies, blocked))
+    return order
+
+
+def find_cycle(
+    dependencies: Mapping[str, Sequence[str]], blocked: set[str]
+) -> list[str]:
+    """Returns a cycle among blocked, the nodes a topological sort couldn't order.
+
+    Every blocked node depends on another blocked node, so following dependencies must eventually revisit a node.
+    """
+    node = next(iter(blocked))
+    visited: dict[str, int] = {}
+    path = []
+    while node not in visited:
+        visited[node] = len(path)
+        path.append(node)
+        node = next(dep for dep in dependencies[node] if dep in blocked)
+    cycle = path[visited[node] :] + [node]
+    # Report the cycle in the direction of dependents, e.g. child -> parent
+    cycle.reverse()
+    return cycle
+
+
+def run_dag(
+    dependencies: Mapping[str, Sequence[str]],
+    fn: Callable[[str], T],
+    max_workers: int,
+) -> dict[str, T]:
+    """Calls fn on every node of a graph once all of its dependencies have finished.
+
+    Nodes whose dependencies are done run concurrently, up to max_workers at once.
+    If fn raises, no further nodes are started and the error is re-raised once running nodes finish.
+
+    Returns a dict mapping each node to the result of fn.
+
+    Raises:
+        CycleError: If the graph contains a cycle. No nodes are run.
+    """
+    topological_sort(dependencies)
+    dependents = get_dependents(dependencies)
+    remaining = dict((node, len(set(deps))) for node, deps in dependencies.items())
+    results: dict[str, T] = {}
+
+    with futures.ThreadPoolExecutor(max_workers) as executor:
+        running = dict(
+            (executor.submit(fn, node), node)
+            for node, count in remaining.items()
+            if count == 0
+        )
+        while running:
+            done, _ = futures.wait(running, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                if future.exception() is not None:
+                    futures.wait(running)
+                    raise future.exception()  # type: ignore
+                results[node] = future.result()
+                for dependent in set(dependents[node]):
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        running[executor.submit(fn, dependent)] = dependent
+    return results
@@ -1,9 +1,47 @@
+import os
+import threading
+
+import flask
 from google.cloud import firestore
 
+_client: firestore.Client | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> firestore.Client:
+    """Returns the process wide Firestore client, creating it on first use.
+
+    The client is thread safe, so it's shared by every worker thread.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = firestore.Client()
+    return _client
+
+
+def _reset_client() -> None:
+    """Drops the client inherited from the parent process.
+
+    gRPC channels don't survive a fork, so a client created before gunicorn forks its workers (e.g. with --preload)
+    is recreated in each worker rather than shared.
+    """
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_client)
+
 
 class Database:
-    def __init__(self):
-        self.db = firestore.Client()
+    def __init__(self, client: firestore.Client | None = None):
+        """
+        Args:
+            client: The Firestore client to use. Defaults to the process wide client.
+        """
+        self.db = client or get_client()
 
     @property
     def sessions(self) -> firestore.CollectionReference:
@@ -12,3 +50,21 @@ class Database:
     @property
     def linked_documents(self) -> firestore.CollectionReference:
         return self.db.collection("linked-documents")
+
+    @property
+    def jobs(self) -> firestore.CollectionReference:
+        return self.db.collection("jobs")
+
+
+def get_database() -> Database:
+    """Returns the Database of the current flask request, creating it on first use.
+
+    Outside of a request, a new Database using the process wide client is returned.
+    """
+    if not flask.has_request_context():
+        return Database()
+    db = flask.g.get("database")
+    if db is None:
+        db = Database()
+        flask.g.database = db
+    return db
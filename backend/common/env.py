@@ -8,3 +8,15 @@ client_secret = os.environ["OAUTH_CLIENT_SECRET"]
 session_secret = os.environ["SESSION_SECRET"]
 
 is_production = os.getenv("NODE_ENV", "production") == "production"
+
+session_cache_ttl = float(os.getenv("SESSION_CACHE_TTL", 60))
+"""The number of seconds session data is cached in memory for.
+
+Other workers may update a session, so the cache may be stale for up to this long.
+"""
+
+metrics_token = os.getenv("METRICS_TOKEN")
+"""The bearer token required to read /metrics. If unset, /metrics is only served outside of production."""
+
+job_store = os.getenv("JOB_STORE", "firestore")
+"""Where background jobs are stored. Either firestore, or memory, which only works with a single worker process."""
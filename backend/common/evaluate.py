@@ -1,18 +1,75 @@
-""""Utilities for evaluating FeatureScripts against part studios."""
+"""Utilities for evaluating FeatureScripts against part studios."""
 
 from concurrent import futures
 import dataclasses
-import pathlib
+import hashlib
 from typing import Iterable, TypedDict
 import onshape_api
+from backend.common import scripts
+from onshape_api.api.cache import LruCache, make_cache_key
 from onshape_api.endpoints.part_studios import evaluate_feature_script
+from onshape_api.paths.instance_type import InstanceType
 
-SCRIPT_PATH = pathlib.Path("../scripts")
+MAX_EVALUATION_WORKERS = 8
+"""The max number of scripts evaluate_scripts evaluates at once."""
 
+EVALUATION_CACHE_BYTES = 32_000_000
 
-def open_script(script_name: str):
-    with (SCRIPT_PATH / pathlib.Path("{}.fs".format(script_name))).open() as file:
-        return file.read()
+_evaluation_cache = LruCache(EVALUATION_CACHE_BYTES)
+"""Caches the results of scripts evaluated against versions and microversions, which never change."""
+
+
+def make_evaluation_key(
+    api: onshape_api.Api, script: str, part_studio_path: onshape_api.ElementPath
+) -> str | None:
+    """Returns the key the result of evaluating script against part_studio_path is cached with.
+
+    Returns None if the result can't be cached, i.e. part_studio_path is a workspace.
+    """
+    if part_studio_path.instance_type == InstanceType.WORKSPACE:
+        return None
+    script_hash = hashlib.sha256(script.encode()).hexdigest()
+    return make_cache_key(
+        "FEATURESCRIPT", str(part_studio_path), script_hash, api.user_key
+    )
+
+
+def evaluate_cached(
+    api: onshape_api.Api, part_studio_path: onshape_api.ElementPath, script: str
+) -> dict:
+    """Evaluates script against part_studio_path, reusing the result of a previous evaluation of the same version."""
+    key = make_evaluation_key(api, script, part_studio_path)
+    if key is not None:
+        found, result = _evaluation_cache.get(key)
+        if found:
+            return result
+    result = evaluate_feature_script(api, part_studio_path, script)
+    if key is not None:
+        _evaluation_cache.set(key, result)
+    return result
+
+
+def evaluate_scripts(
+    api: onshape_api.Api,
+    script_name: str,
+    part_studio_paths: Iterable[onshape_api.ElementPath],
+    max_workers: int = MAX_EVALUATION_WORKERS,
+) -> dict[str, dict]:
+    """Evaluates a script against many part studios concurrently.
+
+    Each unique part studio is evaluated once, no matter how many times it appears in part_studio_paths.
+
+    Returns a dict mapping str(path) of each part studio to the result of the script.
+    """
+    unique_paths = dict((str(path), path) for path in part_studio_paths)
+    if not unique_paths:
+        return {}
+    script = scripts.get_script(script_name)
+    with futures.ThreadPoolExecutor(min(max_workers, len(unique_paths))) as executor:
+        results = executor.map(
+            lambda path: evaluate_cached(api, path, script), unique_paths.values()
+        )
+        return dict(zip(unique_paths.keys(), results))
 
 
 class AutoAssemblyBase(TypedDict):
@@ -27,58 +84,53 @@ class AutoAssemblyTarget(TypedDict):
 def evalute_auto_assembly_part(
     api: onshape_api.Api, part_studio_path: onshape_api.ElementPath
 ) -> dict:
-    return evaluate_feature_script(
-        api, part_studio_path, open_script("parseAutoAssembly")
+    return evaluate_cached(
+        api, part_studio_path, scripts.get_script(scripts.BASE_SCRIPT)
     )
 
 
 def evalute_auto_assembly_target_part(
     api: onshape_api.Api, part_studio_path: onshape_api.ElementPath
 ) -> dict:
-    return evaluate_feature_script(
-        api, part_studio_path, open_script("parseAutoAssemblyTarget")
+    return evaluate_cached(
+        api, part_studio_path, scripts.get_script(scripts.TARGET_SCRIPT)
     )
 
 
 def evaluate_assembly_mirror_part(
     api: onshape_api.Api, part_studio_path: onshape_api.ElementPath
 ) -> dict:
-    return evaluate_feature_script(
-        api, part_studio_path, open_script("parseAssemblyMirror")
+    return evaluate_cached(
+        api, part_studio_path, scripts.get_script(scripts.BASE_SCRIPT)
     )
 
 
 def evaluate_assembly_mirror_parts(
     api: onshape_api.Api, part_studio_paths: Iterable[onshape_api.ElementPath]
 ) -> tuple[dict[str, str], set[str]]:
-    """Runs the assembly mirror scripts against the given part_studio_paths and aggregates the results.
+    """Runs the base script against the given part_studio_paths and aggregates the results.
 
     Returns a tuple with two elements:
         base_to_target_mates: A dict mapping base mate ids to target mate ids.
         origin_base_mates: A set of origin base mate ids.
     """
-    with futures.ThreadPoolExecutor() as executor:
-        threads = [
-            executor.submit(evaluate_assembly_mirror_part, api, part_studio_path)
-            for part_studio_path in part_studio_paths
-        ]
-
-        base_to_target_mates = dict()
-        origin_base_mates = set()
-
-        for future in futures.as_completed(threads):
-            script_results = future.result()
-            if not script_results["valid"]:
-                continue
-            for script_result in script_results["mirrors"]:
-                if script_result["mateToOrigin"]:
-                    origin_base_mates.add(script_result["baseMateId"])
-                else:
-                    base_to_target_mates[script_result["baseMateId"]] = script_result[
-                        "targetMateId"
-                    ]
-
-        return (base_to_target_mates, origin_base_mates)
+    results = evaluate_scripts(api, scripts.BASE_SCRIPT, part_studio_paths)
+
+    base_to_target_mates = dict()
+    origin_base_mates = set()
+    for script_results in results.values():
+        if not script_results["valid"]:
+            continue
+        for script_result in script_results["mirrors"]:
+            # The mirror attribute is on the base (end) mate, which references the target (start) mate
+            if script_result["mateToOrigin"]:
+                origin_base_mates.add(script_result["endMateId"])
+            else:
+                base_to_target_mates[script_result["endMateId"]] = script_result[
+                    "startMateId"
+                ]
+
+    return (base_to_target_mates, origin_base_mates)
 
 
 @dataclasses.dataclass
@@ -91,29 +143,24 @@ class PartMaps:
 
 
 def evalute_auto_assembly_parts(
-    api: onshape_api.Api, part_studio_paths: set[onshape_api.ElementPath]
+    api: onshape_api.Api, part_studio_paths: Iterable[onshape_api.ElementPath]
 ):
-    with futures.ThreadPoolExecutor() as executor:
-        threads = [
-            executor.submit(evalute_auto_assembly_part, api, part_studio_path)
-            for part_studio_path in part_studio_paths
-        ]
+    results = evaluate_scripts(api, scripts.BASE_SCRIPT, part_studio_paths)
 
-        part_maps = PartMaps()
-        for future in futures.as_completed(threads):
-            result = future.result()
-            if not result["valid"]:
-                continue
+    part_maps = PartMaps()
+    for result in results.values():
+        if not result["valid"]:
+            continue
 
-            for values in result["mates"]:
-                part_maps.mates_to_targets[values["mateId"]] = onshape_api.ElementPath(
-                    values["documentId"],
-                    values["instanceId"],
-                    values["elementId"],
-                    values["workspaceOrVersion"],
-                )
+        for values in result["mates"]:
+            part_maps.mates_to_targets[values["mateId"]] = onshape_api.ElementPath(
+                values["documentId"],
+                values["workspaceId"],
+                values["elementId"],
+                values["workspaceOrVersion"],
+            )
 
-        return part_maps
+    return part_maps
 
 
 def evaluate_targets(
@@ -121,23 +168,15 @@ def evaluate_targets(
 ) -> dict[str, str]:
     """Converts a dict mapping mate_ids to target part studios into a dict mapping target part studio mate ids to original mate ids.
 
+    Each target part studio is only evaluated once, even if many mates target it.
+
     Args:
         mates_to_targets: A mapping of mate ids to the target part studio to evaluate.
     Returns:
         A mapping of target mate ids to original mate ids.
-
-    TODO: Deduplicate target part studios and re-associate the data afterwards."""
-    with futures.ThreadPoolExecutor() as executor:
-        threads = {
-            executor.submit(
-                evalute_auto_assembly_target_part, api, part_studio_path
-            ): target_mate_id
-            for target_mate_id, part_studio_path in mates_to_targets.items()
-        }
-
-        targets_to_mate_connectors = {}
-        for future in futures.as_completed(threads):
-            result = future.result()
-            target_mate_id = threads[future]
-            targets_to_mate_connectors[target_mate_id] = result["targetMateId"]
-        return targets_to_mate_connectors
+    """
+    results = evaluate_scripts(api, scripts.TARGET_SCRIPT, mates_to_targets.values())
+    return dict(
+        (target_mate_id, results[str(part_studio_path)]["targetMateId"])
+        for target_mate_id, part_studio_path in mates_to_targets.items()
+    )
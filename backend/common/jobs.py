@@ -0,0 +1,421 @@
+"""Runs long-running backend operations on a local worker pool, outside of the request which started them.
+
+Submitting a job returns its id immediately. The job's status and progress are kept in a JobStore, so any worker can
+report on or cancel it, while the job itself runs on the worker which accepted it.
+
+Submits with an Idempotency-Key header are idempotent: retrying returns the existing job rather than starting another.
+A job which failed or was cancelled is restarted instead.
+"""
+
+import abc
+import copy
+import enum
+import functools
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent import futures
+from http import HTTPStatus
+from typing import Callable
+
+import flask
+from google.api_core import exceptions as google_exceptions
+from google.cloud import firestore
+
+from backend.common import backend_exceptions, connect, database, env, metrics
+
+__all__ = [
+    "JobStatus",
+    "JobCancelled",
+    "JobContext",
+    "JobFn",
+    "JobStore",
+    "FirestoreJobStore",
+    "MemoryJobStore",
+    "get_store",
+    "submit",
+    "cancel",
+    "to_json",
+]
+
+logger = logging.getLogger(__name__)
+
+MAX_JOB_WORKERS = int(os.getenv("MAX_JOB_WORKERS", 4))
+"""The max number of jobs each worker process runs at once. Further jobs are queued."""
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+CANCEL_CHECK_INTERVAL = 5
+"""The min number of seconds between a running job's reads of its cancel flag from the JobStore.
+
+Cancelling a job on the worker running it is noticed immediately. On another worker, it may take this long.
+"""
+
+
+class JobStatus(enum.StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED = frozenset([JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED])
+"""The statuses of jobs which are no longer running."""
+
+RESTARTABLE = frozenset([JobStatus.FAILED, JobStatus.CANCELLED])
+"""The statuses of jobs which are restarted when submitted again."""
+
+
+class JobCancelled(Exception):
+    """Raised by JobContext.check_cancelled when a job's cancellation has been requested."""
+
+
+class JobStore(abc.ABC):
+    """Stores the state of jobs, keyed by job id."""
+
+    @abc.abstractmethod
+    def create(self, job_id: str, data: dict) -> tuple[bool, dict]:
+        """Stores a new job, unless a job with job_id already exists.
+
+        Returns a tuple of whether the job was created and the stored job.
+        """
+        ...
+
+    @abc.abstractmethod
+    def restart(self, job_id: str, data: dict) -> tuple[bool, dict]:
+        """Atomically replaces a job with data if its status is RESTARTABLE, keeping its createdAt.
+
+        Of several concurrent restarts of the same job, only one succeeds.
+        Returns a tuple of whether the job was restarted and the stored job.
+        """
+        ...
+
+    @abc.abstractmethod
+    def get(self, job_id: str) -> dict | None: ...
+
+    @abc.abstractmethod
+    def update(self, job_id: str, fields: dict) -> None: ...
+
+    @abc.abstractmethod
+    def add_event(self, job_id: str, event: dict, fields: dict) -> None:
+        """Appends event to the events of a job, and updates fields."""
+        ...
+
+
+class FirestoreJobStore(JobStore):
+    """Stores jobs in Firestore, so they're visible to every worker."""
+
+    def __init__(self, db: database.Database) -> None:
+        self.db = db
+
+    def create(self, job_id: str, data: dict) -> tuple[bool, dict]:
+        doc_ref = self.db.jobs.document(job_id)
+        try:
+            doc_ref.create(data)
+            return (True, data)
+        except google_exceptions.AlreadyExists:
+            return (False, doc_ref.get().to_dict() or {})
+
+    def restart(self, job_id: str, data: dict) -> tuple[bool, dict]:
+        doc_ref = self.db.jobs.document(job_id)
+
+        @firestore.transactional
+        def restart(transaction: firestore.Transaction) -> tuple[bool, dict]:
+            job = doc_ref.get(transaction=transaction).to_dict() or {}
+            if job.get("status") not in RESTARTABLE:
+                return (False, job)
+            job = data | {"createdAt": job["createdAt"]}
+            transaction.set(doc_ref, job)
+            return (True, job)
+
+        return restart(self.db.db.transaction())
+
+    def get(self, job_id: str) -> dict | None:
+        doc = self.db.jobs.document(job_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    def update(self, job_id: str, fields: dict) -> None:
+        self.db.jobs.document(job_id).update(fields)
+
+    def add_event(self, job_id: str, event: dict, fields: dict) -> None:
+        self.db.jobs.document(job_id).update(
+            fields | {"events": firestore.ArrayUnion([event])}
+        )
+
+
+class MemoryJobStore(JobStore):
+    """Stores jobs in memory. A local stand-in for FirestoreJobStore, which only works with a single worker process."""
+
+    def __init__(self) -> None:
+        self._jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, data: dict) -> tuple[bool, dict]:
+        with self._lock:
+            if job_id in self._jobs:
+                return (False, copy.deepcopy(self._jobs[job_id]))
+            self._jobs[job_id] = copy.deepcopy(data)
+            return (True, data)
+
+    def restart(self, job_id: str, data: dict) -> tuple[bool, dict]:
+        with self._lock:
+            job = self._jobs[job_id]
+            if job["status"] not in RESTARTABLE:
+                return (False, copy.deepcopy(job))
+            job = data | {"createdAt": job["createdAt"]}
+            self._jobs[job_id] = copy.deepcopy(job)
+            return (True, job)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            return copy.deepcopy(self._jobs.get(job_id))
+
+    def update(self, job_id: str, fields: dict) -> None:
+        with self._lock:
+            self._jobs[job_id].update(copy.deepcopy(fields))
+
+    def add_event(self, job_id: str, event: dict, fields: dict) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(copy.deepcopy(fields))
+            job["events"].append(copy.deepcopy(event))
+
+
+class JobContext:
+    """Lets a job report its progress and check whether it has been cancelled.
+
+    The base class does nothing, so the same code can also run synchronously inside a request.
+    """
+
+    def progress(
+        self, message: str, completed: int | None = None, total: int | None = None
+    ) -> None:
+        """Reports progress, e.g. progress("Versioned Arm", 2, 5)."""
+        pass
+
+    def check_cancelled(self) -> None:
+        """Raises JobCancelled if the job has been cancelled.
+
+        Jobs should call this between steps, since a running job is only stopped when it does.
+        """
+        pass
+
+
+JobFn = Callable[[JobContext], dict]
+"""Performs a job, returning its result."""
+
+
+class _StoredJobContext(JobContext):
+    def __init__(self, store: JobStore, job_id: str) -> None:
+        self._store = store
+        self._job_id = job_id
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._next_check = 0.0
+
+    def progress(
+        self, message: str, completed: int | None = None, total: int | None = None
+    ) -> None:
+        with self._lock:
+            self._sequence += 1
+            progress = {"message": message, "completed": completed, "total": total}
+            event = progress | {"id": self._sequence, "time": time.time()}
+            self._store.add_event(
+                self._job_id, event, {"progress": progress, "updatedAt": time.time()}
+            )
+
+    def cancel(self) -> None:
+        """Marks the job as cancelled without waiting for its next read of the JobStore."""
+        self._cancelled = True
+
+    def check_cancelled(self) -> None:
+        # Jobs check once per step, so the flag is cached rather than read from the JobStore every time
+        now = time.monotonic()
+        if not self._cancelled and now >= self._next_check:
+            self._next_check = now + CANCEL_CHECK_INTERVAL
+            job = self._store.get(self._job_id)
+            self._cancelled = job is not None and job.get("cancelRequested", False)
+        if self._cancelled:
+            raise JobCancelled()
+
+
+_executor: futures.ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+_running: dict[str, _StoredJobContext] = {}
+"""The contexts of the jobs running on the current process, keyed by job id."""
+_running_lock = threading.Lock()
+
+
+def get_executor() -> futures.ThreadPoolExecutor:
+    """Returns the worker pool of the current process, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = futures.ThreadPoolExecutor(
+                    MAX_JOB_WORKERS, thread_name_prefix="job"
+                )
+    return _executor
+
+
+def _reset_executor() -> None:
+    """Drops the worker pool inherited from the parent process, since its threads don't survive a fork."""
+    global _executor, _executor_lock, _running_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+    _running.clear()
+    _running_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_executor)
+
+_memory_store = MemoryJobStore()
+
+
+def get_store() -> JobStore:
+    """Returns the JobStore selected by the JOB_STORE environment variable."""
+    if env.job_store == "memory":
+        return _memory_store
+    return FirestoreJobStore(database.get_database())
+
+
+def make_job_id(session_id: str, kind: str, idempotency_key: str | None) -> str:
+    """Returns the id of a new job.
+
+    Ids derived from an idempotency key are scoped to the session and kind of job, so keys can't collide across users.
+    """
+    if idempotency_key is None:
+        return uuid.uuid4().hex
+    key = "|".join([session_id, kind, idempotency_key])
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def _new_job(kind: str, session_id: str) -> dict:
+    now = time.time()
+    return {
+        "kind": kind,
+        "sessionId": session_id,
+        "status": JobStatus.QUEUED,
+        "cancelRequested": False,
+        "progress": None,
+        "events": [],
+        "result": None,
+        "error": None,
+        "createdAt": now,
+        "updatedAt": now,
+    }
+
+
+def to_error(error: Exception) -> dict:
+    """Returns the json describing why a job failed."""
+    to_dict = getattr(error, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    return {"type": "BACKEND_EXCEPTION", "message": "Unexpected error."}
+
+
+def _run(
+    store: JobStore,
+    job_id: str,
+    kind: str,
+    fn: JobFn,
+    job_metrics: metrics.JobMetrics | None = None,
+) -> None:
+    context = _StoredJobContext(store, job_id)
+    with _running_lock:
+        _running[job_id] = context
+    try:
+        context.check_cancelled()
+        store.update(job_id, {"status": JobStatus.RUNNING, "updatedAt": time.time()})
+        result = fn(context)
+    except JobCancelled:
+        fields = {"status": JobStatus.CANCELLED}
+    except Exception as error:
+        logger.exception("Job %s failed", job_id)
+        fields = {"status": JobStatus.FAILED, "error": to_error(error)}
+    else:
+        fields = {"status": JobStatus.SUCCEEDED, "result": result}
+    finally:
+        with _running_lock:
+            _running.pop(job_id, None)
+    if job_metrics is not None:
+        job_metrics.finish(kind, fields["status"])
+    store.update(job_id, fields | {"updatedAt": time.time()})
+
+
+def to_json(job_id: str, job: dict) -> dict:
+    """Returns the json describing a job to the client."""
+    return {
+        "jobId": job_id,
+        "kind": job["kind"],
+        "status": job["status"],
+        "cancelRequested": job["cancelRequested"],
+        "progress": job["progress"],
+        "result": job["result"],
+        "error": job["error"],
+        "createdAt": job["createdAt"],
+        "updatedAt": job["updatedAt"],
+    }
+
+
+def submit(kind: str, fn: JobFn):
+    """Runs fn as a job of the current session. Returns the job json and a 202 Accepted status.
+
+    fn runs on a worker thread inside a copy of the current request context, so it may use the session,
+    but should get anything it needs from the request body beforehand.
+    """
+    store = get_store()
+    session_id = connect.get_session_id()
+    idempotency_key = flask.request.headers.get(IDEMPOTENCY_HEADER)
+    job_id = make_job_id(session_id, kind, idempotency_key)
+
+    created, job = store.create(job_id, _new_job(kind, session_id))
+    if not created:
+        # Only the submit which wins the restart runs the job again
+        restarted, job = store.restart(job_id, _new_job(kind, session_id))
+        if not restarted:
+            return to_json(job_id, job), 202
+
+    # The request's metrics are discarded once it returns, so the job's Onshape calls are collected separately
+    job_metrics = metrics.start_job_metrics()
+    run = flask.copy_current_request_context(
+        functools.partial(_run, store, job_id, kind, fn, job_metrics)
+    )
+    get_executor().submit(run)
+    return to_json(job_id, job), 202
+
+
+def get_session_job(store: JobStore, job_id: str) -> dict:
+    """Returns a job of the current session.
+
+    Raises:
+        ClientException: If the job doesn't exist or belongs to another session.
+    """
+    job = store.get(job_id)
+    if job is None or job["sessionId"] != connect.get_session_id():
+        raise backend_exceptions.ClientException(
+            "Job {} not found.".format(job_id), HTTPStatus.NOT_FOUND
+        )
+    return job
+
+
+def cancel(store: JobStore, job_id: str) -> dict:
+    """Requests a job of the current session be cancelled. Returns the updated job.
+
+    A queued job is cancelled before it starts. A running job stops the next time it checks for cancellation.
+    """
+    job = get_session_job(store, job_id)
+    if job["status"] not in FINISHED:
+        store.update(job_id, {"cancelRequested": True, "updatedAt": time.time()})
+        job["cancelRequested"] = True
+        with _running_lock:
+            context = _running.get(job_id)
+        if context is not None:
+            context.cancel()
+    return job
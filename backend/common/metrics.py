@@ -0,0 +1,393 @@
+"""Aggregates the Onshape calls made by each backend request.
+
+Each request's calls are reported through a Server-Timing header and a structured log line.
+Calls made by background jobs are collected separately, since jobs outlive the request which started them.
+Totals across requests are served from /metrics in the Prometheus text format.
+"""
+
+import bisect
+import dataclasses
+import hmac
+import json
+import logging
+import threading
+import time
+
+import flask
+
+from onshape_api.api.hooks import RequestHook, RequestRecord
+
+__all__ = [
+    "init_app",
+    "get_request_hooks",
+    "start_job_metrics",
+    "RequestMetrics",
+    "JobMetrics",
+    "MetricsRegistry",
+]
+
+logger = logging.getLogger(__name__)
+
+METRICS_ROUTE = "/metrics"
+
+LATENCY_BUCKETS = [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+"""The upper bounds of latency histogram buckets, in seconds."""
+
+CALL_BUCKETS = [0, 1, 2, 5, 10, 20, 50, 100, 200, 500]
+"""The upper bounds of the buckets of the histogram of Onshape calls per backend request."""
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = (
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in zip(names, values)
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    """A Prometheus counter with labels."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...]) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple[str, ...], amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [
+            "# HELP {} {}".format(self.name, self.help),
+            "# TYPE {} counter".format(self.name),
+        ]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(
+                    "{}{} {}".format(
+                        self.name, format_labels(self.labels, labels), value
+                    )
+                )
+        return lines
+
+
+@dataclasses.dataclass
+class _HistogramValue:
+    counts: list[int]
+    sum: float = 0
+    count: int = 0
+
+
+class Histogram:
+    """A Prometheus histogram with labels."""
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...], buckets: list[float]
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._values: dict[tuple[str, ...], _HistogramValue] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            histogram = self._values.get(labels)
+            if histogram is None:
+                histogram = _HistogramValue([0] * len(self.buckets))
+                self._values[labels] = histogram
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                histogram.counts[index] += 1
+            histogram.sum += value
+            histogram.count += 1
+
+    def render(self) -> list[str]:
+        lines = [
+            "# HELP {} {}".format(self.name, self.help),
+            "# TYPE {} histogram".format(self.name),
+        ]
+        bucket_labels = self.labels + ("le",)
+        with self._lock:
+            for labels, histogram in sorted(self._values.items()):
+                # Prometheus buckets are cumulative
+                total = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    total += count
+                    lines.append(
+                        "{}_bucket{} {}".format(
+                            self.name,
+                            format_labels(bucket_labels, labels + (str(bound),)),
+                            total,
+                        )
+                    )
+                lines.append(
+                    "{}_bucket{} {}".format(
+                        self.name,
+                        format_labels(bucket_labels, labels + ("+Inf",)),
+                        histogram.count,
+                    )
+                )
+                label_str = format_labels(self.labels, labels)
+                lines.append("{}_sum{} {}".format(self.name, label_str, histogram.sum))
+                lines.append(
+                    "{}_count{} {}".format(self.name, label_str, histogram.count)
+                )
+        return lines
+
+
+class MetricsRegistry:
+    """Totals of backend requests and the Onshape calls they make."""
+
+    def __init__(self) -> None:
+        route_labels = ("method", "route")
+        self.onshape_requests = Counter(
+            "onshape_requests_total",
+            "Requests sent to Onshape.",
+            route_labels + ("status",),
+        )
+        self.onshape_latency = Histogram(
+            "onshape_request_duration_seconds",
+            "Latency of requests sent to Onshape, including retries.",
+            route_labels,
+            LATENCY_BUCKETS,
+        )
+        self.onshape_bytes = Counter(
+            "onshape_response_bytes_total",
+            "Bytes received from Onshape.",
+            route_labels,
+        )
+        self.onshape_retries = Counter(
+            "onshape_retries_total",
+            "Retries of requests sent to Onshape.",
+            route_labels,
+        )
+        endpoint_labels = ("method", "endpoint")
+        self.backend_requests = Counter(
+            "backend_requests_total",
+            "Requests handled by the backend.",
+            endpoint_labels + ("status",),
+        )
+        self.backend_latency = Histogram(
+            "backend_request_duration_seconds",
+            "Latency of requests handled by the backend.",
+            endpoint_labels,
+            LATENCY_BUCKETS,
+        )
+        self.backend_calls = Histogram(
+            "backend_onshape_calls",
+            "Onshape calls made by each request handled by the backend.",
+            endpoint_labels,
+            CALL_BUCKETS,
+        )
+
+    def observe_onshape(self, record: RequestRecord) -> None:
+        labels = (record.method, record.route)
+        self.onshape_requests.inc(labels + (str(record.status),))
+        self.onshape_latency.observe(labels, record.latency)
+        self.onshape_bytes.inc(labels, record.bytes)
+        if record.retries:
+            self.onshape_retries.inc(labels, record.retries)
+
+    def observe_backend(
+        self, method: str, endpoint: str, status: int, duration: float, calls: int
+    ) -> None:
+        labels = (method, endpoint)
+        self.backend_requests.inc(labels + (str(status),))
+        self.backend_latency.observe(labels, duration)
+        self.backend_calls.observe(labels, calls)
+
+    def render(self) -> str:
+        metrics = [
+            self.onshape_requests,
+            self.onshape_latency,
+            self.onshape_bytes,
+            self.onshape_retries,
+            self.backend_requests,
+            self.backend_latency,
+            self.backend_calls,
+        ]
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+class RequestMetrics:
+    """Collects the Onshape calls made while handling a single backend request.
+
+    Calls may be recorded from any thread, e.g. by an Api shared with a ThreadPoolExecutor.
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.records: list[RequestRecord] = []
+        self._forward: RequestHook | None = None
+        self._lock = threading.Lock()
+
+    def record(self, record: RequestRecord) -> None:
+        with self._lock:
+            forward = self._forward
+            if forward is None:
+                self.records.append(record)
+        if forward is not None:
+            forward(record)
+
+    def forward(self, hook: RequestHook) -> None:
+        """Sends calls recorded from now on to hook instead, e.g. once the request's Api is handed to a job."""
+        with self._lock:
+            self._forward = hook
+
+    def onshape_time(self) -> float:
+        """The total latency of every Onshape call. Concurrent calls may overlap, so this may exceed the wall time."""
+        return sum(record.latency for record in self.records)
+
+    def server_timing(self, duration: float) -> str:
+        """Returns the value of the Server-Timing header."""
+        return 'onshape;dur={:.1f};desc="{} calls", total;dur={:.1f}'.format(
+            self.onshape_time() * 1000, len(self.records), duration * 1000
+        )
+
+    def to_log(
+        self, method: str, endpoint: str, status: int | str, duration: float
+    ) -> dict:
+        """Returns the fields of the structured log line describing the request."""
+        calls: dict[str, int] = {}
+        for record in self.records:
+            name = "{} {}".format(record.method, record.route)
+            calls[name] = calls.get(name, 0) + 1
+        return {
+            "method": method,
+            "endpoint": endpoint,
+            "status": status,
+            "duration_ms": round(duration * 1000, 1),
+            "onshape_calls": len(self.records),
+            "onshape_ms": round(self.onshape_time() * 1000, 1),
+            "onshape_bytes": sum(record.bytes for record in self.records),
+            "onshape_retries": sum(record.retries for record in self.records),
+            "onshape_errors": sum(
+                1
+                for record in self.records
+                if record.status is None or record.status >= 400
+            ),
+            "calls": calls,
+        }
+
+
+class JobMetrics(RequestMetrics):
+    """Collects the Onshape calls made by a background job.
+
+    Each call is added to the totals served from /metrics as it's made, since a job may run for a long time.
+    """
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        super().__init__()
+        self.registry = registry
+
+    def record(self, record: RequestRecord) -> None:
+        super().record(record)
+        self.registry.observe_onshape(record)
+
+    def finish(self, kind: str, status: str) -> None:
+        """Logs a summary of the job's calls, using the same structured log line as requests."""
+        duration = time.perf_counter() - self.start
+        logger.info(json.dumps(self.to_log("JOB", kind, status, duration)))
+
+
+def get_request_hooks() -> list[RequestHook]:
+    """Returns the hooks an Api should use to report calls made for the current backend request.
+
+    Returns an empty list outside of a request, or if metrics aren't enabled.
+    """
+    if not flask.has_request_context():
+        return []
+    request_metrics: RequestMetrics | None = flask.g.get("request_metrics")
+    return [request_metrics.record] if request_metrics is not None else []
+
+
+def start_job_metrics() -> JobMetrics | None:
+    """Sends the Onshape calls made from now on by the current request's Apis to a new JobMetrics.
+
+    Call this when handing the request's Apis to a background job, since the request's own metrics are reported and
+    discarded as soon as it returns. Returns None outside of a request, or if metrics aren't enabled.
+    """
+    if not flask.has_request_context():
+        return None
+    request_metrics: RequestMetrics | None = flask.g.get("request_metrics")
+    registry: MetricsRegistry | None = flask.current_app.extensions.get("metrics")
+    if request_metrics is None or registry is None:
+        return None
+    job_metrics = JobMetrics(registry)
+    request_metrics.forward(job_metrics.record)
+    return job_metrics
+
+
+def _get_endpoint() -> str:
+    # Use the route template rather than the path so ids don't create a distinct endpoint per document
+    rule = flask.request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+def _is_authorized(token: str | None, serve: bool) -> bool:
+    if token is None:
+        return serve
+    authorization = flask.request.headers.get("Authorization", "")
+    return hmac.compare_digest(authorization.encode(), ("Bearer " + token).encode())
+
+
+def init_app(
+    app: flask.Flask, token: str | None = None, serve: bool = True
+) -> MetricsRegistry:
+    """Enables request metrics on app, and adds the /metrics route.
+
+    Behind a proxy, the client's address can't be trusted to restrict /metrics, so it's restricted by token instead.
+
+    Args:
+        token: If set, /metrics is only served to requests with an Authorization: Bearer <token> header.
+        serve: Whether /metrics is served to anyone when token isn't set, e.g. on a dev server.
+    """
+    registry = MetricsRegistry()
+    app.extensions["metrics"] = registry
+
+    @app.before_request
+    def start_request_metrics():
+        flask.g.request_metrics = RequestMetrics()
+
+    @app.after_request
+    def finish_request_metrics(response: flask.Response):
+        request_metrics: RequestMetrics | None = flask.g.pop("request_metrics", None)
+        if request_metrics is None or flask.request.path == METRICS_ROUTE:
+            return response
+
+        duration = time.perf_counter() - request_metrics.start
+        method = flask.request.method
+        endpoint = _get_endpoint()
+        for record in request_metrics.records:
+            registry.observe_onshape(record)
+        registry.observe_backend(
+            method,
+            endpoint,
+            response.status_code,
+            duration,
+            len(request_metrics.records),
+        )
+        response.headers["Server-Timing"] = request_metrics.server_timing(duration)
+        logger.info(
+            json.dumps(
+                request_metrics.to_log(method, endpoint, response.status_code, duration)
+            )
+        )
+        return response
+
+    @app.get(METRICS_ROUTE)
+    def serve_metrics():
+        if not _is_authorized(token, serve):
+            flask.abort(404)
+        return flask.Response(
+            registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    return registry
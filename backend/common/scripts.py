@@ -0,0 +1,214 @@
+"""Loads the FeatureScripts evaluated by the backend.
+
+Every script in the scripts directory is read, validated, and minified once, at app startup, and then served from
+memory. A malformed script, or a missing script listed in REQUIRED_SCRIPTS, stops the app from starting, rather than
+failing the first request which evaluates it.
+"""
+
+import dataclasses
+import hashlib
+import logging
+import pathlib
+import threading
+from typing import Iterable
+
+import flask
+
+__all__ = ["init_app", "get_script", "Script", "ScriptError", "ScriptRegistry"]
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIRECTORY = pathlib.Path(__file__).resolve().parent.parent / "scripts"
+"""The directory scripts are loaded from. Resolved relative to this file, so it doesn't depend on the cwd."""
+
+BASE_SCRIPT = "parseBase"
+"""Finds the mates and mirrors defined by assembly attributes in a part studio."""
+
+TARGET_SCRIPT = "parseTarget"
+"""Finds the mate connector of a part studio targeted by a mate."""
+
+REQUIRED_SCRIPTS = (BASE_SCRIPT, TARGET_SCRIPT)
+"""The scripts evaluated by the backend. The app doesn't start unless each of them is loaded."""
+
+BRACKETS = {"(": ")", "{": "}", "[": "]"}
+
+
+class ScriptError(Exception):
+    """Raised when a script is missing or malformed."""
+
+
+@dataclasses.dataclass(frozen=True)
+class Script:
+    """A loaded script.
+
+    Attributes:
+        name: The name of the script, i.e. its file name without .fs.
+        code: The minified code of the script.
+        hash: The sha256 of code, which identifies the version of the script.
+    """
+
+    name: str
+    code: str
+    hash: str
+
+
+def _tokenize(code: str) -> Iterable[tuple[str, str]]:
+    """Splits code into (kind, text) tokens, where kind is one of string, comment, or code.
+
+    Only strings and comments are recognized, which is enough to find brackets and strip comments safely.
+    """
+    i = 0
+    start = 0
+    while i < len(code):
+        char = code[i]
+        if char in "'\"":
+            end = i + 1
+            while end < len(code) and code[end] != char:
+                end += 2 if code[end] == "\\" else 1
+            yield ("code", code[start:i])
+            yield ("string", code[i : end + 1])
+            i = start = end + 1
+        elif code.startswith("//", i):
+            # The newline ending a line comment is left as code, so lines on either side stay separate
+            end = code.find("\n", i)
+            end = len(code) if end == -1 else end
+            yield ("code", code[start:i])
+            yield ("comment", code[i:end])
+            i = start = end
+        elif code.startswith("/*", i):
+            end = code.find("*/", i + 2)
+            end = len(code) if end == -1 else end + 2
+            yield ("code", code[start:i])
+            yield ("comment", code[i:end])
+            i = start = end
+        else:
+            i += 1
+    yield ("code", code[start:])
+
+
+def minify(code: str) -> str:
+    """Strips comments, indentation, trailing whitespace, and blank lines from code."""
+    stripped = "".join(text for kind, text in _tokenize(code) if kind != "comment")
+    lines = (line.strip() for line in stripped.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def validate(name: str, code: str) -> None:
+    """Checks code is a FeatureScript function with balanced brackets.
+
+    Raises:
+        ScriptError: If code is malformed.
+    """
+    if not code.strip().startswith("function"):
+        raise ScriptError("Script {} must be a FeatureScript function.".format(name))
+
+    stack = []
+    for kind, text in _tokenize(code):
+        if kind == "string" and (len(text) < 2 or text[-1] != text[0]):
+            raise ScriptError("Script {} has an unterminated string.".format(name))
+        if kind != "code":
+            continue
+        for char in text:
+            if char in BRACKETS:
+                stack.append(BRACKETS[char])
+            elif char in BRACKETS.values():
+                if not stack or stack.pop() != char:
+                    raise ScriptError(
+                        "Script {} has an unmatched {}.".format(name, char)
+                    )
+    if stack:
+        raise ScriptError("Script {} is missing a {}.".format(name, stack[-1]))
+
+
+def load_script(path: pathlib.Path, minified: bool = True) -> Script:
+    name = path.stem
+    code = path.read_text()
+    validate(name, code)
+    if minified:
+        code = minify(code)
+    return Script(name, code, hashlib.sha256(code.encode()).hexdigest())
+
+
+class ScriptRegistry:
+    """Holds every script of a directory in memory, keyed by name."""
+
+    def __init__(self, scripts: Iterable[Script]) -> None:
+        self._scripts = dict((script.name, script) for script in scripts)
+
+    @classmethod
+    def load(
+        cls, directory: pathlib.Path = SCRIPT_DIRECTORY, minified: bool = True
+    ) -> "ScriptRegistry":
+        """Loads every .fs script in directory.
+
+        Raises:
+            ScriptError: If the directory has no scripts, or any script is malformed.
+        """
+        paths = sorted(directory.glob("*.fs"))
+        if not paths:
+            raise ScriptError("No scripts found in {}.".format(directory))
+        return cls(load_script(path, minified) for path in paths)
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._scripts)
+
+    def require(self, names: Iterable[str]) -> None:
+        """Checks every script in names is loaded.
+
+        Raises:
+            ScriptError: If any script is missing.
+        """
+        missing = [name for name in names if name not in self._scripts]
+        if missing:
+            raise ScriptError(
+                "Missing required scripts: {}. Loaded scripts: {}.".format(
+                    ", ".join(missing), ", ".join(self.names)
+                )
+            )
+
+    def get(self, name: str) -> Script:
+        """Returns the script named name.
+
+        Raises:
+            ScriptError: If there is no script named name.
+        """
+        script = self._scripts.get(name)
+        if script is None:
+            raise ScriptError(
+                "Script {} not found. Loaded scripts: {}.".format(
+                    name, ", ".join(self.names)
+                )
+            )
+        return script
+
+
+_registry: ScriptRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ScriptRegistry:
+    """Returns the scripts of the current process, loading them on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ScriptRegistry.load()
+    return _registry
+
+
+def get_script(name: str) -> str:
+    """Returns the code of the script named name.
+
+    Raises:
+        ScriptError: If there is no script named name.
+    """
+    return get_registry().get(name).code
+
+
+def init_app(app: flask.Flask) -> None:
+    """Loads every script, so a malformed script or a missing required script stops the app from starting."""
+    registry = get_registry()
+    registry.require(REQUIRED_SCRIPTS)
+    for name in registry.names:
+        logger.info("Loaded script %s (%s)", name, registry.get(name).hash[:12])
@@ -0,0 +1,175 @@
+"""Coordinates OAuth token refreshes, so each expired token is refreshed once.
+
+Threads in a worker serialize on a lock per session.
+Across workers, a lease stored on the session document elects a single refresher using a Firestore transaction.
+The other workers wait for the new token to be saved and reuse it.
+"""
+
+import asyncio
+import collections
+import contextlib
+import functools
+import threading
+import time
+import uuid
+from typing import Any, Callable
+
+from google.cloud import firestore
+from requests_oauthlib import OAuth2Session
+
+from backend.common.database import Database
+
+__all__ = ["CoordinatedOAuth2Session", "refresh_once", "refresh_once_async"]
+
+LEASE_FIELD = "refreshLease"
+
+LEASE_SECONDS = 15
+"""The max number of seconds a worker may take to refresh a token before another worker may take over."""
+
+POLL_INTERVAL = 0.2
+"""The number of seconds to wait between checks for a token refreshed by another worker."""
+
+_locks: dict[str, threading.Lock] = {}
+_lock_users: collections.Counter[str] = collections.Counter()
+_locks_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _session_lock(session_id: str):
+    """Holds a lock unique to session_id. Locks are discarded once no thread is using them."""
+    with _locks_lock:
+        lock = _locks.setdefault(session_id, threading.Lock())
+        _lock_users[session_id] += 1
+    try:
+        with lock:
+            yield
+    finally:
+        with _locks_lock:
+            _lock_users[session_id] -= 1
+            if _lock_users[session_id] == 0:
+                del _lock_users[session_id]
+                del _locks[session_id]
+
+
+def is_newer_token(token: dict | None, old_token: dict) -> bool:
+    return token is not None and token.get("access_token") != old_token.get(
+        "access_token"
+    )
+
+
+def acquire_lease(
+    db: Database, session_id: str, owner: str, old_token: dict
+) -> tuple[bool, dict | None]:
+    """Attempts to take the refresh lease of a session.
+
+    Returns a tuple of whether the lease was acquired and the stored token.
+    The lease isn't taken if the stored token has already been refreshed.
+    """
+    doc_ref = db.sessions.document(document_id=session_id)
+
+    @firestore.transactional
+    def acquire(transaction: firestore.Transaction) -> tuple[bool, dict | None]:
+        snapshot = doc_ref.get(transaction=transaction)
+        data = (snapshot.to_dict() if snapshot.exists else None) or {}
+        token = data.get("token")
+        if is_newer_token(token, old_token):
+            return (False, token)
+        lease = data.get(LEASE_FIELD)
+        if lease is not None and lease["owner"] != owner:
+            if lease["expiresAt"] > time.time():
+                return (False, token)
+        transaction.set(
+            doc_ref,
+            {LEASE_FIELD: {"owner": owner, "expiresAt": time.time() + LEASE_SECONDS}},
+            merge=True,
+        )
+        return (True, token)
+
+    return acquire(db.db.transaction())
+
+
+def release_lease(db: Database, session_id: str) -> None:
+    doc_ref = db.sessions.document(document_id=session_id)
+    doc_ref.update({LEASE_FIELD: firestore.DELETE_FIELD})
+
+
+def refresh_once(
+    db: Database,
+    session_id: str,
+    old_token: dict,
+    refresh: Callable[[], dict],
+    save: Callable[[dict], Any],
+    adopt: Callable[[dict], Any] | None = None,
+) -> dict:
+    """Returns a token to use in place of old_token, refreshing it only if no other thread or worker already has.
+
+    Args:
+        refresh: Exchanges the refresh token of old_token for a new token.
+        save: Saves a refreshed token. Saving must replace the session document, which also releases the lease.
+        adopt: Called with a token which was refreshed and saved by another thread or worker instead, e.g. to update
+            a local cache of the session.
+    """
+    owner = str(uuid.uuid4())
+    with _session_lock(session_id):
+        while True:
+            acquired, token = acquire_lease(db, session_id, owner, old_token)
+            if acquired:
+                try:
+                    new_token = refresh()
+                except:
+                    release_lease(db, session_id)
+                    raise
+                save(new_token)
+                return new_token
+            if token is not None and is_newer_token(token, old_token):
+                if adopt is not None:
+                    adopt(token)
+                return token
+            # Another worker holds the lease; wait for it to save the new token
+            time.sleep(POLL_INTERVAL)
+
+
+async def refresh_once_async(
+    db: Database,
+    session_id: str,
+    old_token: dict,
+    refresh: Callable[[], dict],
+    save: Callable[[dict], Any],
+    adopt: Callable[[dict], Any] | None = None,
+) -> dict:
+    """An asyncio variant of refresh_once, which waits for the lease on a worker thread.
+
+    Sync and async refreshes of the same session share the same lock and lease, so the token is still refreshed once.
+    """
+    return await asyncio.to_thread(
+        refresh_once, db, session_id, old_token, refresh, save, adopt
+    )
+
+
+class CoordinatedOAuth2Session(OAuth2Session):
+    """An OAuth2Session whose automatic token refreshes go through refresh_once.
+
+    Since refresh_once saves the token, token_updater need not.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        session_id: str,
+        save: Callable[[dict], Any],
+        *args,
+        adopt: Callable[[dict], Any] | None = None,
+        **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._db = db
+        self._session_id = session_id
+        self._save = save
+        self._adopt = adopt
+
+    def refresh_token(self, token_url: str, **kwargs) -> dict:  # type: ignore
+        refresh = functools.partial(super().refresh_token, token_url, **kwargs)
+        self.token = refresh_once(
+            self._db, self._session_id, self.token, refresh, self._save, self._adopt
+        )
+        return self.token
@@ -14,7 +14,7 @@ router = flask.Blueprint("assembly-mirror", __name__)
 @router.post("/assembly-mirror" + connect.element_route())
 def assembly_mirror(**kwargs):
     assembly_path = connect.get_route_element_path()
-    db = database.Database()
+    db = database.get_database()
     api = connect.get_api(db)
     AssemblyMirror(api, assembly_path).execute()
     return {"message": "Success"}
@@ -42,11 +42,9 @@ class AssemblyMirrorCandidate:
     def _init_mate_connectors(
         self, assembly_features: assembly_data.AssemblyFeatures
     ) -> dict[str, bool]:
+        used = assembly_features.get_used_mate_connectors(self.instance)
         return dict(
-            (
-                mate_connector,
-                assembly_features.is_mate_connector_used(self.instance, mate_connector),
-            )
+            (mate_connector["featureId"], mate_connector["featureId"] in used)
             for mate_connector in self.part.get("mateConnectors", [])
         )
 
@@ -143,7 +141,9 @@ class AssemblyMirror:
         Candidates without any unused mate connectors are first filtered out.
         """
         return set(
-            candidate.element_path for candidate in candidates if not candidate.all_used
+            candidate.element_path
+            for candidate in candidates
+            if not candidate.all_used()
         )
 
     def _has_used_origin_mate(
@@ -190,7 +190,7 @@ class AssemblyMirror:
         return any(
             not candidate.mate_connectors.get(base_mate_id, True)
             and not candidate.mate_connectors.get(target_mate_id, True)
-            for base_mate_id, target_mate_id in base_to_target_mates
+            for base_mate_id, target_mate_id in base_to_target_mates.items()
         )
 
     def _create_assembly_mirror_parts(
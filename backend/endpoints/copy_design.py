@@ -1,5 +1,5 @@
 import flask
-from backend.common import connect, database
+from backend.common import connect, database, jobs
 from onshape_api.endpoints.documents import (
     copy_workspace,
     delete_document,
@@ -49,7 +49,18 @@ def copy_design(**kwargs):
         elements: A list of tab names to copy.
         elementsToExclude: A list of tab names to exclude.
     """
-    db = database.Database()
+    return prepare_copy_design()(jobs.JobContext())
+
+
+@router.post("/jobs/copy-design" + connect.element_route())
+def copy_design_job(**kwargs):
+    """Runs copy-design as a background job. Returns the job (see jobs.get_job)."""
+    return jobs.submit("copy-design", prepare_copy_design())
+
+
+def prepare_copy_design() -> jobs.JobFn:
+    """Validates a copy-design request, returning a function which performs it."""
+    db = database.get_database()
     api = connect.get_api(db)
 
     target_path = connect.get_route_element_path()
@@ -59,29 +70,40 @@ def copy_design(**kwargs):
     excluded_names: list[str] = connect.get_body_optional("elementsToExclude", [])
     version_name: str = connect.get_body("versionName")
 
-    # Copy design document to avoid impacting other users
-    copy_data = copy_workspace(api, design_path, "COPY DESIGN TEMP DOCUMENT")
-    copy_path = InstancePath(copy_data["newDocumentId"], copy_data["newWorkspaceId"])
-    elements = get_document_elements(api, copy_path)
-
-    elements = list(
-        filter(lambda element: element["name"] not in excluded_names, elements)
-    )
-
-    if included_names != None:
-        elements_to_move: list[str] = [
-            element["id"] for element in elements if (element["name"] in included_names)
-        ]
-    else:
-        elements_to_move: list[str] = [element["id"] for element in elements]
-
-    if len(elements_to_move) >= len(elements):
-        # Create a temporary part studio to avoid emptying the document completely (which isn't allowed)
-        create_part_studio(api, copy_path, "TEMP")
-
-    # Perform the move
-    move_elements(api, copy_path, elements_to_move, target_path, version_name)
-
-    # Cleanup copy
-    delete_document(api, copy_path)
-    return {"message": "Success"}
+    def run(context: jobs.JobContext) -> dict:
+        context.progress("Copying design", 0, 2)
+        # Copy design document to avoid impacting other users
+        copy_data = copy_workspace(api, design_path, "COPY DESIGN TEMP DOCUMENT")
+        copy_path = InstancePath(
+            copy_data["newDocumentId"], copy_data["newWorkspaceId"]
+        )
+        try:
+            elements = get_document_elements(api, copy_path)
+
+            elements = list(
+                filter(lambda element: element["name"] not in excluded_names, elements)
+            )
+
+            if included_names != None:
+                elements_to_move: list[str] = [
+                    element["id"]
+                    for element in elements
+                    if (element["name"] in included_names)
+                ]
+            else:
+                elements_to_move: list[str] = [element["id"] for element in elements]
+
+            if len(elements_to_move) >= len(elements):
+                # Create a temporary part studio to avoid emptying the document completely (which isn't allowed)
+                create_part_studio(api, copy_path, "TEMP")
+
+            # Perform the move
+            context.check_cancelled()
+            context.progress("Moving tabs", 1, 2)
+            move_elements(api, copy_path, elements_to_move, target_path, version_name)
+        finally:
+            # Cleanup copy, even if the move failed or the job was cancelled
+            delete_document(api, copy_path)
+        return {"message": "Success"}
+
+    return run
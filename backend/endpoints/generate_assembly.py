@@ -3,6 +3,7 @@ import flask
 from backend.common.backend_exceptions import require_permissions
 from backend.common import connect, database
 from onshape_api import model
+from onshape_api.api.api_base import Api
 from onshape_api.endpoints.permissions import Permission
 from onshape_api.endpoints import assemblies
 from onshape_api.paths.paths import ElementPath
@@ -17,12 +18,24 @@ def generate_assembly(**kwargs: str):
     Returns:
         elementId: The element id of the generated assembly.
     """
-    db = database.Database()
+    db = database.get_database()
     api = connect.get_api(db)
     name = connect.get_body("name")
     part_studio_path = connect.get_route_element_path()
     require_permissions(api, part_studio_path, Permission.READ, Permission.WRITE)
+    assembly_path = do_generate_assembly(api, part_studio_path, name)
+    return {
+        "elementId": assembly_path.element_id,
+    }
+
+
+def do_generate_assembly(
+    api: Api, part_studio_path: ElementPath, name: str
+) -> ElementPath:
+    """Creates an assembly named name containing every part in part_studio_path, grouped together.
 
+    Returns the path to the new assembly.
+    """
     element_id = assemblies.create_assembly(api, part_studio_path, name)["id"]
     assembly_path = ElementPath.from_path(part_studio_path, element_id)
 
@@ -34,7 +47,4 @@ def generate_assembly(**kwargs: str):
     queries = [model.occurrence_query(instance_id) for instance_id in instance_ids]
     group_mate = model.group_mate("Group", queries)
     assemblies.add_feature(api, assembly_path, group_mate)
-
-    return {
-        "elementId": assembly_path.element_id,
-    }
+    return assembly_path
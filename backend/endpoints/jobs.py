@@ -0,0 +1,86 @@
+import json
+import time
+from typing import Iterator
+
+import flask
+
+from backend.common import jobs
+
+router = flask.Blueprint("jobs", __name__)
+
+EVENT_POLL_INTERVAL = 1
+"""The number of seconds between checks for new events of a job being streamed."""
+
+KEEP_ALIVE_INTERVAL = 15
+"""The max number of seconds between messages sent while streaming, so proxies don't close idle streams."""
+
+
+@router.get("/jobs/<job_id>")
+def get_job(job_id: str):
+    """Returns the current state of a job.
+
+    Returns:
+        jobId: The id of the job.
+        kind: The endpoint which started the job, e.g. push-version-recursive.
+        status: One of queued, running, succeeded, failed, or cancelled.
+        cancelRequested: Whether the job has been asked to cancel.
+        progress: The latest progress of the job {message, completed, total}, or null.
+        result: The response of the endpoint once the job succeeds.
+        error: The error of the endpoint if the job fails.
+    """
+    store = jobs.get_store()
+    return jobs.to_json(job_id, jobs.get_session_job(store, job_id))
+
+
+@router.post("/jobs/<job_id>/cancel")
+def cancel_job(job_id: str):
+    """Cancels a job. Returns the job (see get_job)."""
+    store = jobs.get_store()
+    return jobs.to_json(job_id, jobs.cancel(store, job_id))
+
+
+@router.get("/jobs/<job_id>/events")
+def stream_job_events(job_id: str):
+    """Streams the progress of a job as Server-Sent Events.
+
+    Each progress event has the fields message, completed, and total.
+    A final status event containing the job (see get_job) is sent once the job finishes.
+    Reconnecting clients may send Last-Event-ID to skip events they've already received.
+    """
+    store = jobs.get_store()
+    jobs.get_session_job(store, job_id)
+    last_event_id = int(flask.request.headers.get("Last-Event-ID", 0))
+    return flask.Response(
+        generate_events(store, job_id, last_event_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def format_event(event: str, data: dict, event_id: int | None = None) -> str:
+    lines = ["event: " + event, "data: " + json.dumps(data)]
+    if event_id is not None:
+        lines.insert(0, "id: {}".format(event_id))
+    return "\n".join(lines) + "\n\n"
+
+
+def generate_events(
+    store: jobs.JobStore, job_id: str, last_event_id: int
+) -> Iterator[str]:
+    last_sent = time.monotonic()
+    while True:
+        job = store.get(job_id)
+        if job is None:
+            return
+        for event in job["events"]:
+            if event["id"] > last_event_id:
+                last_event_id = event["id"]
+                last_sent = time.monotonic()
+                yield format_event("progress", event, event["id"])
+        if job["status"] in jobs.FINISHED:
+            yield format_event("status", jobs.to_json(job_id, job))
+            return
+        if time.monotonic() - last_sent > KEEP_ALIVE_INTERVAL:
+            last_sent = time.monotonic()
+            yield ": keep-alive\n\n"
+        time.sleep(EVENT_POLL_INTERVAL)
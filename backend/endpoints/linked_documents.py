@@ -1,9 +1,12 @@
+import collections
 import enum
+from concurrent import futures
+from typing import Iterable, Mapping, Sequence
 
 import flask
 from google.cloud import firestore
 
-from backend.common import backend_exceptions, connect, database
+from backend.common import backend_exceptions, connect, dag, database
 from onshape_api.api.api_base import Api
 from onshape_api.endpoints.metadata import get_instance_metadata
 from onshape_api.endpoints.permissions import (
@@ -13,6 +16,9 @@ from onshape_api.endpoints.permissions import (
 from onshape_api.endpoints import documents
 from onshape_api.paths.paths import InstancePath
 
+BATCH_SIZE = 500
+"""The max number of writes in a Firestore batch."""
+
 
 class LinkType(enum.StrEnum):
     PARENTS = "parents"
@@ -41,6 +47,302 @@ def make_db_id(document_id: str, workspace_id: str) -> str:
     return document_id + "|" + workspace_id
 
 
+CLOSURE_FIELDS = {LinkType.PARENTS: "ancestors", LinkType.CHILDREN: "descendants"}
+"""Maps each link type to the field of the graph index listing every document reachable by following it.
+
+The index is kept up to date by link_documents and unlink_documents, and can be rebuilt using rebuild_link_index.
+"""
+
+INDEXED_FIELD = "indexed"
+"""The field of the graph index which is True once both closures of a document are known to be complete.
+
+Documents linked before the index existed only have a partial closure until rebuild_link_index is run, so their
+closures are never trusted; their links are followed instead.
+"""
+
+
+def read_links(
+    db: database.Database,
+    db_ids: Iterable[str],
+    transaction: firestore.Transaction | None = None,
+) -> dict[str, dict]:
+    """Reads the linked-documents entries of db_ids in a single batch.
+
+    Documents without an entry map to an empty dict.
+    """
+    refs = [db.linked_documents.document(db_id) for db_id in db_ids]
+    if not refs:
+        return {}
+    return dict(
+        (snapshot.id, (snapshot.to_dict() if snapshot.exists else None) or {})
+        for snapshot in db.db.get_all(refs, transaction=transaction)
+    )
+
+
+def is_indexed(data: dict) -> bool:
+    """Returns True if the closures of a linked-documents entry are complete.
+
+    A document without any links trivially has complete (empty) closures.
+    """
+    return data.get(INDEXED_FIELD, False) or not (
+        data.get(LinkType.PARENTS) or data.get(LinkType.CHILDREN)
+    )
+
+
+def walk_links(
+    db: database.Database,
+    root_id: str,
+    root_data: dict,
+    link_type: LinkType,
+    transaction: firestore.Transaction | None = None,
+) -> dict[str, list[str]]:
+    """Follows links of link_type from root_id one level at a time, with a single batched read per level.
+
+    Returns a dict mapping the db id of each reachable document, including root_id, to the db ids it links to.
+    """
+    graph = {root_id: list(root_data.get(link_type, []))}
+    frontier = [link for link in graph[root_id] if link != root_id]
+    seen = set(frontier) | {root_id}
+    while frontier:
+        level = read_links(db, frontier, transaction)
+        frontier = []
+        for db_id, links in level.items():
+            graph[db_id] = list(links.get(link_type, []))
+            for link in graph[db_id]:
+                if link not in seen:
+                    seen.add(link)
+                    frontier.append(link)
+    return graph
+
+
+def get_closure(
+    db: database.Database,
+    db_id: str,
+    data: dict,
+    link_type: LinkType,
+    transaction: firestore.Transaction | None = None,
+) -> set[str]:
+    """Returns every document reachable from db_id by following links of link_type.
+
+    Uses the graph index if db_id is indexed, and walks its links otherwise.
+    """
+    if is_indexed(data):
+        return set(data.get(CLOSURE_FIELDS[link_type], []))
+    return set(walk_links(db, db_id, data, link_type, transaction)) - {db_id}
+
+
+def get_closures(
+    db: database.Database,
+    db_id: str,
+    data: dict,
+    transaction: firestore.Transaction | None = None,
+) -> dict[str, set[str]]:
+    """Returns both closures of db_id, keyed by their field in the graph index."""
+    return dict(
+        (field, get_closure(db, db_id, data, link_type, transaction))
+        for link_type, field in CLOSURE_FIELDS.items()
+    )
+
+
+def compute_closures(
+    nodes: Iterable[str],
+    links: Mapping[str, Sequence[str]],
+    known: Mapping[str, Sequence[str]],
+) -> dict[str, list[str]]:
+    """Returns every document reachable from each of nodes by following links.
+
+    Args:
+        nodes: The documents to compute closures for.
+        links: The links of each of nodes.
+        known: The closures of linked documents which aren't in nodes.
+
+    Raises:
+        dag.CycleError: If nodes contain a cycle.
+    """
+    nodes = set(nodes)
+    dependencies = dict(
+        (node, [link for link in links[node] if link in nodes]) for node in nodes
+    )
+    closures: dict[str, set[str]] = {}
+    for node in dag.topological_sort(dependencies):
+        closure = set(links[node])
+        for link in links[node]:
+            closure.update(closures[link] if link in nodes else known.get(link, []))
+        closures[node] = closure
+    return dict((node, sorted(closure)) for node, closure in closures.items())
+
+
+def link_documents(db: database.Database, parent_id: str, child_id: str) -> None:
+    """Links a child document to a parent document, updating the graph index in the same transaction.
+
+    Both documents are indexed first, so the cycle check and the closures written are complete even if either document
+    was linked before the index existed.
+
+    Raises:
+        ClientException: If the link would create a cycle.
+    """
+
+    @firestore.transactional
+    def link(transaction: firestore.Transaction) -> None:
+        data = read_links(db, [parent_id, child_id], transaction)
+        closures = dict(
+            (db_id, get_closures(db, db_id, data[db_id], transaction))
+            for db_id in [parent_id, child_id]
+        )
+        ancestors = closures[parent_id]["ancestors"] | {parent_id}
+        descendants = closures[child_id]["descendants"] | {child_id}
+        if child_id in ancestors:
+            raise backend_exceptions.ClientException(
+                "Cannot link documents in a cycle."
+            )
+
+        updates: dict[str, dict] = collections.defaultdict(dict)
+        for db_id in ancestors:
+            updates[db_id]["descendants"] = firestore.ArrayUnion(sorted(descendants))
+        for db_id in descendants:
+            updates[db_id]["ancestors"] = firestore.ArrayUnion(sorted(ancestors))
+        closures[parent_id]["descendants"] |= descendants
+        closures[child_id]["ancestors"] |= ancestors
+        # The closures of both documents are now complete, so they're written in full
+        for db_id, fields in closures.items():
+            updates[db_id].update(
+                (field, sorted(closure)) for field, closure in fields.items()
+            )
+            updates[db_id][INDEXED_FIELD] = True
+        updates[parent_id][LinkType.CHILDREN] = firestore.ArrayUnion([child_id])
+        updates[child_id][LinkType.PARENTS] = firestore.ArrayUnion([parent_id])
+        for db_id, update in updates.items():
+            transaction.set(db.linked_documents.document(db_id), update, merge=True)
+
+    link(db.db.transaction())
+
+
+def unlink_documents(db: database.Database, parent_id: str, child_id: str) -> None:
+    """Removes the link between a parent and child document, updating the graph index in the same transaction.
+
+    Only the descendants of the parent's ancestors and the ancestors of the child's descendants can change,
+    so only those closures are recomputed. As in link_documents, both documents are indexed first.
+    """
+
+    @firestore.transactional
+    def unlink(transaction: firestore.Transaction) -> None:
+        data = read_links(db, [parent_id, child_id], transaction)
+        parent_ancestors = get_closure(
+            db, parent_id, data[parent_id], LinkType.PARENTS, transaction
+        )
+        child_descendants = get_closure(
+            db, child_id, data[child_id], LinkType.CHILDREN, transaction
+        )
+        upper = parent_ancestors | {parent_id}
+        lower = child_descendants | {child_id}
+        data.update(read_links(db, (upper | lower) - data.keys(), transaction))
+
+        children = dict(
+            (db_id, data[db_id].get(LinkType.CHILDREN, [])) for db_id in upper
+        )
+        children[parent_id] = [
+            db_id for db_id in children[parent_id] if db_id != child_id
+        ]
+        parents = dict(
+            (db_id, data[db_id].get(LinkType.PARENTS, [])) for db_id in lower
+        )
+        parents[child_id] = [db_id for db_id in parents[child_id] if db_id != parent_id]
+
+        # Documents linked to from outside upper and lower are unaffected, so their closures can be reused
+        neighbors = set(db_id for links in children.values() for db_id in links)
+        neighbors.update(db_id for links in parents.values() for db_id in links)
+        data.update(read_links(db, neighbors - data.keys(), transaction))
+        known_descendants = dict(
+            (db_id, get_closure(db, db_id, data[db_id], LinkType.CHILDREN, transaction))
+            for db_id in neighbors - upper
+        )
+        known_ancestors = dict(
+            (db_id, get_closure(db, db_id, data[db_id], LinkType.PARENTS, transaction))
+            for db_id in neighbors - lower
+        )
+
+        updates: dict[str, dict] = collections.defaultdict(dict)
+        for db_id, closure in compute_closures(
+            upper, children, known_descendants
+        ).items():
+            updates[db_id]["descendants"] = closure
+        for db_id, closure in compute_closures(lower, parents, known_ancestors).items():
+            updates[db_id]["ancestors"] = closure
+        # The other closure of each document is complete too, since it was walked if the document wasn't indexed
+        updates[parent_id]["ancestors"] = sorted(parent_ancestors)
+        updates[child_id]["descendants"] = sorted(child_descendants)
+        updates[parent_id][INDEXED_FIELD] = True
+        updates[child_id][INDEXED_FIELD] = True
+        updates[parent_id][LinkType.CHILDREN] = firestore.ArrayRemove([child_id])
+        updates[child_id][LinkType.PARENTS] = firestore.ArrayRemove([parent_id])
+        for db_id, update in updates.items():
+            transaction.set(db.linked_documents.document(db_id), update, merge=True)
+
+    unlink(db.db.transaction())
+
+
+def rebuild_link_index(db: database.Database) -> int:
+    """Recomputes the graph index of every linked document from their parents and children.
+
+    Returns the number of documents indexed.
+
+    Raises:
+        dag.CycleError: If the linked documents contain a cycle.
+    """
+    data = dict(
+        (snapshot.id, snapshot.to_dict() or {})
+        for snapshot in db.linked_documents.stream()
+    )
+    closures = {}
+    for link_type, field in CLOSURE_FIELDS.items():
+        links = dict((db_id, links.get(link_type, [])) for db_id, links in data.items())
+        closures[field] = compute_closures(data.keys(), links, {})
+
+    batch = db.db.batch()
+    for i, db_id in enumerate(data):
+        if i > 0 and i % BATCH_SIZE == 0:
+            batch.commit()
+            batch = db.db.batch()
+        update = dict(
+            (field, closures[field][db_id]) for field in CLOSURE_FIELDS.values()
+        )
+        update[INDEXED_FIELD] = True
+        batch.set(db.linked_documents.document(db_id), update, merge=True)
+    batch.commit()
+    return len(data)
+
+
+def get_link_graph(
+    db: database.Database, root: InstancePath, link_type: LinkType
+) -> dict[str, list[str]]:
+    """Returns every document reachable from root by following links of link_type.
+
+    The result maps the db id of each document to the db ids it links to.
+    Uses the graph index to fetch the whole graph in two reads.
+    If root hasn't been indexed, the graph is fetched one level at a time, with a single batched read per level.
+    """
+    root_id = path_to_db_id(root)
+    data = read_links(db, [root_id])[root_id]
+    if not is_indexed(data):
+        return walk_links(db, root_id, data, link_type)
+
+    graph = {root_id: list(data.get(link_type, []))}
+    for db_id, links in read_links(db, data.get(CLOSURE_FIELDS[link_type], [])).items():
+        graph[db_id] = list(links.get(link_type, []))
+    return graph
+
+
+def get_parent_and_child(
+    link_type: LinkType, curr_id: str, link_id: str
+) -> tuple[str, str]:
+    """Returns the parent and child of a link of link_type from curr_id to link_id."""
+    if link_type == LinkType.PARENTS:
+        return (link_id, curr_id)
+    elif link_type == LinkType.CHILDREN:
+        return (curr_id, link_id)
+    raise backend_exceptions.BackendException("Invalid link_type {}.".format(link_type))
+
+
 router = flask.Blueprint("linked-documents", __name__)
 
 
@@ -52,37 +354,21 @@ def delete_linked_document(link_type: LinkType, **kwargs):
         documentId, workspaceId: The id of the document link to delete.
     """
 
-    db = database.Database()
+    db = database.get_database()
     api = connect.get_api(db)
     curr_path = connect.get_route_instance_path()
     curr_id = path_to_db_id(curr_path)
     backend_exceptions.require_permissions(api, curr_path, Permission.WRITE)
 
-    link_types = get_link_types(link_type)
     link_path = InstancePath(
         connect.get_query("documentId"), connect.get_query("instanceId")
     )
     link_id = path_to_db_id(link_path)
 
-    db.linked_documents.document(curr_id).update(
-        {link_types[0]: firestore.ArrayRemove([link_id])}
-    )
-    db.linked_documents.document(link_id).update(
-        {link_types[1]: firestore.ArrayRemove([curr_id])}
-    )
+    unlink_documents(db, *get_parent_and_child(link_type, curr_id, link_id))
     return make_document(api, link_path)
 
 
-def add_document_link(
-    db_ref: firestore.CollectionReference, linkType: LinkType, path_id: str, new_id: str
-):
-    doc_ref = db_ref.document(path_id)
-    if not doc_ref.get().exists:
-        doc_ref.set({linkType: [new_id]})
-    else:
-        doc_ref.update({linkType: firestore.ArrayUnion([new_id])})
-
-
 @router.post("/linked-documents/<link_type>" + connect.instance_route())
 def add_linked_document(link_type: LinkType, **kwargs):
     """Adds the document specified in the query parameters to the document specified in the url.
@@ -93,7 +379,7 @@ def add_linked_document(link_type: LinkType, **kwargs):
         documentId, workspaceId: The id of the document to link.
     Returns the linked document (see also get_linked_documents).
     """
-    db = database.Database()
+    db = database.get_database()
     api = connect.get_api(db)
 
     curr_path = connect.get_route_instance_path()
@@ -112,9 +398,7 @@ def add_linked_document(link_type: LinkType, **kwargs):
 
     link_document = make_document(api, link_path)
 
-    link_types = get_link_types(link_type)
-    add_document_link(db.linked_documents, link_types[0], curr_db_id, link_db_id)
-    add_document_link(db.linked_documents, link_types[1], link_db_id, curr_db_id)
+    link_documents(db, *get_parent_and_child(link_type, curr_db_id, link_db_id))
     return link_document
 
 
@@ -132,20 +416,85 @@ def get_linked_documents(link_type: str, **kwargs):
         raise backend_exceptions.BackendException(
             "Invalid link_type {}.".format(link_type)
         )
-    db = database.Database()
+    db = database.get_database()
     api = connect.get_api(db)
     curr_path = connect.get_route_instance_path()
     backend_exceptions.require_permissions(api, curr_path, Permission.READ)
     document_db_id = path_to_db_id(curr_path)
 
-    doc = db.linked_documents.document(document_db_id).get()
-    linked_documents = []
-    if doc.exists and (data := doc.to_dict()):
-        for document_db_id in data.get(link_type, []):
-            path = db_id_to_path(document_db_id)
-            linked_documents.append(make_document(api, path))
+    data = read_links(db, [document_db_id])[document_db_id]
+    paths = [db_id_to_path(db_id) for db_id in data.get(link_type, [])]
+    return make_documents(api, paths)
 
-    return linked_documents
+
+@router.get("/linked-documents-graph/<link_type>" + connect.instance_route())
+def get_linked_documents_graph(link_type: str, **kwargs):
+    """Gets every document (technically, workspace) reachable from the current document by following links.
+
+    Returns a list of documents, including the current document, with the fields:
+        documentId:
+        instanceId:
+        links: A list of the documentId and instanceId of each document linked to.
+    """
+    if link_type not in LinkType:
+        raise backend_exceptions.BackendException(
+            "Invalid link_type {}.".format(link_type)
+        )
+    db = database.get_database()
+    api = connect.get_api(db)
+    curr_path = connect.get_route_instance_path()
+    backend_exceptions.require_permissions(api, curr_path, Permission.READ)
+
+    def to_json(db_id: str) -> dict:
+        path = db_id_to_path(db_id)
+        return {"documentId": path.document_id, "instanceId": path.instance_id}
+
+    graph = get_link_graph(db, curr_path, LinkType(link_type))
+    return [
+        to_json(db_id) | {"links": [to_json(link) for link in links]}
+        for db_id, links in graph.items()
+    ]
+
+
+MAX_DOCUMENT_WORKERS = 8
+"""The max number of linked documents make_documents fetches at once."""
+
+WORKSPACES_CACHE_TTL = 60
+"""The number of seconds the workspace names of a linked document may be cached for."""
+
+
+def make_documents(
+    api: Api, paths: Sequence[InstancePath], max_workers: int = MAX_DOCUMENT_WORKERS
+) -> list[dict]:
+    """Calls make_document on each of paths concurrently.
+
+    Returns the documents in the same order as paths.
+    """
+    if len(paths) <= 1:
+        return [make_document(api, path) for path in paths]
+    with futures.ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(lambda path: make_document(api, path), paths))
+
+
+def get_workspace_name(api: Api, path: InstancePath, document: dict) -> str:
+    """Returns the name of the workspace of path.
+
+    Uses the document (as returned by get_document) for the default workspace, and a cached listing of the document's
+    workspaces otherwise. Falls back to the workspace's metadata if the listing is out of date.
+    """
+    default_workspace = document["defaultWorkspace"]
+    if path.instance_id == default_workspace["id"]:
+        return default_workspace["name"]
+
+    workspaces = documents.get_workspaces(api, path, cache_ttl=WORKSPACES_CACHE_TTL)
+    for workspace in workspaces:
+        if workspace["id"] == path.instance_id:
+            return workspace["name"]
+
+    instance_data = get_instance_metadata(api, path)
+    return next(
+        data["value"] for data in instance_data["properties"] if data["name"] == "Name"
+    )
 
 
 def make_document(api: Api, path: InstancePath) -> dict:
@@ -158,19 +507,7 @@ def make_document(api: Api, path: InstancePath) -> dict:
     try:
         linked_document = documents.get_document(api, path)
         name = linked_document["name"]
-
-        default_workspace_instance_id = linked_document["defaultWorkspace"]["id"]
-        is_default_workspace = path.instance_id == default_workspace_instance_id
-        if is_default_workspace:
-            # Technically saves an Onshape call
-            workspace_name = linked_document["defaultWorkspace"]["name"]
-        else:
-            instance_data = get_instance_metadata(api, path)
-            workspace_name = next(
-                data["value"]
-                for data in instance_data["properties"]
-                if data["name"] == "Name"
-            )
+        workspace_name = get_workspace_name(api, path, linked_document)
     except:
         raise backend_exceptions.BackendException(
             "Unexpectedly failed to get name of linked document."
@@ -183,11 +520,3 @@ def make_document(api: Api, path: InstancePath) -> dict:
         "name": name,
         "workspaceName": workspace_name,
     }
-
-
-def get_link_types(link_type: LinkType) -> tuple[LinkType, LinkType]:
-    if link_type == LinkType.PARENTS:
-        return (LinkType.PARENTS, LinkType.CHILDREN)
-    elif link_type == LinkType.CHILDREN:
-        return (LinkType.CHILDREN, LinkType.PARENTS)
-    raise backend_exceptions.BackendException("Invalid link_type {}.".format(link_type))
@@ -1,15 +1,22 @@
+import dataclasses
+import logging
+from concurrent import futures
 from hmac import new
 from math import e, log
 from typing import Iterable
 import flask
 from requests import get
 
-from backend.common.backend_exceptions import require_permissions
+from backend.common.backend_exceptions import (
+    require_permissions,
+    require_permissions_batch,
+)
 
-from backend.common import connect, database
+from backend.common import backend_exceptions, connect, dag, database, jobs
 from backend.endpoints.linked_documents import (
     LinkType,
     db_id_to_path,
+    get_link_graph,
     get_linked_documents,
     make_document,
     path_to_db_id,
@@ -17,14 +24,21 @@ from backend.endpoints.linked_documents import (
 from onshape_api.api.api_base import Api
 from onshape_api.endpoints.permissions import Permission
 
-from flask import current_app
 from onshape_api.endpoints import documents, versions
 from onshape_api.paths.instance_type import InstanceType
-from onshape_api.paths.paths import ElementPath, InstancePath
+from onshape_api.paths.paths import DocumentPath, ElementPath, InstancePath
 from onshape_api.utils.str_utils import parens
 
 router = flask.Blueprint("references", __name__)
 
+logger = logging.getLogger(__name__)
+
+PUSH_VERSION_WORKERS = 4
+"""The max number of documents push_version_recursive updates at once."""
+
+UPDATE_REFERENCES_WORKERS = 4
+"""The max number of elements of a single document which have their references updated at once."""
+
 
 @router.post("/update-references" + connect.instance_route())
 def update_references(*args, **kwargs):
@@ -37,71 +51,157 @@ def update_references(*args, **kwargs):
 
     Returns:
         updatedElements: The number of tabs which had old references that were updated.
+        failedElements: A list of tabs {documentId, instanceId, elementId, message} whose references couldn't be updated.
     """
-    db = database.Database()
+    return prepare_update_references()(jobs.JobContext())
+
+
+@router.post("/jobs/update-references" + connect.instance_route())
+def update_references_job(**kwargs):
+    """Runs update-references as a background job. Returns the job (see jobs.get_job)."""
+    return jobs.submit("update-references", prepare_update_references())
+
+
+def prepare_update_references() -> jobs.JobFn:
+    """Validates an update-references request, returning a function which performs it."""
+    db = database.get_database()
     api = connect.get_api(db)
     instance_path = connect.get_route_instance_path()
     require_permissions(api, instance_path, Permission.WRITE)
     child_document_ids = connect.get_body_optional("childDocumentIds")
     if child_document_ids != None:
-        for document_id in child_document_ids:
-            require_permissions(api, document_id, Permission.LINK)
+        require_permissions_batch(
+            api,
+            [DocumentPath(document_id) for document_id in child_document_ids],
+            Permission.LINK,
+        )
 
-    updated_elements = do_update_references(api, instance_path, child_document_ids)
-    return {"updatedElements": updated_elements}
+    def run(context: jobs.JobContext) -> dict:
+        report = do_update_references(api, instance_path, child_document_ids, context)
+        return {
+            "updatedElements": len(report.updated_elements),
+            "failedElements": report.failures_to_json(),
+        }
 
+    return run
+
+
+@dataclasses.dataclass
+class ReferenceUpdateReport:
+    """The outcome of updating the references of a document.
+
+    Attributes:
+        updated_elements: The ids of the tabs whose references were updated.
+        failed_elements: Maps the ids of tabs whose references couldn't be updated to the reason why.
+    """
+
+    instance_path: InstancePath
+    updated_elements: list[str] = dataclasses.field(default_factory=list)
+    failed_elements: dict[str, str] = dataclasses.field(default_factory=dict)
+
+    def failures_to_json(self) -> list[dict]:
+        return [
+            {
+                "documentId": self.instance_path.document_id,
+                "instanceId": self.instance_path.instance_id,
+                "elementId": element_id,
+                "message": message,
+            }
+            for element_id, message in self.failed_elements.items()
+        ]
 
-def do_update_references(
-    api: Api,
-    instance_path: InstancePath,
-    child_document_ids: Iterable[str] | None = None,
-):
-    """Updates all references from elements in instance_path to any document with child_document_ids to point to the latest version of that reference."""
-    refs = documents.get_external_references(api, instance_path)
-    external_refs: dict = refs["elementExternalReferences"]
 
+def plan_reference_updates(
+    external_references: dict, child_document_ids: Iterable[str] | None = None
+) -> dict[str, list[documents.VersionUpdate]]:
+    """Groups the updates needed to bring outdated references up to date by the tab containing them.
+
+    Args:
+        external_references: The response of get_external_references.
+        child_document_ids: If given, only references to these documents are updated.
+
+    Returns a dict mapping element ids to the updates of that element. Elements without outdated references are omitted.
+    """
+    if child_document_ids is not None:
+        child_document_ids = set(child_document_ids)
     # Maps documentIds to their latest versionId
-    latest_versions: list = refs["latestVersions"]
-    latest_version_dict = {}
-    for latest_version in latest_versions:
-        latest_version_dict[latest_version["documentId"]] = latest_version["id"]
-
-    # For some reason running this asynchronously causes problems...
-    updated_elements = 0
-    for element_id, paths in external_refs.items():
-        target_path = ElementPath.from_path(instance_path, element_id)
+    latest_versions = dict(
+        (latest_version["documentId"], latest_version["id"])
+        for latest_version in external_references["latestVersions"]
+    )
+
+    plan: dict[str, list[documents.VersionUpdate]] = {}
+    for element_id, paths in external_references["elementExternalReferences"].items():
+        reference_updates = []
         for path in paths:
             if not path["isOutOfDate"]:
                 continue
             document_id = path["documentId"]
-            if child_document_ids != None:
-                if document_id not in child_document_ids:
-                    continue
+            if child_document_ids is not None and document_id not in child_document_ids:
+                continue
             # References are always to external versions
             current_instance_path = InstancePath(
                 document_id, path["id"], InstanceType.VERSION
             )
-
-            reference_updates = []
             for referenced_element in path["referencedElements"]:
-                # Runs once for each tab and each outdated document reference
                 current_path = ElementPath.from_path(
                     current_instance_path, referenced_element
                 )
-                update = documents.VersionUpdate(
-                    current_path, latest_version_dict[current_path.document_id]
+                reference_updates.append(
+                    documents.VersionUpdate(current_path, latest_versions[document_id])
                 )
-                reference_updates.append(update)
-
-            # Sometimes externalReferences returns invalid data/updates?
-            try:
-                documents.update_references(api, target_path, reference_updates)
-                updated_elements += 1
-            except:
-                current_app.logger.warning("Failed to update references")
-                continue
+        if reference_updates:
+            plan[element_id] = reference_updates
+    return plan
+
+
+def do_update_references(
+    api: Api,
+    instance_path: InstancePath,
+    child_document_ids: Iterable[str] | None = None,
+    context: jobs.JobContext = jobs.JobContext(),
+    max_workers: int = UPDATE_REFERENCES_WORKERS,
+) -> ReferenceUpdateReport:
+    """Updates all references from elements in instance_path to any document with child_document_ids to point to the latest version of that reference.
 
-    return updated_elements
+    Each element is updated with a single call, and up to max_workers elements are updated at once.
+    An element which fails to update is reported rather than stopping the others.
+    """
+    refs = documents.get_external_references(api, instance_path)
+    plan = plan_reference_updates(refs, child_document_ids)
+
+    def update_element(element_id: str) -> None:
+        context.check_cancelled()
+        target_path = ElementPath.from_path(instance_path, element_id)
+        documents.update_references(api, target_path, plan[element_id])
+
+    report = ReferenceUpdateReport(instance_path)
+    if not plan:
+        return report
+    with futures.ThreadPoolExecutor(min(max_workers, len(plan))) as executor:
+        results = dict(
+            (executor.submit(update_element, element_id), element_id)
+            for element_id in plan
+        )
+        for future in futures.as_completed(results):
+            element_id = results[future]
+            error = future.exception()
+            if error is None:
+                report.updated_elements.append(element_id)
+            elif isinstance(error, jobs.JobCancelled):
+                raise error
+            else:
+                # externalReferences sometimes returns updates Onshape then rejects
+                logger.warning(
+                    "Failed to update references in element %s of %s: %s",
+                    element_id,
+                    instance_path.document_id,
+                    error,
+                )
+                report.failed_elements[element_id] = getattr(
+                    error, "message", str(error)
+                )
+    return report
 
 
 @router.post("/push-version" + connect.instance_route())
@@ -115,8 +215,9 @@ def push_version(**kwargs):
 
     Returns:
         updatedReferences: The number of tabs which had references updated.
+        failedElements: A list of tabs {documentId, instanceId, elementId, message} whose references couldn't be updated.
     """
-    db = database.Database()
+    db = database.get_database()
     api = connect.get_api(db)
     curr_instance = connect.get_route_instance_path()
     require_permissions(api, curr_instance, Permission.WRITE, Permission.LINK)
@@ -126,108 +227,112 @@ def push_version(**kwargs):
     instances_to_update = [
         InstancePath(temp["documentId"], temp["instanceId"]) for temp in body
     ]
-    for instance in instances_to_update:
-        require_permissions(api, instance, Permission.WRITE)
+    require_permissions_batch(api, instances_to_update, Permission.WRITE)
 
     versions.create_version(api, curr_instance, name, description)
 
-    updated_references = 0
-    for update_instance in instances_to_update:
-        updated_references += do_update_references(
-            api, update_instance, [curr_instance.document_id]
-        )
+    reports = [
+        do_update_references(api, update_instance, [curr_instance.document_id])
+        for update_instance in instances_to_update
+    ]
+    return reports_to_json(reports)
+
 
-    return {"updatedReferences": updated_references}
+def reports_to_json(reports: Iterable[ReferenceUpdateReport]) -> dict:
+    updated_references = 0
+    failed_elements = []
+    for report in reports:
+        updated_references += len(report.updated_elements)
+        failed_elements.extend(report.failures_to_json())
+    return {"updatedReferences": updated_references, "failedElements": failed_elements}
 
 
 @router.post("/push-version-recursive" + connect.instance_route())
 def push_version_recursive(**kwargs):
-    """Creates a version, then pushes that new version to all instancesToUpdate.
+    """Creates a version, then pushes it to every document which links to this one, directly or indirectly.
+
+    Each document has its references updated and is versioned once every document it links to has been versioned.
+    Documents which don't depend on each other are updated concurrently.
 
     Args:
-        name: The name of the version to create.
-        description: The description to create.
-        instancesToUpdate: A list of workspace instance objects {documentId, instanceId} to push the version to.
+        name: The name of the versions to create.
+        description: The description of the versions to create.
 
     Returns:
         updatedReferences: The number of tabs which had references updated.
+        failedElements: A list of tabs {documentId, instanceId, elementId, message} whose references couldn't be updated.
     """
-    db = database.Database()
-    api = connect.get_api(db)
-    curr_instance = connect.get_route_instance_path()
-    require_permissions(api, curr_instance, Permission.WRITE, Permission.LINK)
-    name = connect.get_body("name")
-    description = connect.get_body_optional("description", "")
-
-    def get_linked_parents(db, instance, mock_db):
-        if instance in mock_db:
-            return mock_db[instance]
-        document_db_id = path_to_db_id(instance)
-        doc = db.linked_documents.document(document_db_id).get()
-        linked_parents = []
-        if doc.exists and (data := doc.to_dict()):
-            for document_db_id in data.get(LinkType.PARENTS, []):
-                linked_parents.append(db_id_to_path(document_db_id))
-        mock_db[instance] = linked_parents
-
-        return linked_parents
-
-    unvisited_nodes = []
-
-    sorted_list = []
+    return prepare_push_version_recursive()(jobs.JobContext())
 
-    route = []
-    route.append(curr_instance)
 
-    curr_parents = []
+@router.post("/jobs/push-version-recursive" + connect.instance_route())
+def push_version_recursive_job(**kwargs):
+    """Runs push-version-recursive as a background job. Returns the job (see jobs.get_job)."""
+    return jobs.submit("push-version-recursive", prepare_push_version_recursive())
 
-    mock_db = dict()
 
-    while route:
-        print(f"Route: {route}")
-        print(f"Unvisited Nodes: {unvisited_nodes}")
+def get_push_dependencies(parents: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Inverts a graph of parent links into the documents each document must wait for before it's versioned.
 
-        curr_parents = get_linked_parents(db, route[-1], mock_db)
+    Each parent depends on its children, since it references their new versions.
 
-        for parent in sorted_list:
-            if parent in curr_parents:
-                curr_parents.remove(parent)
-
-        if not curr_parents:
-            sorted_list.append(route.pop())
-
-        for parent in curr_parents:
-            if parent in unvisited_nodes:
-                unvisited_nodes.remove(parent)
-
-        unvisited_nodes.extend(curr_parents)
-
-        if curr_parents:
-            if unvisited_nodes:
-                if unvisited_nodes[-1] in route:
-                    raise Exception("Cycle detected")
-                route.append(unvisited_nodes.pop())
-
-    sorted_list.reverse()
-
-    with open("backend/endpoints/logfile.txt", "a") as log_file:
-
-        log_file.write("sorted_list begin\n")
-        for node in sorted_list:
-            log_file.write(f"{documents.get_document(api, node)['name']}\n")
-        log_file.write("sorted_list end\n\n")
+    Raises:
+        ClientException: If a parent is missing from the graph, i.e. the linked documents index is out of date.
+    """
+    dependencies: dict[str, list[str]] = dict((db_id, []) for db_id in parents)
+    for child_id, parent_ids in parents.items():
+        for parent_id in parent_ids:
+            if parent_id not in dependencies:
+                raise backend_exceptions.ClientException(
+                    "The linked documents index is out of date. Rebuild it using rebuild_link_index and try again."
+                )
+            dependencies[parent_id].append(child_id)
+    return dependencies
 
-    for instance in sorted_list:
-        require_permissions(api, instance, Permission.WRITE, Permission.LINK)
 
-    versions.create_version(api, curr_instance, name, description)
-
-    updated_references = 0
-    for update_instance in sorted_list:
+def prepare_push_version_recursive() -> jobs.JobFn:
+    """Validates a push-version-recursive request, returning a function which performs it."""
+    db = database.get_database()
+    api = connect.get_api(db)
+    curr_instance = connect.get_route_instance_path()
+    require_permissions(api, curr_instance, Permission.WRITE, Permission.LINK)
+    name = connect.get_body("name")
+    description = connect.get_body_optional("description", "")
 
-        updated_references += do_update_references(
-            api, update_instance, [doc.document_id for doc in sorted_list]
+    dependencies = get_push_dependencies(
+        get_link_graph(db, curr_instance, LinkType.PARENTS)
+    )
+    paths = dict((db_id, db_id_to_path(db_id)) for db_id in dependencies)
+    try:
+        dag.topological_sort(dependencies)
+    except dag.CycleError as error:
+        names = [
+            backend_exceptions.get_document_name(api, paths[db_id]) or db_id
+            for db_id in error.cycle
+        ]
+        raise backend_exceptions.ClientException(
+            "Linked documents contain a cycle: {}.".format(" -> ".join(names))
         )
-        versions.create_version(api, update_instance, name, description)
+    require_permissions_batch(api, paths.values(), Permission.WRITE, Permission.LINK)
+    document_ids = [path.document_id for path in paths.values()]
+
+    def run(context: jobs.JobContext) -> dict:
+        versioned = []
+
+        def push_version_to(db_id: str) -> ReferenceUpdateReport:
+            context.check_cancelled()
+            instance = paths[db_id]
+            report = do_update_references(api, instance, document_ids, context)
+            versions.create_version(api, instance, name, description)
+            versioned.append(db_id)
+            context.progress(
+                "Versioned document {}".format(instance.document_id),
+                len(versioned),
+                len(paths),
+            )
+            return report
+
+        results = dag.run_dag(dependencies, push_version_to, PUSH_VERSION_WORKERS)
+        return reports_to_json(results.values())
 
-    return {"updatedReferences": updated_references}
+    return run
@@ -1,23 +1,24 @@
 import asyncio
 import re
-from typing import Callable
+from typing import Any, Callable, Coroutine
 import flask
 
 from backend.common.backend_exceptions import require_permissions
-from backend.common import connect, database
+from backend.common import connect, database, jobs
 from onshape_api.api.api_base import Api
+from onshape_api.api.async_api_base import AsyncApi
 from onshape_api.endpoints.documents import ElementType, get_document_elements
-from onshape_api.endpoints.feature_studios import pull_code, push_code
+from onshape_api.endpoints.feature_studios import pull_code_async, push_code
 from onshape_api.endpoints.permissions import Permission
 from onshape_api.endpoints.std_versions import get_latest_std_version
-from onshape_api.paths.paths import ElementPath
+from onshape_api.paths.paths import ElementPath, InstancePath
 
 router = flask.Blueprint("update-featurescripts", __name__)
 
 
 @router.get("/latest-std-version")
 def latest_std_version(*args, **kwargs):
-    db = database.Database()
+    db = database.get_database()
     api = connect.get_api(db)
     return {"stdVersion": get_latest_std_version(api)}
 
@@ -32,30 +33,72 @@ async def update_references(*args, **kwargs):
     Returns:
         updatedStudios: The number of Feature Studios which were modified.
     """
-    db = database.Database()
+    run = prepare_update_featurescript_versions()
+    return {"updatedStudios": await run(jobs.JobContext())}
+
+
+@router.post("/jobs/update-featurescript-version" + connect.instance_route("w"))
+def update_featurescript_versions_job(**kwargs):
+    """Runs update-featurescript-version as a background job. Returns the job (see jobs.get_job)."""
+    run = prepare_update_featurescript_versions()
+
+    def run_job(context: jobs.JobContext) -> dict:
+        return {"updatedStudios": asyncio.run(run(context))}
+
+    return jobs.submit("update-featurescript-version", run_job)
+
+
+def prepare_update_featurescript_versions() -> (
+    Callable[[jobs.JobContext], Coroutine[Any, Any, int]]
+):
+    """Validates an update-featurescript-version request, returning a coroutine function which performs it."""
+    db = database.get_database()
     api = connect.get_api(db)
     instance_path = connect.get_route_instance_path("w")
     require_permissions(api, instance_path, Permission.WRITE)
     std_version = connect.get_body("stdVersion")
 
+    async def run(context: jobs.JobContext) -> int:
+        async with connect.get_async_api(db) as async_api:
+            return await do_update_featurescript_versions(
+                api, async_api, instance_path, std_version, context
+            )
+
+    return run
+
+
+async def do_update_featurescript_versions(
+    api: Api,
+    async_api: AsyncApi,
+    instance_path: InstancePath,
+    std_version: str,
+    context: jobs.JobContext = jobs.JobContext(),
+) -> int:
+    """Updates the std version of every feature studio in instance_path.
+
+    Returns the number of feature studios which were modified.
+    """
     elements = get_document_elements(api, instance_path, ElementType.FEATURE_STUDIO)
 
     feature_studio_paths: list[ElementPath] = []
     tasks: list[asyncio.Task[str]] = []
-    # Pull Feature Studios asynchronously to improve performance
+    # Pull Feature Studios concurrently on the event loop to improve performance
     async with asyncio.TaskGroup() as task_group:
         for studio in elements:
             studio_path = ElementPath.from_path(instance_path, studio["id"])
             feature_studio_paths.append(studio_path)
-            tasks.append(task_group.create_task(pull_code_async(api, studio_path)))
+            tasks.append(
+                task_group.create_task(pull_code_async(async_api, studio_path))
+            )
 
     # We can't push studios asynchronously since Onshape doesn't handle the overlapping calls very well
     updated_studios = 0
-    for studio_path, task in zip(feature_studio_paths, tasks):
+    for i, (studio_path, task) in enumerate(zip(feature_studio_paths, tasks)):
+        context.check_cancelled()
         if update_feature_studio(api, studio_path, task.result(), std_version):
             updated_studios += 1
-
-    return {"updatedStudios": updated_studios}
+        context.progress("Checked Feature Studios", i + 1, len(tasks))
+    return updated_studios
 
 
 OUTDATED_VERSION_MATCH: re.Pattern[str] = re.compile(
@@ -65,10 +108,6 @@ OUTDATED_VERSION_MATCH: re.Pattern[str] = re.compile(
 VERSION_SUB_MATCH = re.compile(r"\d{2,7}")
 
 
-async def pull_code_async(api: Api, feature_studio_path: ElementPath):
-    return pull_code(api, feature_studio_path)
-
-
 def update_feature_studio(
     api: Api, studio_path: ElementPath, code: str, std_version: str
 ) -> bool:
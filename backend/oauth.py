@@ -22,7 +22,7 @@ def sign_in():
         url = request.args.get("redirectOnshapeUri")
         flask.session["redirect_url"] = url
 
-    db = database.Database()
+    db = database.get_database()
     oauth = connect.get_oauth_session(db, connect.OAuthType.SIGN_IN)
     # Saving state is unneeded since Onshape saves it for us
     auth_url, _ = oauth.authorization_url(connect.auth_base_url)
@@ -41,7 +41,7 @@ def redirect():
     if request.args.get("error") == "access_denied":
         return flask.redirect("/grant-denied")
 
-    db = database.Database()
+    db = database.get_database()
     oauth = connect.get_oauth_session(db, connect.OAuthType.REDIRECT)
 
     token = oauth.fetch_token(
@@ -0,0 +1,12 @@
+"""Rebuilds the graph index of the linked-documents collection.
+
+Run once after deploying the graph index, or if the index is ever suspected to be out of date. Until then, documents
+linked before the index existed aren't marked as indexed, so their links are followed rather than their closures read.
+"""
+
+from backend.common import database
+from backend.endpoints.linked_documents import rebuild_link_index
+
+if __name__ == "__main__":
+    count = rebuild_link_index(database.Database())
+    print("Indexed {} linked documents.".format(count))
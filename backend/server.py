@@ -2,7 +2,7 @@ import os
 import flask
 from onshape_api.endpoints import users
 from backend import api
-from backend.common import connect, database, env
+from backend.common import connect, database, env, metrics, scripts
 from backend import oauth
 
 
@@ -16,6 +16,8 @@ def create_app():
         SESSION_COOKIE_SAMESITE="None",
     )
     os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
+    metrics.init_app(app, token=env.metrics_token, serve=not env.is_production)
+    scripts.init_app(app)
 
     app.register_blueprint(api.router)
     app.register_blueprint(oauth.router)
@@ -30,7 +32,7 @@ def create_app():
     @app.get("/app")
     def serve_app():
         """The base route used by Onshape."""
-        db = database.Database()
+        db = database.get_database()
         api = connect.get_api(db)
         authorized = api.oauth.authorized and users.ping(api, catch=True)
         if not authorized:
@@ -0,0 +1,317 @@
+"""Benchmarks CLI and backend workflows against a local Onshape stand-in.
+
+Each workflow reports its wall time, the number of calls made to Onshape and its peak memory.
+Results are saved as json, so runs on different commits can be compared using --compare.
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import io
+import json
+import logging
+import multiprocessing
+import os
+import pathlib
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import requests
+
+from benchmarks.synthetic import SIZES, DocumentSize, SyntheticOnshape
+from benchmarks.workflows import WORKFLOWS, BenchmarkContext, Workflow
+from onshape_api.api.cache import LruCache
+from onshape_api.api.key_api import KeyApi
+from stand_in.fixtures import FixtureStore
+from stand_in.server import (
+    STATS_ROUTE,
+    StandInOptions,
+    StandInServer,
+    create_app,
+)
+
+CACHE_BYTES = 32_000_000
+
+
+@dataclasses.dataclass
+class BenchmarkResult:
+    """The result of benchmarking a single workflow.
+
+    Attributes:
+        wall_time: The median wall time in seconds.
+        wall_times: The wall time of each repetition.
+        calls: The number of requests sent to Onshape.
+        peak_memory: The peak memory allocated while running the workflow, in bytes.
+    """
+
+    workflow: str
+    size_name: str
+    size: DocumentSize
+    wall_time: float
+    wall_times: list[float]
+    calls: int
+    peak_memory: int
+
+
+def serve(directory: str, options: StandInOptions, urls: multiprocessing.Queue) -> None:
+    """Runs the stand-in in a child process, so its work isn't measured."""
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = StandInServer(create_app(FixtureStore(directory), options))
+    urls.put(server.base_url)
+    server.serve_forever()
+
+
+@contextlib.contextmanager
+def stand_in_process(directory: str, options: StandInOptions):
+    """Runs a stand-in serving the fixtures in directory, and yields its url."""
+    context = multiprocessing.get_context("spawn")
+    urls = context.Queue()
+    process = context.Process(target=serve, args=(directory, options, urls))
+    process.start()
+    try:
+        yield urls.get(timeout=30)
+    finally:
+        process.terminate()
+        process.join()
+
+
+def run_once(
+    workflow: Workflow,
+    base_url: str,
+    onshape: SyntheticOnshape,
+    trace_memory: bool,
+) -> tuple[float, int, int]:
+    """Runs a workflow in a fresh working directory.
+
+    Returns a tuple containing the wall time, the number of calls to Onshape and the peak memory.
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            with KeyApi(
+                "benchmark",
+                "benchmark",
+                base_url=base_url,
+                cache=LruCache(CACHE_BYTES),
+            ) as api:
+                context = BenchmarkContext(
+                    api, base_url, onshape, pathlib.Path(directory)
+                )
+                # The workflows print progress, which isn't interesting here
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if workflow.setup is not None:
+                        workflow.setup(context)
+                    requests.delete(base_url + STATS_ROUTE)
+
+                    if trace_memory:
+                        tracemalloc.start()
+                    start = time.perf_counter()
+                    workflow.run(context)
+                    wall_time = time.perf_counter() - start
+                    peak_memory = 0
+                    if trace_memory:
+                        peak_memory = tracemalloc.get_traced_memory()[1]
+                        tracemalloc.stop()
+        finally:
+            os.chdir(cwd)
+
+    calls = requests.get(base_url + STATS_ROUTE).json()["requests"]
+    return wall_time, calls, peak_memory
+
+
+def run_benchmarks(
+    workflows: list[Workflow],
+    sizes: dict[str, DocumentSize],
+    options: StandInOptions,
+    repeat: int,
+) -> list[BenchmarkResult]:
+    results = []
+    for size_name, size in sizes.items():
+        with tempfile.TemporaryDirectory() as fixture_directory:
+            store = FixtureStore(fixture_directory)
+            onshape = SyntheticOnshape(size, store)
+            onshape.generate()
+
+            with stand_in_process(fixture_directory, options) as base_url:
+                for workflow in workflows:
+                    wall_times = []
+                    calls = 0
+                    for _ in range(repeat):
+                        wall_time, calls, _ = run_once(
+                            workflow, base_url, onshape, trace_memory=False
+                        )
+                        wall_times.append(wall_time)
+                    # Tracing memory is slow, so it's measured in a separate run
+                    _, _, peak_memory = run_once(
+                        workflow, base_url, onshape, trace_memory=True
+                    )
+                    result = BenchmarkResult(
+                        workflow.name,
+                        size_name,
+                        size,
+                        statistics.median(wall_times),
+                        wall_times,
+                        calls,
+                        peak_memory,
+                    )
+                    print_result(result)
+                    results.append(result)
+    return results
+
+
+def print_result(result: BenchmarkResult) -> None:
+    print(
+        "{:<30} {:<8} {:>9.3f}s {:>6} calls {:>9.2f} MB".format(
+            result.workflow,
+            result.size_name,
+            result.wall_time,
+            result.calls,
+            result.peak_memory / 1e6,
+        )
+    )
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(
+    path: pathlib.Path, results: list[BenchmarkResult], options: StandInOptions
+) -> None:
+    data = {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "stand_in": dataclasses.asdict(options),
+        "results": [dataclasses.asdict(result) for result in results],
+    }
+    path.write_text(json.dumps(data, indent=4))
+
+
+def compare_results(baseline_path: pathlib.Path, results: list[BenchmarkResult]):
+    """Prints the change in each result relative to a previous run."""
+    baseline = json.loads(baseline_path.read_text())
+    baseline_results = dict(
+        ((result["workflow"], result["size_name"]), result)
+        for result in baseline["results"]
+    )
+    print("\nCompared to {}:".format(baseline.get("commit") or baseline_path))
+    for result in results:
+        previous = baseline_results.get((result.workflow, result.size_name))
+        if previous is None:
+            continue
+        print(
+            "{:<30} {:<8} {:>+8.1f}% time {:>+6} calls {:>+8.1f}% memory".format(
+                result.workflow,
+                result.size_name,
+                percent_change(previous["wall_time"], result.wall_time),
+                result.calls - previous["calls"],
+                percent_change(previous["peak_memory"], result.peak_memory),
+            )
+        )
+
+
+def percent_change(previous: float, current: float) -> float:
+    if previous == 0:
+        return 0
+    return (current - previous) / previous * 100
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark CLI and backend workflows against a local Onshape stand-in."
+    )
+    parser.add_argument(
+        "-w",
+        "--workflow",
+        action="append",
+        choices=[workflow.name for workflow in WORKFLOWS],
+        help="a workflow to run; may be repeated. Defaults to every workflow",
+    )
+    parser.add_argument(
+        "-s",
+        "--size",
+        action="append",
+        choices=list(SIZES.keys()),
+        help="a document size to run; may be repeated. Defaults to small",
+    )
+    parser.add_argument(
+        "--feature-studios", type=int, help="run a custom size with this many studios"
+    )
+    parser.add_argument(
+        "--parts", type=int, help="run a custom size with this many parts"
+    )
+    parser.add_argument(
+        "--mates", type=int, help="run a custom size with this many mates"
+    )
+    parser.add_argument(
+        "--external-refs",
+        type=int,
+        help="run a custom size with this many external references",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="the number of timed runs"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.02,
+        help="seconds the stand-in waits before responding",
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0, help="max seconds randomly added to latency"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="benchmark_results.json",
+        help="the file to save results to",
+    )
+    parser.add_argument(
+        "-c", "--compare", help="a previous results file to compare against"
+    )
+    return parser.parse_args()
+
+
+def get_sizes(args: argparse.Namespace) -> dict[str, DocumentSize]:
+    sizes = dict((name, SIZES[name]) for name in args.size or [])
+    custom = dict(
+        (field.name, value)
+        for field in dataclasses.fields(DocumentSize)
+        if (value := getattr(args, field.name)) is not None
+    )
+    if custom:
+        sizes["custom"] = DocumentSize(**custom)
+    if not sizes:
+        sizes["small"] = SIZES["small"]
+    return sizes
+
+
+def main():
+    args = parse_args()
+    # The async api logs every request
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    workflows = [
+        workflow
+        for workflow in WORKFLOWS
+        if args.workflow is None or workflow.name in args.workflow
+    ]
+    options = StandInOptions(latency=args.latency, jitter=args.jitter, seed=0)
+    results = run_benchmarks(workflows, get_sizes(args), options, args.repeat)
+
+    save_results(pathlib.Path(args.output), results, options)
+    if args.compare is not None:
+        compare_results(pathlib.Path(args.compare), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Generates stand-in fixtures describing synthetic Onshape documents.
+
+The fixtures cover every request made by the benchmarked workflows, so no recording is needed.
+"""
+
+import dataclasses
+import hashlib
+from urllib import parse
+
+from onshape_api.endpoints.documents import ElementType
+from onshape_api.model.constants import STD_PATH, START_VERSION_NAME
+from onshape_api.paths.api_path import api_path
+from onshape_api.paths.instance_type import InstanceType
+from onshape_api.paths.paths import DocumentPath, ElementPath, InstancePath
+from onshape_api.utils import str_utils
+from robot_code.documents import BACKEND, TEST_BACKEND, TEST_FRONTEND
+from robot_code.robot_version import SemVersion, version_name
+from stand_in.fixtures import Fixture, FixtureStore, normalize_query
+
+OUTDATED_STD_VERSION = "2000"
+LATEST_STD_VERSION = "2100"
+
+CODE_LINES = 200
+"""The number of lines of code in each synthetic feature studio."""
+
+
+@dataclasses.dataclass(frozen=True)
+class DocumentSize:
+    """The size of the synthetic documents used by a benchmark.
+
+    Attributes:
+        feature_studios: The number of feature studios in each document.
+        parts: The number of parts in the part studio and the assembly.
+        mates: The number of fastened mates in the assembly.
+        external_refs: The number of outdated external references in the document.
+    """
+
+    feature_studios: int = 10
+    parts: int = 10
+    mates: int = 10
+    external_refs: int = 10
+
+
+SIZES = {
+    "small": DocumentSize(feature_studios=5, parts=10, mates=10, external_refs=5),
+    "medium": DocumentSize(feature_studios=20, parts=50, mates=50, external_refs=20),
+    "large": DocumentSize(feature_studios=80, parts=200, mates=200, external_refs=80),
+}
+
+
+def make_id(*keys: object) -> str:
+    """Returns a deterministic 24 character id, matching the format of Onshape ids."""
+    return hashlib.sha256("/".join(map(str, keys)).encode()).hexdigest()[:24]
+
+
+def studio_name(index: int) -> str:
+    return "benchStudio{}.fs".format(index)
+
+
+def studio_code(index: int, std_version: str = OUTDATED_STD_VERSION) -> str:
+    header = 'FeatureScript {0};\nimport(path : "onshape/std/common.fs", version : "{0}.0");\n\n'.format(
+        std_version
+    )
+    body = "\n".join(
+        "export const value{}_{} = {};".format(index, line, line)
+        for line in range(CODE_LINES)
+    )
+    return header + body
+
+
+class SyntheticOnshape:
+    """Describes synthetic Onshape documents of a given size, and adds the fixtures which serve them.
+
+    Attributes:
+        workspace: The main workspace, containing feature studios, a part studio, an assembly and external references.
+        part_studio: A part studio containing size.parts parts.
+        assembly: An assembly containing size.parts instances and size.mates fastened mates.
+        generated_assembly: The assembly created by generate_assembly.
+    """
+
+    def __init__(self, size: DocumentSize, store: FixtureStore) -> None:
+        self.size = size
+        self.store = store
+        self.workspace = InstancePath(make_id("document"), make_id("workspace"))
+        self.part_studio = ElementPath.from_path(self.workspace, make_id("part studio"))
+        self.assembly = ElementPath.from_path(self.workspace, make_id("assembly"))
+        self.generated_assembly = ElementPath.from_path(
+            self.workspace, make_id("generated assembly")
+        )
+
+    def add(
+        self,
+        method: str,
+        path: str,
+        response: object = {},
+        query: dict | None = None,
+    ) -> None:
+        """Adds a fixture.
+
+        Args:
+            query: The query of the request. If None, the fixture matches any query.
+        """
+        self.store.add(
+            Fixture(
+                method,
+                path,
+                None if query is None else normalize_query(parse.urlencode(query)),
+                response=response,
+            )
+        )
+
+    def generate(self) -> None:
+        """Adds the fixtures used by every workflow."""
+        self.add_std_versions()
+        for instance_path in [self.workspace, BACKEND, TEST_BACKEND, TEST_FRONTEND]:
+            self.add_feature_studios(instance_path)
+        self.add_release()
+        self.add_external_references()
+        self.add_assemblies()
+
+    def studio_path(self, instance_path: InstancePath, index: int) -> ElementPath:
+        return ElementPath.from_path(
+            instance_path, make_id(instance_path.document_id, "studio", index)
+        )
+
+    def studio_element(self, instance_path: InstancePath, index: int) -> dict:
+        return {
+            "name": studio_name(index),
+            "id": self.studio_path(instance_path, index).element_id,
+            "elementType": ElementType.FEATURE_STUDIO,
+            "microversionId": make_id(instance_path.document_id, "microversion", index),
+        }
+
+    def add_std_versions(self) -> None:
+        versions = [{"name": START_VERSION_NAME, "id": make_id("std", "start")}]
+        for std_version in range(
+            int(OUTDATED_STD_VERSION), int(LATEST_STD_VERSION) + 1
+        ):
+            versions.append(
+                {"name": "{}.0".format(std_version), "id": make_id("std", std_version)}
+            )
+        self.add(
+            "GET", api_path("documents", STD_PATH, DocumentPath, "versions"), versions
+        )
+
+    def add_feature_studios(self, instance_path: InstancePath) -> None:
+        elements = [
+            self.studio_element(instance_path, index)
+            for index in range(self.size.feature_studios)
+        ]
+        elements_path = api_path("documents", instance_path, InstancePath, "elements")
+        self.add(
+            "GET",
+            elements_path,
+            elements,
+            {"withThumbnails": False, "elementType": ElementType.FEATURE_STUDIO},
+        )
+        self.add("GET", elements_path, elements, {"withThumbnails": False})
+
+        for index, element in enumerate(elements):
+            path = self.studio_path(instance_path, index)
+            self.add(
+                "GET",
+                elements_path,
+                [element],
+                {"withThumbnails": False, "elementId": element["id"]},
+            )
+            studio_path = api_path("featurestudios", path, ElementPath)
+            self.add(
+                "GET",
+                studio_path,
+                {
+                    "contents": studio_code(index),
+                    "microversionId": element["microversionId"],
+                },
+            )
+            self.add("POST", studio_path)
+            self.add(
+                "GET",
+                api_path("featurestudios", path, ElementPath, "featurespecs"),
+                {
+                    "featureSpecs": [
+                        {"featureTypeName": studio_name(index).removesuffix(".fs")}
+                    ]
+                },
+            )
+
+    def add_release(self) -> None:
+        """Adds the fixtures used to release the first feature studio of TEST_BACKEND."""
+        feature_name = str_utils.display_name(studio_name(0).removesuffix(".fs"))
+        versions = [{"name": START_VERSION_NAME, "id": make_id("release", "start")}]
+        for index in range(self.size.feature_studios):
+            versions.append(
+                {
+                    "name": version_name(feature_name, SemVersion(1, index, 0)),
+                    "id": make_id("release", index),
+                    "description": "",
+                }
+            )
+        versions_path = api_path("documents", TEST_BACKEND, DocumentPath, "versions")
+        self.add("GET", versions_path, versions)
+
+        version_id = make_id("release", "new")
+        self.add("POST", versions_path, {"id": version_id})
+        self.add_feature_studios(
+            InstancePath.from_path(TEST_BACKEND, version_id, InstanceType.VERSION)
+        )
+
+    def add_external_references(self) -> None:
+        """Adds external references to the feature studios of workspace."""
+        element_references: dict[str, list[dict]] = {}
+        latest_versions = []
+        for index in range(self.size.external_refs):
+            document_id = make_id("reference", index)
+            element_id = self.studio_path(
+                self.workspace, index % max(self.size.feature_studios, 1)
+            ).element_id
+            element_references.setdefault(element_id, []).append(
+                {
+                    "documentId": document_id,
+                    "id": make_id("reference", index, "old"),
+                    "isOutOfDate": True,
+                    "referencedElements": [make_id("reference", index, "element")],
+                }
+            )
+            latest_versions.append(
+                {"documentId": document_id, "id": make_id("reference", index, "new")}
+            )
+
+        self.add(
+            "GET",
+            api_path("documents", self.workspace, InstancePath, "externalreferences"),
+            {
+                "elementExternalReferences": element_references,
+                "latestVersions": latest_versions,
+            },
+        )
+        for element_id in element_references:
+            self.add(
+                "POST",
+                api_path(
+                    "elements",
+                    ElementPath.from_path(self.workspace, element_id),
+                    ElementPath,
+                    "updatereferences",
+                ),
+            )
+
+    def add_part_studio_script(self, parts: list[dict]) -> None:
+        """Adds the result of evaluating the base script (backend/scripts/parseBase.fs) against the part studio.
+
+        Each part mirrors its first mate connector onto its second, and the first part is also mirrored about the origin.
+        """
+        mirrors = [
+            {
+                "endMateId": part["mateConnectors"][0]["featureId"],
+                "startMateId": part["mateConnectors"][1]["featureId"],
+                "mateToOrigin": False,
+            }
+            for part in parts
+        ]
+        if parts:
+            mirrors.append(
+                {
+                    "endMateId": parts[0]["mateConnectors"][1]["featureId"],
+                    "mateToOrigin": True,
+                }
+            )
+        result = {"valid": bool(mirrors), "mates": [], "mirrors": mirrors}
+        self.add(
+            "POST",
+            api_path("partstudios", self.part_studio, ElementPath, "featurescript"),
+            {"console": str_utils.to_json(result)},
+        )
+
+    def add_assemblies(self) -> None:
+        parts = [
+            {
+                "partId": "J{}".format(index),
+                "documentId": self.part_studio.document_id,
+                "elementId": self.part_studio.element_id,
+                "configuration": "default",
+                "mateConnectors": [
+                    {"featureId": make_id("mate connector", index, end)}
+                    for end in range(2)
+                ],
+            }
+            for index in range(self.size.parts)
+        ]
+        instances = [
+            {
+                "id": make_id("instance", index),
+                "type": "Part",
+                "partId": part["partId"],
+                "documentId": part["documentId"],
+                "elementId": part["elementId"],
+                "configuration": part["configuration"],
+            }
+            for index, part in enumerate(parts)
+        ]
+        assembly = {"parts": parts, "rootAssembly": {"instances": instances}}
+
+        features = []
+        for index in range(min(self.size.mates, max(self.size.parts - 1, 0))):
+            queries = [
+                {
+                    "featureId": parts[part_index]["mateConnectors"][end]["featureId"],
+                    "path": [instances[part_index]["id"]],
+                }
+                for end, part_index in enumerate([index, index + 1])
+            ]
+            features.append(
+                {
+                    "featureType": "mate",
+                    "featureId": make_id("mate", index),
+                    "parameters": [
+                        {"parameterId": "mateType", "value": "FASTENED"},
+                        {"parameterId": "mateConnectorsQuery", "queries": queries},
+                    ],
+                }
+            )
+
+        self.add("GET", api_path("assemblies", self.assembly, ElementPath), assembly)
+        self.add_part_studio_script(parts)
+        self.add(
+            "GET",
+            api_path("assemblies", self.assembly, ElementPath, "features"),
+            {"features": features},
+        )
+
+        # generate_assembly
+        self.add(
+            "POST",
+            api_path("assemblies", self.workspace, InstancePath),
+            {"id": self.generated_assembly.element_id},
+        )
+        self.add(
+            "POST",
+            api_path("assemblies", self.generated_assembly, ElementPath, "instances"),
+        )
+        self.add(
+            "GET",
+            api_path("assemblies", self.generated_assembly, ElementPath),
+            assembly,
+        )
+        self.add(
+            "POST",
+            api_path("assemblies", self.generated_assembly, ElementPath, "features"),
+        )
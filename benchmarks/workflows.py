@@ -0,0 +1,157 @@
+"""The workflows which are benchmarked.
+
+Each workflow drives a real entry point of the CLI or the backend against a stand-in Onshape.
+"""
+
+import asyncio
+import dataclasses
+import json
+import os
+import pathlib
+from typing import Callable
+from unittest import mock
+
+# The backend reads its credentials on import
+for key in ["OAUTH_CLIENT_ID", "OAUTH_CLIENT_SECRET", "SESSION_SECRET"]:
+    os.environ.setdefault(key, "benchmark")
+
+from backend.endpoints.assembly_mirror import AssemblyMirror
+from backend.endpoints.generate_assembly import do_generate_assembly
+from backend.endpoints.references import do_update_references
+from backend.endpoints.update_featurescripts import do_update_featurescript_versions
+from benchmarks.synthetic import LATEST_STD_VERSION, SyntheticOnshape, studio_name
+from featurescript import conf
+from featurescript.manager import CommandLineManager
+from onshape_api.api.api_base import Api
+from onshape_api.api.async_key_api import AsyncKeyApi
+from onshape_api.paths.paths import ElementPath, path_to_url
+from robot_code import release
+from robot_code.robot_version import VersionType
+
+
+@dataclasses.dataclass
+class BenchmarkContext:
+    """The state available to a workflow.
+
+    Attributes:
+        api: An Api connected to the stand-in.
+        base_url: The url of the stand-in.
+        onshape: The synthetic documents served by the stand-in.
+        directory: An empty working directory, which is also the current directory while the workflow runs.
+    """
+
+    api: Api
+    base_url: str
+    onshape: SyntheticOnshape
+    directory: pathlib.Path
+
+    def make_async_api(self) -> AsyncKeyApi:
+        return AsyncKeyApi("benchmark", "benchmark", base_url=self.base_url)
+
+
+@dataclasses.dataclass
+class Workflow:
+    """A benchmarked workflow.
+
+    Attributes:
+        run: The function which is measured.
+        setup: A function which prepares the working directory and isn't measured.
+    """
+
+    name: str
+    run: Callable[[BenchmarkContext], object]
+    setup: Callable[[BenchmarkContext], object] | None = None
+
+
+def write_config(context: BenchmarkContext) -> None:
+    """Writes the config.json used by the fs command."""
+    studio_path = ElementPath.from_path(context.onshape.workspace, "studio")
+    config = {
+        "storage_path": "storage",
+        "code_path": "code",
+        "code_gen_path": "gen",
+        "documents": {"bench": path_to_url(studio_path)},
+    }
+    pathlib.Path("config.json").write_text(json.dumps(config))
+
+
+def make_manager(context: BenchmarkContext) -> CommandLineManager:
+    return CommandLineManager(conf.Config(), context.api)
+
+
+def fs_pull(context: BenchmarkContext) -> None:
+    make_manager(context).pull()
+
+
+def setup_fs_push(context: BenchmarkContext) -> None:
+    write_config(context)
+    manager = make_manager(context)
+    manager.pull()
+    for studio in manager.curr_data.values():
+        studio.modified = True
+    manager.config.write(manager.curr_data)
+
+
+def fs_push(context: BenchmarkContext) -> None:
+    make_manager(context).push()
+
+
+def setup_fs_build(context: BenchmarkContext) -> None:
+    write_config(context)
+    gen_path = pathlib.Path("gen")
+    gen_path.mkdir(exist_ok=True)
+    for index in range(context.onshape.size.feature_studios):
+        (gen_path / "studio{}.py".format(index)).write_text(
+            "from featurescript.base.studio import Studio\n\n"
+            + 'studio = Studio("{}")\n'.format(studio_name(index))
+        )
+
+
+def fs_build(context: BenchmarkContext) -> None:
+    make_manager(context).build()
+
+
+def release_studio(context: BenchmarkContext) -> None:
+    # Skip the confirmation prompt
+    with mock.patch.object(release, "confirm"):
+        release.release(
+            context.api,
+            studio_name(0),
+            "Benchmark release",
+            version_type=VersionType.PATCH,
+            test=True,
+        )
+
+
+def update_references(context: BenchmarkContext) -> None:
+    do_update_references(context.api, context.onshape.workspace)
+
+
+def assembly_mirror(context: BenchmarkContext) -> None:
+    AssemblyMirror(context.api, context.onshape.assembly).execute()
+
+
+def generate_assembly(context: BenchmarkContext) -> None:
+    do_generate_assembly(context.api, context.onshape.part_studio, "Benchmark")
+
+
+def update_featurescript_version(context: BenchmarkContext) -> None:
+    async def run() -> None:
+        async with context.make_async_api() as async_api:
+            await do_update_featurescript_versions(
+                context.api, async_api, context.onshape.workspace, LATEST_STD_VERSION
+            )
+
+    asyncio.run(run())
+
+
+WORKFLOWS = [
+    Workflow("fs-pull", fs_pull, write_config),
+    Workflow("fs-push", fs_push, setup_fs_push),
+    Workflow("fs-build", fs_build, setup_fs_build),
+    Workflow("release", release_studio),
+    Workflow("update-references", update_references),
+    Workflow("assembly-mirror", assembly_mirror),
+    Workflow("generate-assembly", generate_assembly),
+    Workflow("update-featurescript-version", update_featurescript_version),
+]
@@ -66,21 +66,21 @@ def main():
         manager.clean(config)
         return
 
-    api = key_api.make_key_api()
-    command_line_manager = manager.CommandLineManager(config, api)
-
-    if args.action == "update-versions":
-        command_line_manager.update_versions()
-        if args.push:
-            command_line_manager.push()
-    elif args.action == "build":
-        command_line_manager.build()
-        if args.push:
-            command_line_manager.push()
-    elif args.action == "pull":
-        command_line_manager.pull(args.force)
-    elif args.action == "push":
-        command_line_manager.push(args.force)
+    with key_api.make_key_api() as api:
+        command_line_manager = manager.CommandLineManager(config, api)
+
+        if args.action == "update-versions":
+            command_line_manager.update_versions()
+            if args.push:
+                command_line_manager.push()
+        elif args.action == "build":
+            command_line_manager.build()
+            if args.push:
+                command_line_manager.push()
+        elif args.action == "pull":
+            command_line_manager.pull(args.force)
+        elif args.action == "push":
+            command_line_manager.push(args.force)
 
 
 if __name__ == "__main__":
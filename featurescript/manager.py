@@ -152,7 +152,7 @@ class CommandLineManager:
         # resync microversion ids after all futures are completed
         updated_studio_map = self._get_studio_map()
         for pushed_studio in pushed_studios:
-            updated_studio = updated_studio_map[pushed_studio.path.element_id]
+            updated_studio = updated_studio_map[pushed_studio.name]
             pushed_studio.microversion_id = updated_studio.microversion_id
             self.curr_data[pushed_studio.path.element_id] = pushed_studio
 
@@ -168,7 +168,7 @@ class CommandLineManager:
         force: bool,
         studio_to_push: LocalFeatureStudio,
     ) -> LocalFeatureStudio | None:
-        onshape_studio = onshape_studio_map.get(studio_to_push.path.element_id, None)
+        onshape_studio = onshape_studio_map.get(studio_to_push.name, None)
         # next(
         #     filter(
         #         lambda onshape_studio: onshape_studio.path.element_id
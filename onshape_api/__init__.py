@@ -1,5 +1,16 @@
 __title__ = "api"
 
+from typing import Any
+
 from .api import *
 from .paths import *
 from .exceptions import *
+
+
+def __getattr__(name: str) -> Any:
+    # Forward the lazily imported async clients, see api.ASYNC_EXPORTS
+    from . import api
+
+    if name in api.ASYNC_EXPORTS:
+        return getattr(api, name)
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
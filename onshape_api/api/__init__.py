@@ -1,3 +1,25 @@
+import importlib
+from typing import Any
+
 from .api_base import *
 from .key_api import *
 from .oauth_api import *
+
+ASYNC_EXPORTS = {
+    "AsyncApi": "async_api_base",
+    "AsyncKeyApi": "async_key_api",
+    "make_async_key_api": "async_key_api",
+    "AsyncOAuthApi": "async_oauth_api",
+    "make_async_oauth_api": "async_oauth_api",
+}
+"""Maps the names of the async clients to their modules.
+
+The async clients depend on httpx, so they're only imported when first used, and sync-only users don't need httpx.
+"""
+
+
+def __getattr__(name: str) -> Any:
+    module = ASYNC_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError("module {} has no attribute {}".format(__name__, name))
+    return getattr(importlib.import_module("." + module, __name__), name)
@@ -1,8 +1,31 @@
 from abc import ABC, abstractmethod
+import functools
+import json
 import logging
-from typing import Any, NotRequired, TypedDict, Unpack
+import time
+from typing import Any, NotRequired, Self, TypedDict, Unpack
 import os
 import http
+from urllib import parse
+
+import requests
+from requests import adapters
+
+from onshape_api import exceptions
+from onshape_api.api.cache import (
+    DiskCache,
+    LruCache,
+    ResponseCache,
+    TieredCache,
+    is_immutable_path,
+    make_cache_key,
+)
+from onshape_api.api.hooks import RequestHook, make_record, run_hooks
+from onshape_api.api.memo import RequestMemo
+from onshape_api.api.rate_limit import make_rate_limiter
+from onshape_api.api.request_log import log_response, logger
+from onshape_api.api.retry import RetryPolicy
+from onshape_api.api.single_flight import SingleFlight
 
 logging.basicConfig(level=logging.INFO)
 
@@ -13,11 +36,22 @@ class ApiArgs(TypedDict):
     base_url: NotRequired[str]
     logging: NotRequired[bool]
     version: NotRequired[int | None]
+    pool_connections: NotRequired[int]
+    pool_maxsize: NotRequired[int]
+    retry_policy: NotRequired[RetryPolicy]
+    rate_limit: NotRequired[float | None]
+    rate_burst: NotRequired[int | None]
+    max_in_flight: NotRequired[int | None]
+    user_key: NotRequired[str | None]
+    cache: NotRequired[ResponseCache | None]
+    hooks: NotRequired[list[RequestHook] | None]
+    memo: NotRequired[RequestMemo | None]
 
 
 class ApiQueryArgs(TypedDict):
     query: NotRequired[str | dict]
     headers: NotRequired[dict[str, str]]
+    idempotent: NotRequired[bool]
 
 
 def get_api_base_args() -> ApiArgs:
@@ -35,19 +69,134 @@ def get_api_base_args() -> ApiArgs:
         kwargs["version"] = int(temp)
     if base_url := os.getenv("API_BASE_URL"):
         kwargs["base_url"] = base_url
+    if temp := os.getenv("API_POOL_CONNECTIONS"):
+        kwargs["pool_connections"] = int(temp)
+    if temp := os.getenv("API_POOL_MAXSIZE"):
+        kwargs["pool_maxsize"] = int(temp)
+    if temp := os.getenv("API_MAX_RETRIES"):
+        kwargs["retry_policy"] = RetryPolicy(max_retries=int(temp))
+    if temp := os.getenv("API_RATE_LIMIT"):
+        kwargs["rate_limit"] = float(temp)
+    if temp := os.getenv("API_RATE_BURST"):
+        kwargs["rate_burst"] = int(temp)
+    if temp := os.getenv("API_MAX_IN_FLIGHT"):
+        kwargs["max_in_flight"] = int(temp)
+    kwargs["cache"] = _get_env_cache(
+        float(os.getenv("API_CACHE_MEMORY_MB", 32)),
+        os.getenv("API_CACHE_DIR"),
+        float(os.getenv("API_CACHE_DISK_MB", 256)),
+    )
     return kwargs
 
 
+@functools.cache
+def _get_env_cache(
+    memory_mb: float, directory: str | None, disk_mb: float
+) -> ResponseCache | None:
+    """Returns the process wide response cache described by the environment, or None if caching is disabled."""
+    memory = LruCache(int(memory_mb * 1e6)) if memory_mb > 0 else None
+    if directory is None:
+        return memory
+    disk = DiskCache(directory, int(disk_mb * 1e6))
+    return TieredCache(memory, disk) if memory is not None else disk
+
+
+def make_get_key(
+    path: str,
+    query: dict | str,
+    headers: dict[str, str],
+    user_key: str | None,
+) -> str:
+    """Returns a key identifying a GET request, used to cache and coalesce requests."""
+    query_str = query if isinstance(query, str) else parse.urlencode(query)
+    if headers:
+        query_str += "\n" + parse.urlencode(sorted(headers.items()))
+    return make_cache_key(http.HTTPMethod.GET, path, query_str, user_key)
+
+
+def is_cacheable(path: str, cache_ttl: float | None) -> bool:
+    """Returns True if the response to a GET request to path may be cached."""
+    return cache_ttl is not None or is_immutable_path(path)
+
+
+def get_cache_ttl(path: str, cache_ttl: float | None) -> float | None:
+    """Returns the ttl to cache a response with. Versions and microversions are cached forever."""
+    return None if is_immutable_path(path) else cache_ttl
+
+
+def make_base_url(base_url: str, version: int | None) -> str:
+    """Returns the base url of the REST API, e.g. https://cad.onshape.com/api/v8."""
+    api_url = base_url + "/api"
+    if version:
+        api_url += "/v{}".format(version)
+    return api_url
+
+
+def make_url(base_url: str, path: str, query: dict | str) -> str:
+    query_str = query if isinstance(query, str) else parse.urlencode(query)
+    return base_url + path + "?" + query_str
+
+
+def encode_body(body: dict | str) -> str:
+    return body if isinstance(body, str) else json.dumps(body)
+
+
+def handle_response(res: requests.Response, log: bool = False) -> Any:
+    """Converts a response into json, or raises an ApiError if the request failed.
+
+    Also accepts httpx responses, which share the same interface.
+
+    Args:
+        log: Whether to log the result. The body is only read when it will actually be logged.
+    """
+    status = http.HTTPStatus(res.status_code)
+    if log:
+        log_response(res)
+
+    if status is http.HTTPStatus.TEMPORARY_REDIRECT:
+        # The official Onshape app has redirect handling here, we skip because lazy
+        raise exceptions.ApiError(res.text, status)
+
+        # location = parse.urlparse(res.headers["Location"])
+        # if log:
+        #     logging.info("request redirected to: " + location.geturl())
+        # return self._request(
+        #     method, location.path, query=location.query, headers=headers
+        # )
+
+        # Official handling:
+        # location = urlparse(res.headers["Location"])
+        # querystring = parse_qs(location.query)
+        # if log:
+        #     utils.log('request redirected to: ' + location.geturl())
+        # new_query = {}
+        # new_base_url = location.scheme + '://' + location.netloc
+        # for key in querystring:
+        #     new_query[key] = querystring[key][0]  # won't work for repeated query params
+        # return self.request(method, location.path, query=new_query, headers=headers, base_url=new_base_url)
+    elif not status.is_success:
+        raise exceptions.ApiError(res.text, status)
+
+    try:
+        return res.json()
+    except:
+        return res
+
+
 class Api(ABC):
     """
     Provides generic access to the Onshape REST API.
 
     An instance of this class may be used with any of the endpoints in the endpoints folder.
 
+    Each instance owns a pooled, keep-alive requests.Session which is safe to share between threads.
+    The session should be released using close() or by using the Api as a context manager.
+
     Attributes:
         _base_url: The base url to use.
         _logging: Whether to log or not.
         _path_base: The /api/v portion of the url.
+        _session: The session used to issue requests.
     """
 
     def __init__(
@@ -55,6 +204,16 @@ class Api(ABC):
         base_url: str = "https://cad.onshape.com",
         logging: bool = False,
         version: int | None = 8,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        retry_policy: RetryPolicy | None = None,
+        rate_limit: float | None = None,
+        rate_burst: int | None = None,
+        max_in_flight: int | None = None,
+        user_key: str | None = None,
+        cache: ResponseCache | None = None,
+        hooks: list[RequestHook] | None = None,
+        memo: RequestMemo | None = None,
     ):
         """
         Args:
@@ -63,13 +222,86 @@ class Api(ABC):
             version: The version to use.
                 If the version is None, no version is specified in the url of API calls.
                 Note this does not result in using the latest version of the API automatically.
+            pool_connections: The number of hosts to keep connection pools for.
+            pool_maxsize: The max number of open connections to a single host.
+                Threads which need a connection while the pool is full wait for one to be returned.
+            retry_policy: The policy used to retry throttled and failed requests.
+                Defaults to RetryPolicy().
+            rate_limit: The max number of requests per second. If None, the rate isn't limited.
+            rate_burst: The number of requests which may be sent at once before rate_limit applies.
+            max_in_flight: The max number of concurrent requests. If None, concurrency isn't limited.
+            user_key: A key identifying the user making requests.
+                If given, every Api with the same user_key shares a single rate limit.
+                Otherwise, the rate limit is shared only by threads using this Api.
+                The user_key also scopes cached responses.
+            cache: A cache used to store GET responses. If None, responses aren't cached.
+                Responses to version and microversion paths are always cached, since they never change.
+            hooks: Functions called with a RequestRecord after each request is sent to Onshape.
+                Requests answered by the cache or shared with an identical in-flight GET aren't sent, so aren't recorded.
+            memo: Memoizes every GET response until a write to the same document, e.g. for a single backend request.
         """
         self._logging = logging
-        self._base_url = base_url + "/api"
-        if version:
-            self._base_url += "/v{}".format(version)
+        self._base_url = make_base_url(base_url, version)
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._session = self._make_session()
+        self._mount_pool(self._session)
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._user_key = user_key
+        self._rate_limiter = make_rate_limiter(
+            user_key, rate_limit, rate_burst, max_in_flight
+        )
+        self._cache = cache
+        self._single_flight = SingleFlight()
+        self._hooks = hooks or []
+        self._memo = memo
+
+    @property
+    def user_key(self) -> str | None:
+        """The key identifying the user making requests, if any."""
+        return self._user_key
+
+    def _make_session(self) -> requests.Session:
+        """Constructs the session used to issue requests.
+
+        Subclasses may override this to use a specialized session, e.g. an OAuth2Session.
+        """
+        return requests.Session()
+
+    def _mount_pool(self, session: requests.Session) -> None:
+        """Mounts a sized connection pool onto session."""
+        adapter = adapters.HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            pool_block=True,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """Closes every pooled connection owned by this Api."""
+        self._session.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
 
     @abstractmethod
+    def _send(
+        self,
+        method: http.HTTPMethod,
+        url: str,
+        body: str,
+        headers: dict[str, str],
+    ) -> requests.Response:
+        """Sends a single attempt of a request to Onshape.
+
+        This is called once per attempt, so any signing should be done here.
+        """
+        ...
+
     def _request(
         self,
         method: http.HTTPMethod,
@@ -77,15 +309,22 @@ class Api(ABC):
         query: dict | str = "",
         body: dict | str = "",
         headers: dict[str, str] = {},
+        idempotent: bool | None = None,
     ) -> Any:
         """
         Issues a request to Onshape.
+
+        Throttled and failed requests are retried according to the retry policy.
+        Once the request finishes, each hook is called with a RequestRecord describing it.
+
         Args:
             method: An HTTP method.
             path: A path for the request, e.g. "documents/...".
             query: Query parameters for the request.
             body: A body for the POST request.
             headers: Extra headers to add to the request.
+            idempotent: True if the request may be safely repeated, False if it may not.
+                If None, only GET requests are considered idempotent.
 
         Returns:
             The response from Onshape parsed as json, or the Response itself.
@@ -93,15 +332,118 @@ class Api(ABC):
         Throws:
             ApiException: If Onshape returns an invalid response.
         """
-        ...
+        url = make_url(self._base_url, path, query)
+        body_str = encode_body(body)
 
-    def get(self, path: str, **kwargs: Unpack[ApiQueryArgs]) -> Any:
-        return self._request(http.HTTPMethod.GET, path=path, **kwargs)
+        start = time.perf_counter()
+        attempt = 0
+        res = None
+        try:
+            while True:
+                res = None
+                try:
+                    with self._rate_limiter.limit():
+                        res = self._send(method, url, body_str, headers)
+                except requests.ConnectionError as error:
+                    if not self._retry_policy.should_retry_error(
+                        method, attempt, idempotent
+                    ):
+                        raise error
+                    delay = self._retry_policy.get_delay(attempt)
+                    reason = str(error)
+                else:
+                    status = http.HTTPStatus(res.status_code)
+                    if not self._retry_policy.should_retry_status(
+                        method, status, attempt, idempotent
+                    ):
+                        return handle_response(res, self._logging)
+                    delay = self._retry_policy.get_delay(
+                        attempt, res.headers.get("Retry-After")
+                    )
+                    if delay is None:
+                        return handle_response(res, self._logging)
+                    reason = str(status)
+                    # Release the connection back to the pool before sleeping
+                    res.close()
+
+                logger.warning(
+                    "Retrying %s %s in %.2fs (%s)", method, path, delay, reason
+                )
+                time.sleep(delay)
+                attempt += 1
+        finally:
+            if self._hooks:
+                latency = time.perf_counter() - start
+                run_hooks(self._hooks, make_record(method, path, res, latency, attempt))
+
+    def get(
+        self,
+        path: str,
+        cache_ttl: float | None = None,
+        **kwargs: Unpack[ApiQueryArgs],
+    ) -> Any:
+        """
+        Args:
+            cache_ttl: If given, the response may be cached for cache_ttl seconds.
+                Used to cache reads of mutable paths which rarely change.
+
+        If an identical GET is already in flight (e.g. from another thread), its response is shared rather than
+        sending another request.
+        """
+        key = make_get_key(
+            path,
+            kwargs.get("query", ""),
+            kwargs.get("headers", {}),
+            self._user_key,
+        )
+        if self._memo is not None:
+            found, value = self._memo.get(key, path)
+            if found:
+                return value
+            generation = self._memo.generation()
+
+        cache = self._cache if is_cacheable(path, cache_ttl) else None
+        if cache is not None:
+            found, value = cache.get(key)
+            if found:
+                return value
+
+        def fetch() -> Any:
+            value = self._request(http.HTTPMethod.GET, path=path, **kwargs)
+            if cache is not None and not isinstance(value, requests.Response):
+                cache.set(key, value, get_cache_ttl(path, cache_ttl))
+            return value
+
+        # Concurrent identical GETs share a single request
+        value = self._single_flight.do(key, fetch)
+        if self._memo is not None and not isinstance(value, requests.Response):
+            self._memo.set(key, path, value, generation)
+        return value
 
     def post(
-        self, path: str, body: dict | str = "", **kwargs: Unpack[ApiQueryArgs]
+        self,
+        path: str,
+        body: dict | str = "",
+        invalidates: bool = True,
+        **kwargs: Unpack[ApiQueryArgs],
     ) -> Any:
-        return self._request(http.HTTPMethod.POST, path, body=body, **kwargs)
+        """
+        Args:
+            invalidates: False if the request only reads, e.g. a FeatureScript evaluation, so memoized responses are kept.
+        """
+        try:
+            return self._request(http.HTTPMethod.POST, path, body=body, **kwargs)
+        finally:
+            if invalidates:
+                self._invalidate(path)
 
     def delete(self, path: str, **kwargs: Unpack[ApiQueryArgs]) -> Any:
-        return self._request(http.HTTPMethod.DELETE, path=path, **kwargs)
+        try:
+            return self._request(http.HTTPMethod.DELETE, path=path, **kwargs)
+        finally:
+            self._invalidate(path)
+
+    def _invalidate(self, path: str) -> None:
+        """Discards memoized responses which a write to path may have changed."""
+        if self._memo is not None:
+            self._memo.invalidate(path)
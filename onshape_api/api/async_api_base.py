@@ -0,0 +1,225 @@
+import asyncio
+from abc import ABC, abstractmethod
+import http
+import time
+from typing import Any, Self, Unpack
+
+import httpx
+
+from onshape_api.api.api_base import (
+    ApiQueryArgs,
+    encode_body,
+    get_cache_ttl,
+    handle_response,
+    is_cacheable,
+    make_base_url,
+    make_get_key,
+    make_url,
+)
+from onshape_api.api.cache import ResponseCache
+from onshape_api.api.hooks import RequestHook, make_record, run_hooks
+from onshape_api.api.memo import RequestMemo
+from onshape_api.api.rate_limit import make_rate_limiter
+from onshape_api.api.request_log import logger
+from onshape_api.api.retry import RetryPolicy
+from onshape_api.api.single_flight import AsyncSingleFlight
+
+__all__ = ["AsyncApi"]
+
+
+class AsyncApi(ABC):
+    """
+    Provides generic asyncio access to the Onshape REST API.
+
+    This is the async counterpart of Api. It accepts the same arguments (see ApiArgs),
+    and may be used with the async variants of the functions in the endpoints folder, e.g. get_document_async.
+
+    Each instance owns an httpx.AsyncClient, so it should only be used from a single event loop.
+    The client should be released using aclose() or by using the AsyncApi as an async context manager.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://cad.onshape.com",
+        logging: bool = False,
+        version: int | None = 8,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        retry_policy: RetryPolicy | None = None,
+        rate_limit: float | None = None,
+        rate_burst: int | None = None,
+        max_in_flight: int | None = None,
+        user_key: str | None = None,
+        cache: ResponseCache | None = None,
+        hooks: list[RequestHook] | None = None,
+        memo: RequestMemo | None = None,
+    ):
+        """
+        Args:
+            pool_connections: Unused; httpx keeps a single pool per client.
+            See Api for the remaining args.
+        """
+        self._logging = logging
+        self._base_url = make_base_url(base_url, version)
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize
+            ),
+            # Match requests, which doesn't time out
+            timeout=None,
+        )
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._user_key = user_key
+        self._rate_limiter = make_rate_limiter(
+            user_key, rate_limit, rate_burst, max_in_flight
+        )
+        self._cache = cache
+        self._single_flight = AsyncSingleFlight()
+        self._hooks = hooks or []
+        self._memo = memo
+
+    @property
+    def user_key(self) -> str | None:
+        """The key identifying the user making requests, if any."""
+        return self._user_key
+
+    async def aclose(self) -> None:
+        """Closes every pooled connection owned by this AsyncApi."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    @abstractmethod
+    async def _send(
+        self,
+        method: http.HTTPMethod,
+        url: str,
+        body: str,
+        headers: dict[str, str],
+    ) -> httpx.Response:
+        """Sends a single attempt of a request to Onshape.
+
+        This is called once per attempt, so any signing should be done here.
+        """
+        ...
+
+    async def _request(
+        self,
+        method: http.HTTPMethod,
+        path: str,
+        query: dict | str = "",
+        body: dict | str = "",
+        headers: dict[str, str] = {},
+        idempotent: bool | None = None,
+    ) -> Any:
+        """Issues a request to Onshape.
+
+        See Api._request.
+        """
+        url = make_url(self._base_url, path, query)
+        body_str = encode_body(body)
+
+        start = time.perf_counter()
+        attempt = 0
+        res = None
+        try:
+            while True:
+                res = None
+                try:
+                    async with self._rate_limiter.limit_async():
+                        res = await self._send(method, url, body_str, headers)
+                except httpx.TransportError as error:
+                    if not self._retry_policy.should_retry_error(
+                        method, attempt, idempotent
+                    ):
+                        raise error
+                    delay = self._retry_policy.get_delay(attempt)
+                    reason = str(error)
+                else:
+                    status = http.HTTPStatus(res.status_code)
+                    if not self._retry_policy.should_retry_status(
+                        method, status, attempt, idempotent
+                    ):
+                        return handle_response(res, self._logging)
+                    delay = self._retry_policy.get_delay(
+                        attempt, res.headers.get("Retry-After")
+                    )
+                    if delay is None:
+                        return handle_response(res, self._logging)
+                    reason = str(status)
+
+                logger.warning(
+                    "Retrying %s %s in %.2fs (%s)", method, path, delay, reason
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+        finally:
+            if self._hooks:
+                latency = time.perf_counter() - start
+                run_hooks(self._hooks, make_record(method, path, res, latency, attempt))
+
+    async def get(
+        self,
+        path: str,
+        cache_ttl: float | None = None,
+        **kwargs: Unpack[ApiQueryArgs],
+    ) -> Any:
+        key = make_get_key(
+            path,
+            kwargs.get("query", ""),
+            kwargs.get("headers", {}),
+            self._user_key,
+        )
+        if self._memo is not None:
+            found, value = self._memo.get(key, path)
+            if found:
+                return value
+            generation = self._memo.generation()
+
+        cache = self._cache if is_cacheable(path, cache_ttl) else None
+        if cache is not None:
+            found, value = cache.get(key)
+            if found:
+                return value
+
+        async def fetch() -> Any:
+            value = await self._request(http.HTTPMethod.GET, path=path, **kwargs)
+            if cache is not None and not isinstance(value, httpx.Response):
+                cache.set(key, value, get_cache_ttl(path, cache_ttl))
+            return value
+
+        value = await self._single_flight.do(key, fetch)
+        if self._memo is not None and not isinstance(value, httpx.Response):
+            self._memo.set(key, path, value, generation)
+        return value
+
+    async def post(
+        self,
+        path: str,
+        body: dict | str = "",
+        invalidates: bool = True,
+        **kwargs: Unpack[ApiQueryArgs],
+    ) -> Any:
+        """
+        Args:
+            invalidates: False if the request only reads, e.g. a FeatureScript evaluation, so memoized responses are kept.
+        """
+        try:
+            return await self._request(http.HTTPMethod.POST, path, body=body, **kwargs)
+        finally:
+            if invalidates:
+                self._invalidate(path)
+
+    async def delete(self, path: str, **kwargs: Unpack[ApiQueryArgs]) -> Any:
+        try:
+            return await self._request(http.HTTPMethod.DELETE, path=path, **kwargs)
+        finally:
+            self._invalidate(path)
+
+    def _invalidate(self, path: str) -> None:
+        if self._memo is not None:
+            self._memo.invalidate(path)
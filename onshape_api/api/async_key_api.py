@@ -0,0 +1,63 @@
+from __future__ import annotations
+from typing import Unpack, override
+import http
+import os
+
+import httpx
+
+from onshape_api.api.api_base import ApiArgs, get_api_base_args
+from onshape_api.api.request_log import log_request
+from onshape_api.api.async_api_base import AsyncApi
+from onshape_api.api.key_api import make_headers
+from onshape_api.utils import env_utils
+
+
+def make_async_key_api(load_dotenv: bool = True) -> AsyncKeyApi:
+    """Constructs an instance of an async ApiKey API using credentials read from a .env file.
+
+    See make_key_api.
+    """
+    if load_dotenv:
+        env_utils.load_env()
+    kwargs = get_api_base_args()
+    access_key = os.getenv("API_ACCESS_KEY")
+    secret_key = os.getenv("API_SECRET_KEY")
+
+    if access_key is None:
+        raise KeyError("API_ACCESS_KEY is a required env variable")
+    if secret_key is None:
+        raise KeyError("API_SECRET_KEY is a required env variable")
+
+    return AsyncKeyApi(access_key, secret_key, user_key=access_key, **kwargs)
+
+
+class AsyncKeyApi(AsyncApi):
+    """Provides asyncio access to the Onshape API using API keys.
+
+    Requests are signed in the same way as KeyApi.
+    """
+
+    def __init__(
+        self, access_key: str, secret_key: str, **kwargs: Unpack[ApiArgs]
+    ) -> None:
+        super().__init__(**kwargs)
+        self._access_key = access_key
+        self._secret_key = secret_key
+
+    @override
+    async def _send(
+        self,
+        method: http.HTTPMethod,
+        url: str,
+        body: str,
+        headers: dict[str, str],
+    ) -> httpx.Response:
+        # Headers are re-signed on every attempt so retries get a fresh Date and On-Nonce
+        headers = make_headers(method, headers, url, self._access_key, self._secret_key)
+
+        if self._logging:
+            log_request(method, url, headers, body)
+
+        return await self._client.request(
+            method, url, headers=headers, content=body, follow_redirects=False
+        )
@@ -0,0 +1,169 @@
+from __future__ import annotations
+import asyncio
+import inspect
+import time
+from typing import Any, Awaitable, Callable, Unpack, override
+import http
+
+import httpx
+
+from onshape_api.api.api_base import ApiArgs, get_api_base_args
+from onshape_api.api.request_log import log_request
+from onshape_api.api.hooks import RequestHook
+from onshape_api.api.memo import RequestMemo
+from onshape_api.api.async_api_base import AsyncApi
+from onshape_api.utils import env_utils
+
+TOKEN_EXPIRY_MARGIN = 30
+"""The number of seconds before a token expires at which it is refreshed."""
+
+TokenRefresher = Callable[[dict], dict | Awaitable[dict]]
+"""Returns the token to use in place of an expired token. May be a coroutine function."""
+
+
+def make_async_oauth_api(
+    token: dict | None,
+    client_id: str,
+    client_secret: str,
+    token_url: str,
+    token_updater: Callable[[dict], Any] | None = None,
+    load_dotenv: bool = False,
+    user_key: str | None = None,
+    hooks: list[RequestHook] | None = None,
+    memo: RequestMemo | None = None,
+    token_refresher: TokenRefresher | None = None,
+) -> AsyncOAuthApi:
+    """
+    Args:
+        token_refresher: Replaces the default token refresh, see AsyncOAuthApi.
+        user_key: A key identifying the OAuth user. Apis with the same user_key share a rate limit.
+        hooks: Functions called after each request to Onshape.
+        memo: Memoizes GET responses until a write to the same document.
+    """
+    if load_dotenv:
+        env_utils.load_env()
+    kwargs = get_api_base_args()
+    kwargs["user_key"] = user_key
+    kwargs["hooks"] = hooks
+    kwargs["memo"] = memo
+    return AsyncOAuthApi(
+        token,
+        client_id,
+        client_secret,
+        token_url,
+        token_updater,
+        token_refresher=token_refresher,
+        **kwargs,
+    )
+
+
+class AsyncOAuthApi(AsyncApi):
+    """Provides asyncio access to the Onshape API via OAuth.
+
+    Expired tokens are refreshed automatically, mirroring the auto refresh behavior of OAuth2Session.
+    """
+
+    def __init__(
+        self,
+        token: dict | None,
+        client_id: str,
+        client_secret: str,
+        token_url: str,
+        token_updater: Callable[[dict], Any] | None = None,
+        token_refresher: TokenRefresher | None = None,
+        **kwargs: Unpack[ApiArgs],
+    ):
+        """
+        Args:
+            token: An OAuth token, as returned by OAuth2Session.fetch_token.
+            token_url: The url used to refresh the token.
+            token_updater: A function (or coroutine function) which is called with the new token after each refresh.
+            token_refresher: Replaces the default refresh, e.g. to coordinate refreshes with other processes.
+                It's called with the expired token and is responsible for saving the new token, so token_updater
+                isn't called.
+        """
+        super().__init__(**kwargs)
+        self.token = token
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._token_url = token_url
+        self._token_updater = token_updater
+        self._token_refresher = token_refresher
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def authorized(self) -> bool:
+        return self.token is not None and "access_token" in self.token
+
+    def _is_expired(self) -> bool:
+        if self.token is None or "expires_at" not in self.token:
+            return False
+        return self.token["expires_at"] - TOKEN_EXPIRY_MARGIN < time.time()
+
+    async def refresh_token(self) -> None:
+        """Exchanges the refresh token for a new token."""
+        if self.token is None or "refresh_token" not in self.token:
+            return
+        old_token = self.token
+        async with self._refresh_lock:
+            if self.token is not old_token:
+                # Another task already refreshed the token
+                return
+            if self._token_refresher is not None:
+                result = self._token_refresher(old_token)
+                self.token = await result if inspect.isawaitable(result) else result
+                return
+
+            res = await self._client.post(
+                self._token_url,
+                data={
+                    "grant_type": "refresh_token",
+                    "refresh_token": old_token["refresh_token"],
+                    "client_id": self._client_id,
+                    "client_secret": self._client_secret,
+                },
+            )
+            res.raise_for_status()
+            token = res.json()
+            if "expires_in" in token:
+                token["expires_at"] = time.time() + int(token["expires_in"])
+            self.token = token
+
+            if self._token_updater is not None:
+                result = self._token_updater(token)
+                if inspect.isawaitable(result):
+                    await result
+
+    @override
+    async def _send(
+        self,
+        method: http.HTTPMethod,
+        url: str,
+        body: str,
+        headers: dict[str, str],
+    ) -> httpx.Response:
+        if self._logging:
+            log_request(method, url, headers, body)
+
+        if self._is_expired():
+            await self.refresh_token()
+
+        res = await self._client.request(
+            method, url, headers=self._make_headers(headers), content=body
+        )
+        if res.status_code == http.HTTPStatus.UNAUTHORIZED and self.authorized:
+            # The token may have been revoked or expired early
+            old_token = self.token
+            await self.refresh_token()
+            if self.token is not old_token:
+                res = await self._client.request(
+                    method, url, headers=self._make_headers(headers), content=body
+                )
+        return res
+
+    def _make_headers(self, headers: dict[str, str]) -> dict[str, str]:
+        req_headers = headers.copy()
+        req_headers["Content-Type"] = headers.get("Content-Type", "application/json")
+        if self.token is not None and "access_token" in self.token:
+            req_headers["Authorization"] = "Bearer " + self.token["access_token"]
+        return req_headers
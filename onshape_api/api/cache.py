@@ -0,0 +1,247 @@
+"""Response caches which may be used by Api to avoid repeating reads.
+
+Responses are stored as serialized json, so every hit returns a fresh object which callers are free to mutate.
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import collections
+import dataclasses
+import hashlib
+import json
+import os
+import pathlib
+import re
+import threading
+import time
+from typing import Any
+
+__all__ = [
+    "CacheStats",
+    "ResponseCache",
+    "LruCache",
+    "DiskCache",
+    "TieredCache",
+    "is_immutable_path",
+    "make_cache_key",
+]
+
+IMMUTABLE_PATH_MATCH = re.compile(r"/d/[^/]+/[vm]/")
+"""Matches paths which address a version or microversion of a document."""
+
+
+def is_immutable_path(path: str) -> bool:
+    """Returns True if path addresses a version or microversion.
+
+    The contents of a version or microversion never change, so responses to such paths may be cached forever.
+    """
+    return IMMUTABLE_PATH_MATCH.search(path) is not None
+
+
+def make_cache_key(method: str, path: str, query: str, scope: str | None) -> str:
+    """Constructs a cache key for a request.
+
+    Args:
+        scope: A key identifying the user, so users never receive responses cached for someone else.
+    """
+    return "\n".join([scope or "", method, path, query])
+
+
+Entry = tuple[str, float | None]
+"""A serialized response and the time it expires at, if any."""
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class ResponseCache(ABC):
+    """A thread safe store of parsed json responses."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Returns a tuple of whether key was found and the cached value."""
+        entry = self._get(key)
+        with self._lock:
+            if entry is None:
+                self.stats.misses += 1
+                return (False, None)
+            self.stats.hits += 1
+        return (True, json.loads(entry[0]))
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Caches value.
+
+        Args:
+            ttl: The number of seconds value is valid for. If None, value is valid forever.
+        """
+        expires = None if ttl is None else time.time() + ttl
+        self._set(key, json.dumps(value), expires)
+
+    @abstractmethod
+    def _get(self, key: str) -> Entry | None:
+        """Returns the serialized value of key and its expiry, or None if it doesn't exist or has expired."""
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, data: str, expires: float | None) -> None: ...
+
+
+class LruCache(ResponseCache):
+    """An in memory cache which evicts the least recently used responses."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """
+        Args:
+            max_bytes: The max total size of the cached responses.
+        """
+        super().__init__()
+        self.max_bytes = max_bytes
+        self._size = 0
+        self._entries: collections.OrderedDict[str, Entry] = collections.OrderedDict()
+
+    def _get(self, key: str) -> Entry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, expires = entry
+            if expires is not None and expires < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _set(self, key: str, data: str, expires: float | None) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (data, expires)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        data, _ = self._entries.pop(key)
+        self._size -= len(data)
+
+
+DISK_EVICTION_TARGET = 0.9
+"""The fraction of max_bytes a DiskCache evicts down to, so evictions, which scan the directory, happen in batches."""
+
+
+class DiskCache(ResponseCache):
+    """A cache which persists responses as files in a directory, so they survive between runs.
+
+    The total size of the directory is tracked in memory. When it grows beyond max_bytes, the least recently used files
+    are removed until the directory is back under DISK_EVICTION_TARGET of max_bytes.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int) -> None:
+        super().__init__()
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._size = sum(size for _, size, _ in self._scan())
+
+    def _file(self, key: str) -> pathlib.Path:
+        return self.directory / (hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def _scan(self) -> list[tuple[float, int, pathlib.Path]]:
+        """Returns the modified time, size, and path of every file in the cache."""
+        files = []
+        for file in self.directory.glob("*.json"):
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, file))
+        return files
+
+    def _get(self, key: str) -> Entry | None:
+        file = self._file(key)
+        try:
+            entry = json.loads(file.read_text())
+        except (OSError, ValueError):
+            return None
+        expires = entry["expires"]
+        if expires is not None and expires < time.time():
+            with self._lock:
+                self._size -= get_file_size(file)
+                file.unlink(missing_ok=True)
+            return None
+        # Touch the file so eviction is least recently used
+        file.touch()
+        return (entry["data"], expires)
+
+    def _set(self, key: str, data: str, expires: float | None) -> None:
+        file = self._file(key)
+        temp = file.with_suffix(".tmp{}".format(threading.get_ident()))
+        text = json.dumps({"expires": expires, "data": data})
+        temp.write_text(text)
+        with self._lock:
+            self._size += len(text.encode()) - get_file_size(file)
+            # Replace atomically so concurrent readers never see a partial file
+            temp.replace(file)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Removes the least recently used files until the cache is under its eviction target.
+
+        Must be called while holding the lock. Rescans the directory, which also corrects the tracked size if other
+        processes share the directory.
+        """
+        files = self._scan()
+        files.sort()
+        size = sum(file[1] for file in files)
+        target = self.max_bytes * DISK_EVICTION_TARGET
+        for _, file_size, file in files:
+            if size <= target:
+                break
+            file.unlink(missing_ok=True)
+            size -= file_size
+            self.stats.evictions += 1
+        self._size = size
+
+
+def get_file_size(file: pathlib.Path) -> int:
+    """Returns the size of a file, or 0 if it doesn't exist."""
+    try:
+        return file.stat().st_size
+    except OSError:
+        return 0
+
+
+class TieredCache(ResponseCache):
+    """Combines a fast cache with a slower, larger cache.
+
+    Hits in the slow tier are promoted into the fast tier.
+    """
+
+    def __init__(self, fast: ResponseCache, slow: ResponseCache) -> None:
+        super().__init__()
+        self.fast = fast
+        self.slow = slow
+
+    def _get(self, key: str) -> Entry | None:
+        entry = self.fast._get(key)
+        if entry is not None:
+            return entry
+        entry = self.slow._get(key)
+        if entry is not None:
+            self.fast._set(key, *entry)
+        return entry
+
+    def _set(self, key: str, data: str, expires: float | None) -> None:
+        self.fast._set(key, data, expires)
+        self.slow._set(key, data, expires)
@@ -0,0 +1,89 @@
+"""Defines hooks which observe each request an Api sends to Onshape."""
+
+import dataclasses
+import http
+import re
+from typing import Callable
+
+from onshape_api.api.request_log import logger
+
+__all__ = ["RequestRecord", "RequestHook", "make_route"]
+
+ID_PATTERN = re.compile(r"^[0-9a-f]{24}$")
+"""Matches an Onshape document, workspace, version, microversion or element id."""
+
+ID_PLACEHOLDERS = {
+    "d": "{did}",
+    "w": "{wid}",
+    "v": "{vid}",
+    "m": "{mid}",
+    "e": "{eid}",
+    "partid": "{pid}",
+}
+"""Maps path prefixes to the placeholder used for the id which follows them."""
+
+
+@dataclasses.dataclass
+class RequestRecord:
+    """Describes a single request sent to Onshape, including any retries.
+
+    Attributes:
+        method: The method of the request.
+        route: The path of the request with ids replaced by placeholders, e.g. /documents/d/{did}/w/{wid}.
+        status: The status of the final response, or None if no response was received.
+        latency: The number of seconds from the first attempt until the final response, including retry delays.
+        bytes: The size of the body of the final response.
+        retries: The number of retries made after the first attempt.
+    """
+
+    method: str
+    route: str
+    status: int | None
+    latency: float
+    bytes: int
+    retries: int
+
+
+RequestHook = Callable[[RequestRecord], None]
+"""A function which is called after each request to Onshape."""
+
+
+def make_route(path: str) -> str:
+    """Returns path with its ids replaced by placeholders.
+
+    Routes are used to group requests without creating a distinct group for every document.
+    """
+    segments = path.split("/")
+    for i, segment in enumerate(segments):
+        if i > 0 and (placeholder := ID_PLACEHOLDERS.get(segments[i - 1])):
+            segments[i] = placeholder
+        elif ID_PATTERN.match(segment):
+            segments[i] = "{id}"
+    return "/".join(segments)
+
+
+def make_record(
+    method: http.HTTPMethod,
+    path: str,
+    res: object | None,
+    latency: float,
+    retries: int,
+) -> RequestRecord:
+    """Constructs a RequestRecord from a requests or httpx response."""
+    status = getattr(res, "status_code", None)
+    content = getattr(res, "content", b"")
+    return RequestRecord(
+        str(method), make_route(path), status, latency, len(content or b""), retries
+    )
+
+
+def run_hooks(hooks: list[RequestHook], record: RequestRecord) -> None:
+    """Calls each hook with record.
+
+    Hooks only observe requests, so a failing hook is logged rather than failing the request.
+    """
+    for hook in hooks:
+        try:
+            hook(record)
+        except Exception:
+            logger.exception("Request hook failed")
@@ -1,5 +1,4 @@
 from __future__ import annotations
-import json
 import secrets
 from typing import Unpack, override
 import string
@@ -8,14 +7,13 @@ import os
 import hmac
 import hashlib
 import base64
-import logging
 from datetime import datetime, timezone
 from urllib import parse
 
 import requests
 
-from onshape_api import exceptions
 from onshape_api.api.api_base import Api, ApiArgs, get_api_base_args
+from onshape_api.api.request_log import log_request, logger
 from onshape_api.utils import env_utils
 
 
@@ -37,7 +35,8 @@ def make_key_api(load_dotenv: bool = True) -> KeyApi:
     if secret_key is None:
         raise KeyError("API_SECRET_KEY is a required env variable")
 
-    return KeyApi(access_key, secret_key, **kwargs)
+    # Instances using the same credentials share a rate limit
+    return KeyApi(access_key, secret_key, user_key=access_key, **kwargs)
 
 
 class KeyApi(Api):
@@ -51,81 +50,30 @@ class KeyApi(Api):
         self._secret_key = secret_key
 
         if self._logging:
-            logging.info(
-                "Onshape instance created: access key = {}".format(self._access_key)
-            )
+            logger.info("Onshape instance created: access key = %s", self._access_key)
 
     @override
-    def _request(
+    def _send(
         self,
         method: http.HTTPMethod,
-        path: str,
-        query: dict | str = "",
-        body: dict | str = "",
-        headers: dict[str, str] = {},
-    ):
-        query_str = query if isinstance(query, str) else parse.urlencode(query)
-
-        body_str = body if isinstance(body, str) else json.dumps(body)
-
-        url = self._base_url + path + "?" + query_str
-
+        url: str,
+        body: str,
+        headers: dict[str, str],
+    ) -> requests.Response:
+        # Headers are re-signed on every attempt so retries get a fresh Date and On-Nonce
         headers = make_headers(method, headers, url, self._access_key, self._secret_key)
 
         if self._logging:
-            logging.info("request url: " + url)
-            logging.info("request headers: " + str(headers))
-            if len(body) > 0:
-                logging.info(body)
+            log_request(method, url, headers, body)
 
-        res = requests.request(
+        return self._session.request(
             method,
             url,
             headers=headers,
-            data=body_str,
+            data=body,
             allow_redirects=False,
             stream=True,
         )
-        status = http.HTTPStatus(res.status_code)
-
-        if status.is_success:
-            if self._logging:
-                if res.text == "":
-                    logging.info("request succeeded")
-                else:
-                    logging.info("request succeeded, details: " + res.text)
-        elif status is http.HTTPStatus.TEMPORARY_REDIRECT:
-            # The official Onshape app has redirect handling here, we skip because lazy
-            if self._logging:
-                logging.error("unhandled redirect, details: " + res.text)
-            raise exceptions.ApiError(res.text, status)
-
-            # location = parse.urlparse(res.headers["Location"])
-            # if self._logging:
-            #     logging.info("request redirected to: " + location.geturl())
-            # return self._request(
-            #     method, location.path, query=location.query, headers=headers
-            # )
-
-            # Official handling:
-            # location = urlparse(res.headers["Location"])
-            # querystring = parse_qs(location.query)
-            # if self._logging:
-            #     utils.log('request redirected to: ' + location.geturl())
-            # new_query = {}
-            # new_base_url = location.scheme + '://' + location.netloc
-            # for key in querystring:
-            #     new_query[key] = querystring[key][0]  # won't work for repeated query params
-            # return self.request(method, location.path, query=new_query, headers=headers, base_url=new_base_url)
-        else:
-            if self._logging:
-                logging.error("request failed, details: " + res.text)
-            raise exceptions.ApiError(res.text, status)
-
-        try:
-            return res.json()
-        except:
-            return res
 
 
 def make_headers(
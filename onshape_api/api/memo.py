@@ -0,0 +1,81 @@
+"""Memoizes GET responses for a short-lived unit of work, such as a single backend request.
+
+Unlike a ResponseCache, a RequestMemo holds every GET response, not just those which are safe to share between requests.
+Correctness comes from invalidation instead: a write to a document discards every memoized response of that document.
+"""
+
+import json
+import re
+import threading
+from typing import Any
+
+__all__ = ["RequestMemo", "get_document_key"]
+
+DOCUMENT_PATTERN = re.compile(r"^/?[^/]+/(?:d/)?([^/?]+)")
+"""Matches the document id of paths such as /documents/d/<id>/..., /documents/<id>, or /partstudios/d/<id>/...."""
+
+CROSS_DOCUMENT_ROUTES = ("externalreferences",)
+"""Routes whose responses describe other documents, so are invalidated by a write to any document."""
+
+GLOBAL_KEY = ""
+
+
+def get_document_key(path: str) -> str:
+    """Returns the key of the document a path belongs to, or GLOBAL_KEY if the path describes other documents."""
+    if any(route in path for route in CROSS_DOCUMENT_ROUTES):
+        return GLOBAL_KEY
+    match = DOCUMENT_PATTERN.match(path)
+    return match.group(1) if match else GLOBAL_KEY
+
+
+class RequestMemo:
+    """Deduplicates identical GETs, discarding responses of a document when it's written to.
+
+    Responses are stored as json, so callers may freely modify the values they're given.
+    Safe to share between threads.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[str, dict[str, str]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, path: str) -> tuple[bool, Any]:
+        with self._lock:
+            data = self._values.get(get_document_key(path), {}).get(key)
+        if data is None:
+            return (False, None)
+        return (True, json.loads(data))
+
+    def generation(self) -> int:
+        """Returns a token which changes whenever anything is invalidated.
+
+        Taken before a GET is sent and passed to set, so a response which raced with a write isn't memoized.
+        """
+        with self._lock:
+            return self._generation
+
+    def set(self, key: str, path: str, value: Any, generation: int) -> None:
+        try:
+            data = json.dumps(value)
+        except TypeError:
+            return
+        with self._lock:
+            if self._generation != generation:
+                return
+            self._values.setdefault(get_document_key(path), {})[key] = data
+
+    def invalidate(self, path: str) -> None:
+        """Discards every response of the document written to by a request to path.
+
+        Responses describing several documents are always discarded. A write to a path without a document discards
+        everything.
+        """
+        document_key = get_document_key(path)
+        with self._lock:
+            keys = list(self._values) if document_key == GLOBAL_KEY else [document_key]
+            if GLOBAL_KEY not in keys:
+                keys.append(GLOBAL_KEY)
+            for key in keys:
+                self._values.pop(key, None)
+            self._generation += 1
@@ -1,69 +1,70 @@
 from __future__ import annotations
 from typing import Unpack, override
 import http
-import json
-import logging
-from urllib import parse
 
+import requests
 from requests_oauthlib import OAuth2Session
 
-from onshape_api import exceptions
 from onshape_api.utils import env_utils
 from onshape_api.api.api_base import Api, ApiArgs, get_api_base_args
+from onshape_api.api.request_log import log_request
+from onshape_api.api.hooks import RequestHook
+from onshape_api.api.memo import RequestMemo
 
 
-def make_oauth_api(oauth: OAuth2Session, load_dotenv: bool = False) -> OAuthApi:
+def make_oauth_api(
+    oauth: OAuth2Session,
+    load_dotenv: bool = False,
+    user_key: str | None = None,
+    hooks: list[RequestHook] | None = None,
+    memo: RequestMemo | None = None,
+) -> OAuthApi:
+    """
+    Args:
+        user_key: A key identifying the OAuth user. Apis with the same user_key share a rate limit.
+        hooks: Functions called after each request to Onshape.
+        memo: Memoizes GET responses until a write to the same document.
+    """
     if load_dotenv:
         env_utils.load_env()
     kwargs = get_api_base_args()
+    kwargs["user_key"] = user_key
+    kwargs["hooks"] = hooks
+    kwargs["memo"] = memo
     return OAuthApi(oauth, **kwargs)
 
 
 class OAuthApi(Api):
-    """Provides access to the Onshape API via OAuth."""
+    """Provides access to the Onshape API via OAuth.
+
+    The connection pool is mounted directly onto the passed OAuth2Session.
+    """
 
     def __init__(self, oauth: OAuth2Session, **kwargs: Unpack[ApiArgs]):
-        super().__init__(**kwargs)
         self.oauth = oauth
+        super().__init__(**kwargs)
+
+    @override
+    def _make_session(self) -> OAuth2Session:
+        return self.oauth
 
     @override
-    def _request(
+    def _send(
         self,
         method: http.HTTPMethod,
-        path: str,
-        query: dict | str = {},
-        body: dict | str = {},
-        headers: dict[str, str] = {},
-    ):
-        query_str = query if isinstance(query, str) else parse.urlencode(query)
-        body_str = body if isinstance(body, str) else json.dumps(body)
-
-        url = self._base_url + path + "?" + query_str
-
+        url: str,
+        body: str,
+        headers: dict[str, str],
+    ) -> requests.Response:
         if self._logging:
-            if len(body) > 0:
-                logging.info(body)
-            logging.info("request url: " + url)
+            log_request(method, url, headers, body)
 
         req_headers = headers.copy()
         req_headers["Content-Type"] = headers.get("Content-Type", "application/json")
 
-        res = self.oauth.request(
+        return self.oauth.request(
             method,
             url,
             headers=req_headers,
-            data=body_str,
+            data=body,
         )
-        status = http.HTTPStatus(res.status_code)
-        if status.is_success:
-            if self._logging:
-                logging.info("request succeeded, details: " + res.text)
-        else:
-            if self._logging:
-                logging.error("request failed, details: " + res.text)
-            raise exceptions.ApiError(res.text, status)
-
-        try:
-            return res.json()
-        except:
-            return res
@@ -0,0 +1,159 @@
+"""Client-side rate limiting for requests made to Onshape."""
+
+from __future__ import annotations
+import asyncio
+import contextlib
+import threading
+import time
+from typing import AsyncIterator, Iterator
+import weakref
+
+__all__ = ["TokenBucket", "RateLimiter", "get_shared_rate_limiter", "make_rate_limiter"]
+
+ASYNC_POLL_INTERVAL = 0.01
+"""The number of seconds to wait between attempts to acquire a request slot from an event loop."""
+
+
+class TokenBucket:
+    """A thread safe token bucket.
+
+    Tokens are added continuously at rate tokens per second, up to a max of burst tokens.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token from the bucket.
+
+        Returns the number of seconds the caller must wait before the token is valid.
+        Tokens may be reserved ahead of time, so concurrent callers are spaced out rather than woken at once.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Limits the rate and concurrency of requests.
+
+    A single RateLimiter may be shared by any number of threads and Api instances.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int | None = None,
+        max_in_flight: int | None = None,
+    ) -> None:
+        """
+        Args:
+            rate: The max number of requests per second. If None, the rate isn't limited.
+            burst: The number of requests which may be made at once before rate applies. Defaults to rate.
+            max_in_flight: The max number of concurrent requests. If None, concurrency isn't limited.
+        """
+        self._bucket = (
+            TokenBucket(rate, burst if burst is not None else int(rate))
+            if rate
+            else None
+        )
+        self._semaphore = (
+            threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        )
+
+    def wait(self) -> None:
+        """Blocks until the rate limit allows another request."""
+        if self._bucket is not None:
+            delay = self._bucket.reserve()
+            if delay > 0:
+                time.sleep(delay)
+
+    @contextlib.contextmanager
+    def limit(self) -> Iterator[None]:
+        """A context manager which holds a request slot for its duration."""
+        if self._semaphore is None:
+            self.wait()
+            yield
+            return
+
+        with self._semaphore:
+            self.wait()
+            yield
+
+    async def wait_async(self) -> None:
+        """Waits without blocking the event loop until the rate limit allows another request."""
+        if self._bucket is not None:
+            delay = self._bucket.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    @contextlib.asynccontextmanager
+    async def limit_async(self) -> AsyncIterator[None]:
+        """An async variant of limit.
+
+        The same limits are shared with threads using limit.
+        """
+        if self._semaphore is None:
+            await self.wait_async()
+            yield
+            return
+
+        # Poll rather than block since the semaphore may also be held by other threads
+        while not self._semaphore.acquire(blocking=False):
+            await asyncio.sleep(ASYNC_POLL_INTERVAL)
+        try:
+            await self.wait_async()
+            yield
+        finally:
+            self._semaphore.release()
+
+
+# Limiters are dropped once no Api is using them
+_shared_limiters: weakref.WeakValueDictionary[str, RateLimiter] = (
+    weakref.WeakValueDictionary()
+)
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(
+    key: str,
+    rate: float | None = None,
+    burst: int | None = None,
+    max_in_flight: int | None = None,
+) -> RateLimiter:
+    """Returns the process wide RateLimiter for key, creating it if it doesn't exist.
+
+    Api instances acting on behalf of the same user should use the same key so they share a single limit.
+    The limits passed when the limiter is first created are used.
+    """
+    with _shared_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(rate, burst, max_in_flight)
+            _shared_limiters[key] = limiter
+        return limiter
+
+
+def make_rate_limiter(
+    user_key: str | None,
+    rate: float | None = None,
+    burst: int | None = None,
+    max_in_flight: int | None = None,
+) -> RateLimiter:
+    """Returns the shared RateLimiter for user_key, or a new RateLimiter if user_key is None."""
+    if user_key is not None:
+        return get_shared_rate_limiter(user_key, rate, burst, max_in_flight)
+    return RateLimiter(rate, burst, max_in_flight)
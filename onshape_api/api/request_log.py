@@ -0,0 +1,75 @@
+"""Logs requests sent to Onshape without slowing them down.
+
+Messages use lazy %-formatting, and anything expensive to build is guarded by a level check,
+so disabled levels cost almost nothing.
+Request and response bodies are only logged at DEBUG level (errors excepted) and are truncated to API_LOG_BODY_BYTES.
+Successful response bodies may be sampled using API_LOG_SAMPLE_RATE.
+The Authorization header is always redacted.
+"""
+
+import logging
+import os
+import random
+from typing import Any
+
+__all__ = ["logger", "redact_headers", "preview_body"]
+
+logger = logging.getLogger("onshape_api")
+if level := os.getenv("API_LOG_LEVEL"):
+    logger.setLevel(level.upper())
+
+BODY_BYTES = int(os.getenv("API_LOG_BODY_BYTES", 1000))
+"""The max number of bytes of each body to log."""
+
+SAMPLE_RATE = float(os.getenv("API_LOG_SAMPLE_RATE", 1))
+"""The fraction of successful response bodies to log."""
+
+REDACTED_HEADERS = frozenset(["authorization", "proxy-authorization", "cookie"])
+
+
+def redact_headers(headers: dict[str, str]) -> dict[str, str]:
+    """Returns a copy of headers with credentials removed.
+
+    The auth scheme is kept, e.g. "On <redacted>", since it's useful when debugging.
+    """
+    redacted = {}
+    for name, value in headers.items():
+        if name.lower() in REDACTED_HEADERS:
+            scheme, _, _ = value.partition(" ")
+            value = scheme + " <redacted>" if scheme != value else "<redacted>"
+        redacted[name] = value
+    return redacted
+
+
+def preview_body(body: str | bytes, limit: int = BODY_BYTES) -> str:
+    """Returns at most limit bytes of body, decoding only the part which is kept."""
+    head = body[:limit]
+    text = head if isinstance(head, str) else head.decode(errors="replace")
+    if len(body) > limit:
+        text += "... ({} bytes)".format(len(body))
+    return text
+
+
+def log_request(method: str, url: str, headers: dict[str, str], body: str) -> None:
+    """Logs a request which is about to be sent."""
+    logger.info("%s %s", method, url)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("request headers: %s", redact_headers(headers))
+        if body:
+            logger.debug("request body: %s", preview_body(body))
+
+
+def log_response(res: Any) -> None:
+    """Logs a requests or httpx response.
+
+    The body of a successful response is only read when DEBUG is enabled and the response is sampled.
+    """
+    status = res.status_code
+    if 200 <= status < 300:
+        logger.info("%s %s", status, res.url)
+        if logger.isEnabledFor(logging.DEBUG) and random.random() < SAMPLE_RATE:
+            logger.debug("response body: %s", preview_body(res.content))
+    elif logger.isEnabledFor(logging.ERROR):
+        logger.error(
+            "%s %s failed, details: %s", status, res.url, preview_body(res.content)
+        )
@@ -0,0 +1,118 @@
+"""Defines the policy used by Api to retry throttled and failed requests."""
+
+import dataclasses
+from datetime import datetime, timezone
+from email import utils
+import http
+import random
+
+__all__ = ["RetryPolicy"]
+
+IDEMPOTENT_METHODS = frozenset(
+    [
+        http.HTTPMethod.GET,
+        http.HTTPMethod.HEAD,
+        http.HTTPMethod.OPTIONS,
+    ]
+)
+"""Methods which are always safe to retry."""
+
+
+@dataclasses.dataclass
+class RetryPolicy:
+    """Describes when and how long to wait before retrying a request.
+
+    Throttled requests (429 Too Many Requests) were never processed by Onshape, so they are retried regardless of method.
+    Server errors and connection errors are only retried when the request is idempotent.
+    By default only GET requests are idempotent; other requests may be marked idempotent explicitly.
+
+    Attributes:
+        max_retries: The max number of retries to make after the initial attempt.
+        backoff_factor: The base delay in seconds. The nth retry waits up to backoff_factor * 2^n seconds.
+        max_backoff: The max delay in seconds.
+            Responses with a Retry-After larger than this are not retried.
+        retry_statuses: Statuses which are retried when the request is idempotent.
+    """
+
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30
+    retry_statuses: frozenset[http.HTTPStatus] = frozenset(
+        [
+            http.HTTPStatus.INTERNAL_SERVER_ERROR,
+            http.HTTPStatus.BAD_GATEWAY,
+            http.HTTPStatus.SERVICE_UNAVAILABLE,
+            http.HTTPStatus.GATEWAY_TIMEOUT,
+        ]
+    )
+
+    def is_idempotent(
+        self, method: http.HTTPMethod, idempotent: bool | None = None
+    ) -> bool:
+        """Returns True if a request may be safely repeated.
+
+        Args:
+            idempotent: An explicit override. If None, the method is used to decide.
+        """
+        if idempotent is not None:
+            return idempotent
+        return method in IDEMPOTENT_METHODS
+
+    def should_retry_status(
+        self,
+        method: http.HTTPMethod,
+        status: http.HTTPStatus,
+        attempt: int,
+        idempotent: bool | None = None,
+    ) -> bool:
+        """Returns True if a request which received status should be retried.
+
+        Args:
+            attempt: The number of retries which have already been made.
+        """
+        if attempt >= self.max_retries:
+            return False
+        if status == http.HTTPStatus.TOO_MANY_REQUESTS:
+            return True
+        return status in self.retry_statuses and self.is_idempotent(method, idempotent)
+
+    def should_retry_error(
+        self, method: http.HTTPMethod, attempt: int, idempotent: bool | None = None
+    ) -> bool:
+        """Returns True if a request which failed to connect should be retried."""
+        return attempt < self.max_retries and self.is_idempotent(method, idempotent)
+
+    def get_delay(self, attempt: int, retry_after: str | None = None) -> float | None:
+        """Returns the number of seconds to wait before the next retry, or None if the request shouldn't be retried.
+
+        Uses the Retry-After header if it exists, and jittered exponential backoff otherwise.
+
+        Args:
+            attempt: The number of retries which have already been made.
+            retry_after: The value of the Retry-After header of the response, if any.
+        """
+        if retry_after is not None:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return delay if delay <= self.max_backoff else None
+        backoff = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        # Full jitter prevents concurrent threads from retrying in lockstep
+        return random.uniform(0, backoff)
+
+
+def parse_retry_after(retry_after: str) -> float | None:
+    """Parses the value of a Retry-After header into a number of seconds.
+
+    Retry-After may either be a number of seconds or an HTTP date.
+    Returns None if the value couldn't be parsed.
+    """
+    retry_after = retry_after.strip()
+    if retry_after.isdigit():
+        return float(retry_after)
+    try:
+        date = utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,105 @@
+"""Coalesces concurrent identical requests into a single call to Onshape."""
+
+from __future__ import annotations
+import asyncio
+import copy
+import threading
+from typing import Any, Awaitable, Callable
+
+__all__ = ["SingleFlight", "AsyncSingleFlight"]
+
+
+def copy_result(value: Any) -> Any:
+    """Copies parsed json so callers sharing a result may mutate it freely."""
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """A thread safe group of in flight calls.
+
+    While a call for a key is in flight, other threads calling do with the same key wait for it to finish
+    and receive a copy of its result (or its exception) instead of making a call of their own.
+
+    The shared result is never handed out, so a caller mutating its result can't race with the others' copies.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.followers += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy_result(call.value)
+
+        try:
+            call.value = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                followers = call.followers
+            # Copy before releasing the followers, since the leader's caller may mutate its result
+            value = copy_result(call.value) if followers else call.value
+            call.done.set()
+        return value
+
+
+class _AsyncCall:
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.followers = 0
+
+
+class AsyncSingleFlight:
+    """An asyncio variant of SingleFlight.
+
+    Calls run as tasks, so a caller which is cancelled doesn't cancel the call for the other callers waiting on it.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, _AsyncCall] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        leader = call is None
+        if call is None:
+            call = _AsyncCall(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._forget(key, task))
+        else:
+            call.followers += 1
+
+        value = await asyncio.shield(call.task)
+        # The task's result is shared by every caller, so it's only handed out as is when the leader was alone.
+        # No one can join once the task is done, so the count is final by the time the leader resumes.
+        return value if leader and call.followers == 0 else copy_result(value)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        self._calls.pop(key, None)
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
@@ -1,4 +1,5 @@
-from typing import Iterable
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
 from urllib import parse
 
 from onshape_api.api.api_base import Api
@@ -6,6 +7,9 @@ from onshape_api.assertions import assert_workspace
 from onshape_api.paths.api_path import api_path
 from onshape_api.paths.paths import ElementPath, InstancePath, PartPath
 
+if TYPE_CHECKING:
+    from onshape_api.api.async_api_base import AsyncApi
+
 
 def get_assembly(
     api: Api,
@@ -17,16 +21,54 @@ def get_assembly(
 ) -> dict:
     """Retrieves information about an assembly."""
     return api.get(
-        api_path("assemblies", assembly_path, ElementPath),
-        query={
-            "includeMateFeatures": include_mate_features,
-            "includeNonSolids": include_non_solids,
-            "excludeSuppressed": exclude_suppressed,
-            "includeMateConnectors": include_mate_connectors,
-        },
+        _assembly_path(assembly_path),
+        query=_get_assembly_query(
+            include_non_solids,
+            include_mate_features,
+            include_mate_connectors,
+            exclude_suppressed,
+        ),
+    )
+
+
+async def get_assembly_async(
+    api: AsyncApi,
+    assembly_path: ElementPath,
+    include_non_solids: bool = False,
+    include_mate_features: bool = False,
+    include_mate_connectors: bool = False,
+    exclude_suppressed: bool = True,
+) -> dict:
+    """Async version of get_assembly."""
+    return await api.get(
+        _assembly_path(assembly_path),
+        query=_get_assembly_query(
+            include_non_solids,
+            include_mate_features,
+            include_mate_connectors,
+            exclude_suppressed,
+        ),
     )
 
 
+def _assembly_path(assembly_path: ElementPath) -> str:
+    return api_path("assemblies", assembly_path, ElementPath)
+
+
+def _get_assembly_query(
+    include_non_solids: bool,
+    include_mate_features: bool,
+    include_mate_connectors: bool,
+    exclude_suppressed: bool,
+) -> dict:
+    return {
+        "includeMateFeatures": include_mate_features,
+        "includeNonSolids": include_non_solids,
+        "excludeSuppressed": exclude_suppressed,
+        "includeMateConnectors": include_mate_connectors,
+    }
+
+
 def get_assembly_features(
     api: Api,
     assembly_path: ElementPath,
@@ -37,21 +79,50 @@ def get_assembly_features(
     Args:
         feature_ids: Feature ids to retrieve. If omitted, all features are returned.
     """
-    query = parse.urlencode({"featureId": feature_ids}, doseq=True)
-    return api.get(
-        api_path("assemblies", assembly_path, ElementPath, "features"), query=query
+    return api.get(_features_path(assembly_path), query=_features_query(feature_ids))
+
+
+async def get_assembly_features_async(
+    api: AsyncApi,
+    assembly_path: ElementPath,
+    feature_ids: Iterable[str] = [],
+) -> dict:
+    """Async version of get_assembly_features."""
+    return await api.get(
+        _features_path(assembly_path), query=_features_query(feature_ids)
+    )
+
+
+def _features_path(assembly_path: ElementPath, feature_id: str | None = None) -> str:
+    return api_path(
+        "assemblies", assembly_path, ElementPath, "features", feature_id=feature_id
     )
 
 
+def _features_query(feature_ids: Iterable[str]) -> str:
+    return parse.urlencode({"featureId": feature_ids}, doseq=True)
+
+
 def create_assembly(api: Api, workspace_path: InstancePath, assembly_name: str) -> dict:
     """Constructs an assembly with the given name."""
     assert_workspace(workspace_path)
-    return api.post(
-        api_path("assemblies", workspace_path, InstancePath),
-        body={"name": assembly_name},
+    return api.post(_create_assembly_path(workspace_path), body={"name": assembly_name})
+
+
+async def create_assembly_async(
+    api: AsyncApi, workspace_path: InstancePath, assembly_name: str
+) -> dict:
+    """Async version of create_assembly."""
+    assert_workspace(workspace_path)
+    return await api.post(
+        _create_assembly_path(workspace_path), body={"name": assembly_name}
     )
 
 
+def _create_assembly_path(workspace_path: InstancePath) -> str:
+    return api_path("assemblies", workspace_path, InstancePath)
+
+
 def add_parts(
     api: Api,
     assembly_path: ElementPath,
@@ -65,6 +136,33 @@ def add_parts(
     This endpoint has no response since Onshape doesn't give one.
     """
     assert_workspace(assembly_path)
+    api.post(
+        _instances_path(assembly_path),
+        body=_add_parts_body(part_studio_path, part_id),
+    )
+
+
+async def add_parts_async(
+    api: AsyncApi,
+    assembly_path: ElementPath,
+    part_studio_path: ElementPath | PartPath,
+    part_id: str | None = None,
+) -> None:
+    """Async version of add_parts."""
+    assert_workspace(assembly_path)
+    await api.post(
+        _instances_path(assembly_path),
+        body=_add_parts_body(part_studio_path, part_id),
+    )
+
+
+def _instances_path(assembly_path: ElementPath) -> str:
+    return api_path("assemblies", assembly_path, ElementPath, "instances")
+
+
+def _add_parts_body(
+    part_studio_path: ElementPath | PartPath, part_id: str | None
+) -> dict:
     body = {
         "includePartTypes": ["PARTS"],
         "isWholePartStudio": part_id is None,
@@ -74,8 +172,7 @@ def add_parts(
         body.update(PartPath.to_api_object(part_studio_path))
     else:
         body.update(ElementPath.to_api_object(part_studio_path))
-
-    api.post(api_path("assemblies", assembly_path, ElementPath, "instances"), body=body)
+    return body
 
 
 def add_part_to_assembly(
@@ -86,6 +183,15 @@ def add_part_to_assembly(
     add_parts(api, assembly_path, part_path, part_path.part_id)
 
 
+async def add_part_to_assembly_async(
+    api: AsyncApi,
+    assembly_path: ElementPath,
+    part_path: PartPath,
+) -> None:
+    """Async version of add_part_to_assembly."""
+    await add_parts_async(api, assembly_path, part_path, part_path.part_id)
+
+
 def transform_instance(
     api: Api,
     assembly_path: ElementPath,
@@ -99,15 +205,40 @@ def transform_instance(
     """
     assert_workspace(assembly_path)
     return api.post(
-        api_path("assemblies", assembly_path, ElementPath, "occurrencetransforms"),
-        body={
-            "isRelative": is_relative,
-            "occurrences": [{"path": [instance_id]}],
-            "transform": transform,
-        },
+        _transforms_path(assembly_path),
+        body=_transform_body(instance_id, transform, is_relative),
+    )
+
+
+async def transform_instance_async(
+    api: AsyncApi,
+    assembly_path: ElementPath,
+    instance_id: str,
+    transform: list[int | float],
+    is_relative: bool = False,
+):
+    """Async version of transform_instance."""
+    assert_workspace(assembly_path)
+    return await api.post(
+        _transforms_path(assembly_path),
+        body=_transform_body(instance_id, transform, is_relative),
     )
 
 
+def _transforms_path(assembly_path: ElementPath) -> str:
+    return api_path("assemblies", assembly_path, ElementPath, "occurrencetransforms")
+
+
+def _transform_body(
+    instance_id: str, transform: list[int | float], is_relative: bool
+) -> dict:
+    return {
+        "isRelative": is_relative,
+        "occurrences": [{"path": [instance_id]}],
+        "transform": transform,
+    }
+
+
 def add_feature(
     api: Api,
     assembly_path: ElementPath,
@@ -120,26 +251,32 @@ def add_feature(
     """
     assert_workspace(assembly_path)
     return api.post(
-        api_path(
-            "assemblies",
-            assembly_path,
-            ElementPath,
-            "features",
-            feature_id=feature_id,
-        ),
-        body={"feature": feature},
+        _features_path(assembly_path, feature_id), body={"feature": feature}
+    )
+
+
+async def add_feature_async(
+    api: AsyncApi,
+    assembly_path: ElementPath,
+    feature: dict,
+    feature_id: str | None = None,
+) -> dict:
+    """Async version of add_feature."""
+    assert_workspace(assembly_path)
+    return await api.post(
+        _features_path(assembly_path, feature_id), body={"feature": feature}
     )
 
 
 def delete_feature(api: Api, assembly_path: ElementPath, feature_id: str) -> dict:
     """Deletes a feature from an assembly."""
     assert_workspace(assembly_path)
-    return api.delete(
-        api_path(
-            "assemblies",
-            assembly_path,
-            ElementPath,
-            "features",
-            feature_id=feature_id,
-        )
-    )
+    return api.delete(_features_path(assembly_path, feature_id))
+
+
+async def delete_feature_async(
+    api: AsyncApi, assembly_path: ElementPath, feature_id: str
+) -> dict:
+    """Async version of delete_feature."""
+    assert_workspace(assembly_path)
+    return await api.delete(_features_path(assembly_path, feature_id))
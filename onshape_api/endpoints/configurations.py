@@ -1,13 +1,26 @@
 from __future__ import annotations
+from typing import TYPE_CHECKING
 from dataclasses import dataclass
 
 from onshape_api.api.api_base import Api
 from onshape_api.paths.api_path import api_path
 from onshape_api.paths.paths import ElementPath
 
+if TYPE_CHECKING:
+    from onshape_api.api.async_api_base import AsyncApi
+
 
 def get_configuration(api: Api, element_path: ElementPath):
-    return api.get(api_path("elements", element_path, ElementPath, "configuration"))
+    return api.get(_configuration_path(element_path))
+
+
+async def get_configuration_async(api: AsyncApi, element_path: ElementPath):
+    """Async version of get_configuration."""
+    return await api.get(_configuration_path(element_path))
+
+
+def _configuration_path(element_path: ElementPath) -> str:
+    return api_path("elements", element_path, ElementPath, "configuration")
 
 
 def set_configuration(
@@ -16,28 +29,58 @@ def set_configuration(
     parameters: list[dict] | None,
     current_configuration: list[dict] | None,
 ):
-    body = {
+    return api.post(
+        _configuration_path(element_path),
+        body=_set_configuration_body(parameters, current_configuration),
+        idempotent=True,
+    )
+
+
+async def set_configuration_async(
+    api: AsyncApi,
+    element_path: ElementPath,
+    parameters: list[dict] | None,
+    current_configuration: list[dict] | None,
+):
+    """Async version of set_configuration."""
+    return await api.post(
+        _configuration_path(element_path),
+        body=_set_configuration_body(parameters, current_configuration),
+        idempotent=True,
+    )
+
+
+def _set_configuration_body(
+    parameters: list[dict] | None, current_configuration: list[dict] | None
+) -> dict:
+    return {
         "btType": "BTConfigurationResponse-2019",
         "configurationParameters": parameters,
         "currentConfiguration": current_configuration,
     }
-    return api.post(
-        api_path("elements", element_path, ElementPath, "configuration"), body=body
-    )
 
 
 def decode_configuration(
     api: Api, element_path: ElementPath, config_string: str
 ) -> dict:
     """Converts a configuration string into JSON."""
-    return api.get(
-        api_path(
-            "elements",
-            element_path,
-            ElementPath,
-            "configurationencodings",
-            end_id=config_string,
-        )
+    return api.get(_decode_configuration_path(element_path, config_string))
+
+
+async def decode_configuration_async(
+    api: AsyncApi, element_path: ElementPath, config_string: str
+) -> dict:
+    """Async version of decode_configuration."""
+    return await api.get(_decode_configuration_path(element_path, config_string))
+
+
+def _decode_configuration_path(element_path: ElementPath, config_string: str) -> str:
+    return api_path(
+        "elements",
+        element_path,
+        ElementPath,
+        "configurationencodings",
+        end_id=config_string,
     )
 
 
@@ -45,13 +88,30 @@ def encode_configuration(
     api: Api, element_path: ElementPath, configuration: list[dict]
 ) -> dict:
     """Converts a configuration JSON into a string."""
-    body = {"parameters": configuration}
     return api.post(
-        f"/elements/d/{element_path.document_id}/e/{element_path.element_id}/configurationencodings",
-        body=body,
+        _encode_configuration_path(element_path),
+        body={"parameters": configuration},
+        idempotent=True,
+        invalidates=False,
     )
 
 
+async def encode_configuration_async(
+    api: AsyncApi, element_path: ElementPath, configuration: list[dict]
+) -> dict:
+    """Async version of encode_configuration."""
+    return await api.post(
+        _encode_configuration_path(element_path),
+        body={"parameters": configuration},
+        idempotent=True,
+        invalidates=False,
+    )
+
+
+def _encode_configuration_path(element_path: ElementPath) -> str:
+    return f"/elements/d/{element_path.document_id}/e/{element_path.element_id}/configurationencodings"
+
+
 @dataclass
 class ConfigurationParameterEnum:
     parameter_name: str
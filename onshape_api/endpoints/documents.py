@@ -1,12 +1,13 @@
+from __future__ import annotations
 import enum
-from typing import Iterable, override
+from typing import TYPE_CHECKING, Iterable, override
 from unittest import skip
 
 from onshape_api.assertions import (
     assert_instance_type,
     assert_workspace,
 )
-from onshape_api.endpoints.versions import get_latest_version
+from onshape_api.endpoints.versions import get_latest_version, get_latest_version_async
 from onshape_api.api.api_base import Api
 from onshape_api.paths.api_path import api_path
 from onshape_api.paths.instance_type import (
@@ -20,63 +21,151 @@ from onshape_api.paths.paths import (
 from onshape_api.paths.instance_type import get_instance_type_key
 from onshape_api.utils.str_utils import to_json
 
+if TYPE_CHECKING:
+    from onshape_api.api.async_api_base import AsyncApi
+
 
 def get_document(api: Api, document_path: DocumentPath) -> dict:
     """Retrieves a given document's metadata."""
-    return api.get(
-        api_path("documents", document_path, DocumentPath, skip_document_d=True)
-    )
+    return api.get(_document_path(document_path))
+
+
+async def get_document_async(api: AsyncApi, document_path: DocumentPath) -> dict:
+    """Async version of get_document."""
+    return await api.get(_document_path(document_path))
+
+
+def _document_path(document_path: DocumentPath) -> str:
+    return api_path("documents", document_path, DocumentPath, skip_document_d=True)
+
+
+def get_workspaces(
+    api: Api, document_path: DocumentPath, cache_ttl: float | None = None
+) -> list[dict]:
+    """Retrieves the workspaces of a given document.
+
+    Args:
+        cache_ttl: The number of seconds the workspaces may be cached for.
+    """
+    return api.get(_workspaces_path(document_path), cache_ttl=cache_ttl)
+
+
+async def get_workspaces_async(
+    api: AsyncApi, document_path: DocumentPath, cache_ttl: float | None = None
+) -> list[dict]:
+    """Async version of get_workspaces."""
+    return await api.get(_workspaces_path(document_path), cache_ttl=cache_ttl)
+
+
+def _workspaces_path(document_path: DocumentPath) -> str:
+    return api_path("documents", document_path, DocumentPath, "workspaces")
 
 
 def create_new_workspace(
     api: Api, document_path: DocumentPath, name: str, description: str | None = None
 ) -> dict:
     """Creates a new workspace in a given document."""
-    body = {"name": name}
-    if description != None:
-        body["description"] = description
     return api.post(
-        api_path("documents", document_path, DocumentPath, "workspaces"), body=body
+        _workspaces_path(document_path),
+        body=_workspace_body({"name": name}, description),
+    )
+
+
+async def create_new_workspace_async(
+    api: AsyncApi,
+    document_path: DocumentPath,
+    name: str,
+    description: str | None = None,
+) -> dict:
+    """Async version of create_new_workspace."""
+    return await api.post(
+        _workspaces_path(document_path),
+        body=_workspace_body({"name": name}, description),
     )
 
 
+def _workspace_body(body: dict, description: str | None) -> dict:
+    if description != None:
+        body["description"] = description
+    return body
+
+
 def copy_workspace(
     api: Api, instance_path: InstancePath, new_name: str, is_public: bool = False
 ) -> dict:
     assert_workspace(instance_path)
-    path = f"/documents/{instance_path.document_id}/workspaces/{instance_path.instance_id}/copy"
     body = {"isPublic": is_public, "newName": new_name}
-    return api.post(path, body)
+    return api.post(_copy_workspace_path(instance_path), body)
+
+
+async def copy_workspace_async(
+    api: AsyncApi, instance_path: InstancePath, new_name: str, is_public: bool = False
+) -> dict:
+    """Async version of copy_workspace."""
+    assert_workspace(instance_path)
+    body = {"isPublic": is_public, "newName": new_name}
+    return await api.post(_copy_workspace_path(instance_path), body)
+
+
+def _copy_workspace_path(instance_path: InstancePath) -> str:
+    return f"/documents/{instance_path.document_id}/workspaces/{instance_path.instance_id}/copy"
 
 
 def create_new_workspace_from_instance(
     api: Api, path: InstancePath, name: str, description: str | None = None
 ) -> dict:
     """Creates a new workspace in a given document."""
+    return api.post(
+        _workspaces_path(path), body=_instance_workspace_body(path, name, description)
+    )
+
+
+async def create_new_workspace_from_instance_async(
+    api: AsyncApi, path: InstancePath, name: str, description: str | None = None
+) -> dict:
+    """Async version of create_new_workspace_from_instance."""
+    return await api.post(
+        _workspaces_path(path), body=_instance_workspace_body(path, name, description)
+    )
+
+
+def _instance_workspace_body(
+    path: InstancePath, name: str, description: str | None
+) -> dict:
     key = get_instance_type_key(path.instance_type)
-    body = {"name": name, key: path.instance_id}
-    if description != None:
-        body["description"] = description
-    return api.post(api_path("documents", path, DocumentPath, "workspaces"), body=body)
+    return _workspace_body({"name": name, key: path.instance_id}, description)
 
 
 def delete_workspace(api: Api, workspace_path: InstancePath) -> dict:
     """Deletes a workspace."""
     assert_instance_type(workspace_path, InstanceType.WORKSPACE)
-    return api.delete(
-        api_path(
-            "documents",
-            workspace_path,
-            DocumentPath,
-            "workspaces",
-            workspace_path.instance_id,
-        )
+    return api.delete(_workspace_path(workspace_path))
+
+
+async def delete_workspace_async(api: AsyncApi, workspace_path: InstancePath) -> dict:
+    """Async version of delete_workspace."""
+    assert_instance_type(workspace_path, InstanceType.WORKSPACE)
+    return await api.delete(_workspace_path(workspace_path))
+
+
+def _workspace_path(workspace_path: InstancePath) -> str:
+    return api_path(
+        "documents",
+        workspace_path,
+        DocumentPath,
+        "workspaces",
+        workspace_path.instance_id,
     )
 
 
 def delete_document(api: Api, document_path: DocumentPath) -> dict:
     """Deletes an entire document."""
-    return api.delete(f"/documents/{document_path.document_id}")
+    return api.delete(_document_path(document_path))
+
+
+async def delete_document_async(api: AsyncApi, document_path: DocumentPath) -> dict:
+    """Async version of delete_document."""
+    return await api.delete(_document_path(document_path))
 
 
 class ElementType(enum.StrEnum):
@@ -99,23 +188,52 @@ def get_document_elements(
     Args:
         element_type: The type of element (tab) to get. If None, all elements are returned.
     """
+    return api.get(_elements_path(instance_path), query=_elements_query(element_type))
+
+
+async def get_document_elements_async(
+    api: AsyncApi,
+    instance_path: InstancePath,
+    element_type: ElementType | None = None,
+) -> list[dict]:
+    """Async version of get_document_elements."""
+    return await api.get(
+        _elements_path(instance_path), query=_elements_query(element_type)
+    )
+
+
+def _elements_path(instance_path: InstancePath) -> str:
+    return api_path("documents", instance_path, InstancePath, "elements")
+
+
+def _elements_query(element_type: ElementType | None) -> dict:
     query: dict = {"withThumbnails": False}
     if element_type != None:
         query["elementType"] = element_type
-
-    return api.get(
-        api_path("documents", instance_path, InstancePath, "elements"),
-        query=query,
-    )
+    return query
 
 
 def get_document_element(api: Api, element_path: ElementPath) -> dict | None:
     """Fetches an element in a document, or None if it doesn't exist."""
-    query = {"withThumbnails": False, "elementId": element_path.element_id}
-    response = api.get(
-        api_path("documents", element_path, InstancePath, "elements"),
-        query=query,
+    response = api.get(_elements_path(element_path), query=_element_query(element_path))
+    return _single_element(response)
+
+
+async def get_document_element_async(
+    api: AsyncApi, element_path: ElementPath
+) -> dict | None:
+    """Async version of get_document_element."""
+    response = await api.get(
+        _elements_path(element_path), query=_element_query(element_path)
     )
+    return _single_element(response)
+
+
+def _element_query(element_path: ElementPath) -> dict:
+    return {"withThumbnails": False, "elementId": element_path.element_id}
+
+
+def _single_element(response: list[dict]) -> dict | None:
     if len(response) == 1:
         return response[0]
     return None
@@ -128,9 +246,20 @@ def get_workspace_microversion_id(api: Api, instance_path: InstancePath) -> str:
     Individual elements also have their own microversion ids which are unrelated to the workspace's.
     """
     assert_instance_type(instance_path, InstanceType.WORKSPACE, InstanceType.VERSION)
-    return api.get(
-        api_path("documents", instance_path, InstancePath, "currentmicroversion")
-    )["microversion"]
+    return api.get(_microversion_path(instance_path))["microversion"]
+
+
+async def get_workspace_microversion_id_async(
+    api: AsyncApi, instance_path: InstancePath
+) -> str:
+    """Async version of get_workspace_microversion_id."""
+    assert_instance_type(instance_path, InstanceType.WORKSPACE, InstanceType.VERSION)
+    response = await api.get(_microversion_path(instance_path))
+    return response["microversion"]
+
+
+def _microversion_path(instance_path: InstancePath) -> str:
+    return api_path("documents", instance_path, InstancePath, "currentmicroversion")
 
 
 def get_external_references(
@@ -141,9 +270,19 @@ def get_external_references(
 
     Generally speaking, this returns a list of the external workspaces referenced by each tab in the instance.
     """
-    return api.get(
-        api_path("documents", instance_path, InstancePath, "externalreferences")
-    )
+    return api.get(_external_references_path(instance_path))
+
+
+async def get_external_references_async(
+    api: AsyncApi,
+    instance_path: InstancePath,
+) -> dict:
+    """Async version of get_external_references."""
+    return await api.get(_external_references_path(instance_path))
+
+
+def _external_references_path(instance_path: InstancePath) -> str:
+    return api_path("documents", instance_path, InstancePath, "externalreferences")
 
 
 class ReferenceUpdate:
@@ -192,6 +331,18 @@ def update_to_latest_version(
     )
 
 
+async def update_to_latest_version_async(
+    api: AsyncApi,
+    element_path: ElementPath,
+    old_reference_path: ElementPath,
+) -> None:
+    """Async version of update_to_latest_version."""
+    latest_version_id = (await get_latest_version_async(api, old_reference_path))["id"]
+    await update_references_async(
+        api, element_path, [VersionUpdate(old_reference_path, latest_version_id)]
+    )
+
+
 def update_references(
     api: Api, element_path: ElementPath, reference_updates: Iterable[ReferenceUpdate]
 ) -> None:
@@ -200,15 +351,37 @@ def update_references(
     Note this endpoint does not have any return information.
     """
     assert_workspace(element_path)
-    body = {
-        "referenceUpdates": [update.to_api_object() for update in reference_updates]
-    }
     api.post(
-        api_path("elements", element_path, ElementPath, "updatereferences"),
-        body=body,
+        _update_references_path(element_path),
+        body=_update_references_body(reference_updates),
+        idempotent=True,
     )
 
 
+async def update_references_async(
+    api: AsyncApi,
+    element_path: ElementPath,
+    reference_updates: Iterable[ReferenceUpdate],
+) -> None:
+    """Async version of update_references."""
+    assert_workspace(element_path)
+    await api.post(
+        _update_references_path(element_path),
+        body=_update_references_body(reference_updates),
+        idempotent=True,
+    )
+
+
+def _update_references_path(element_path: ElementPath) -> str:
+    return api_path("elements", element_path, ElementPath, "updatereferences")
+
+
+def _update_references_body(reference_updates: Iterable[ReferenceUpdate]) -> dict:
+    return {
+        "referenceUpdates": [update.to_api_object() for update in reference_updates]
+    }
+
+
 def move_elements(
     api: Api,
     source_path: InstancePath,
@@ -217,6 +390,36 @@ def move_elements(
     target_version_name: str,
 ) -> dict:
     """Moves one or more tabs from the source to the target."""
+    return api.post(
+        _move_elements_path(source_path),
+        _move_elements_body(source_path, element_ids, target_path, target_version_name),
+    )
+
+
+async def move_elements_async(
+    api: AsyncApi,
+    source_path: InstancePath,
+    element_ids: Iterable[str],
+    target_path: InstancePath | ElementPath,
+    target_version_name: str,
+) -> dict:
+    """Async version of move_elements."""
+    return await api.post(
+        _move_elements_path(source_path),
+        _move_elements_body(source_path, element_ids, target_path, target_version_name),
+    )
+
+
+def _move_elements_path(source_path: InstancePath) -> str:
+    return api_path("documents", source_path, InstancePath, "moveelement")
+
+
+def _move_elements_body(
+    source_path: InstancePath,
+    element_ids: Iterable[str],
+    target_path: InstancePath | ElementPath,
+    target_version_name: str,
+) -> dict:
     assert_workspace(source_path)
     assert_workspace(target_path)
     body = {
@@ -229,7 +432,4 @@ def move_elements(
     }
     if isinstance(target_path, ElementPath):
         body["anchorElementId"] = target_path.element_id
-
-    return api.post(
-        api_path("documents", source_path, InstancePath, "moveelement"), body
-    )
+    return body
@@ -1,4 +1,5 @@
-from typing import Any
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
 
 from onshape_api.api.api_base import Api
 from onshape_api.paths.api_path import api_path
@@ -6,6 +7,9 @@ from onshape_api.assertions import assert_instance_type, assert_workspace
 from onshape_api.paths.instance_type import InstanceType
 from onshape_api.paths.paths import InstancePath, ElementPath
 
+if TYPE_CHECKING:
+    from onshape_api.api.async_api_base import AsyncApi
+
 
 def pull_code(
     api: Api, feature_studio_path: ElementPath, raw_response: bool = False
@@ -15,16 +19,41 @@ def pull_code(
     Args:
         raw_response: True to get the entire response, False to get just the code.
     """
-    response = api.get(api_path("featurestudios", feature_studio_path, ElementPath))
+    response = api.get(_feature_studio_path(feature_studio_path))
+    return response if raw_response else response["contents"]
+
+
+async def pull_code_async(
+    api: AsyncApi, feature_studio_path: ElementPath, raw_response: bool = False
+) -> Any:
+    """Async version of pull_code."""
+    response = await api.get(_feature_studio_path(feature_studio_path))
     return response if raw_response else response["contents"]
 
 
+def _feature_studio_path(feature_studio_path: ElementPath) -> str:
+    return api_path("featurestudios", feature_studio_path, ElementPath)
+
+
 def push_code(api: Api, feature_studio_path: ElementPath, code: str) -> dict:
     """Sends code to the given feature studio specified by path."""
     assert_workspace(feature_studio_path)
     return api.post(
-        api_path("featurestudios", feature_studio_path, ElementPath),
+        _feature_studio_path(feature_studio_path),
+        body={"contents": code},
+        idempotent=True,
+    )
+
+
+async def push_code_async(
+    api: AsyncApi, feature_studio_path: ElementPath, code: str
+) -> dict:
+    """Async version of push_code."""
+    assert_workspace(feature_studio_path)
+    return await api.post(
+        _feature_studio_path(feature_studio_path),
         body={"contents": code},
+        idempotent=True,
     )
 
 
@@ -34,20 +63,52 @@ def create_feature_studio(
     """Creates a feature studio with the given name."""
     assert_instance_type(instance_path, InstanceType.WORKSPACE)
     return api.post(
-        api_path("featurestudios", instance_path, InstancePath),
-        body={"name": studio_name},
+        _create_feature_studio_path(instance_path), body={"name": studio_name}
     )
 
 
-def get_feature_specs(api: Api, feature_studio_path: ElementPath) -> dict:
-    return api.get(
-        api_path("featurestudios", feature_studio_path, ElementPath, "featurespecs")
+async def create_feature_studio_async(
+    api: AsyncApi, instance_path: InstancePath, studio_name: str
+) -> dict:
+    """Async version of create_feature_studio."""
+    assert_instance_type(instance_path, InstanceType.WORKSPACE)
+    return await api.post(
+        _create_feature_studio_path(instance_path), body={"name": studio_name}
     )
 
 
+def _create_feature_studio_path(instance_path: InstancePath) -> str:
+    return api_path("featurestudios", instance_path, InstancePath)
+
+
+def get_feature_specs(api: Api, feature_studio_path: ElementPath) -> dict:
+    return api.get(_feature_specs_path(feature_studio_path))
+
+
+async def get_feature_specs_async(
+    api: AsyncApi, feature_studio_path: ElementPath
+) -> dict:
+    """Async version of get_feature_specs."""
+    return await api.get(_feature_specs_path(feature_studio_path))
+
+
+def _feature_specs_path(feature_studio_path: ElementPath) -> str:
+    return api_path("featurestudios", feature_studio_path, ElementPath, "featurespecs")
+
+
 def get_feature_spec(api: Api, feature_studio_path: ElementPath) -> dict:
     """Returns the feature spec for the first custom feature in a given Feature Studio."""
-    feature_specs = get_feature_specs(api, feature_studio_path)
+    return _first_feature_spec(get_feature_specs(api, feature_studio_path))
+
+
+async def get_feature_spec_async(
+    api: AsyncApi, feature_studio_path: ElementPath
+) -> dict:
+    """Async version of get_feature_spec."""
+    return _first_feature_spec(await get_feature_specs_async(api, feature_studio_path))
+
+
+def _first_feature_spec(feature_specs: dict) -> dict:
     if len(feature_specs["featureSpecs"]) < 1:
         raise ValueError(
             "The specified feature studio did not have any custom features"
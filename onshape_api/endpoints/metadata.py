@@ -1,31 +1,85 @@
-from typing import Any
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
 from onshape_api.api.api_base import Api
 from onshape_api.paths.api_path import api_path
 from onshape_api.paths.paths import ElementPath, InstancePath
 
+if TYPE_CHECKING:
+    from onshape_api.api.async_api_base import AsyncApi
+
 
 def get_instance_metadata(api: Api, path: InstancePath) -> dict:
-    query = {"includeComputedProperties": False}
-    return api.get(api_path("metadata", path, InstancePath), query=query)
+    return api.get(_instance_metadata_path(path), query=_metadata_query())
+
+
+async def get_instance_metadata_async(api: AsyncApi, path: InstancePath) -> dict:
+    """Async version of get_instance_metadata."""
+    return await api.get(_instance_metadata_path(path), query=_metadata_query())
+
+
+def _instance_metadata_path(path: InstancePath) -> str:
+    return api_path("metadata", path, InstancePath)
 
 
 def get_all_element_metadata(api: Api, instance_path: InstancePath):
     return api.get(
-        api_path("metadata", instance_path, InstancePath, "e"),
-        query={"includeComputedProperties": False},
+        _all_element_metadata_path(instance_path),
+        query=_metadata_query(),
+    )
+
+
+async def get_all_element_metadata_async(api: AsyncApi, instance_path: InstancePath):
+    """Async version of get_all_element_metadata."""
+    return await api.get(
+        _all_element_metadata_path(instance_path),
+        query=_metadata_query(),
     )
 
 
+def _all_element_metadata_path(instance_path: InstancePath) -> str:
+    return api_path("metadata", instance_path, InstancePath, "e")
+
+
 def get_element_metadata(api: Api, element_path: ElementPath):
-    query = {"includeComputedProperties": False}
-    return api.get(api_path("metadata", element_path, ElementPath), query=query)
+    return api.get(_element_metadata_path(element_path), query=_metadata_query())
+
+
+async def get_element_metadata_async(api: AsyncApi, element_path: ElementPath):
+    """Async version of get_element_metadata."""
+    return await api.get(_element_metadata_path(element_path), query=_metadata_query())
+
+
+def _element_metadata_path(element_path: ElementPath) -> str:
+    return api_path("metadata", element_path, ElementPath)
+
+
+def _metadata_query() -> dict:
+    return {"includeComputedProperties": False}
 
 
 def update_element_metadata(
     api: Api, element_path: ElementPath, property_id: str, value: Any
 ):
-    body = {
+    return api.post(
+        _element_metadata_path(element_path),
+        body=_element_metadata_body(property_id, value),
+        idempotent=True,
+    )
+
+
+async def update_element_metadata_async(
+    api: AsyncApi, element_path: ElementPath, property_id: str, value: Any
+):
+    """Async version of update_element_metadata."""
+    return await api.post(
+        _element_metadata_path(element_path),
+        body=_element_metadata_body(property_id, value),
+        idempotent=True,
+    )
+
+
+def _element_metadata_body(property_id: str, value: Any) -> dict:
+    return {
         "jsonType": "metadata-element",
         "properties": [{"propertyId": property_id, "value": value}],
     }
-    return api.post(api_path("metadata", element_path, ElementPath), body=body)
@@ -1,3 +1,5 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
 import json
 
 from onshape_api.api.api_base import Api
@@ -6,13 +8,26 @@ from onshape_api.paths.api_path import api_path
 from onshape_api.paths.instance_type import InstanceType
 from onshape_api.paths.paths import ElementPath, InstancePath
 
+if TYPE_CHECKING:
+    from onshape_api.api.async_api_base import AsyncApi
+
 
 def create_part_studio(api: Api, instance_path: InstancePath, name: str) -> dict:
     """Creates a part studio in a document."""
     assert_workspace(instance_path)
-    return api.post(
-        api_path("partstudios", instance_path, InstancePath), body={"name": name}
-    )
+    return api.post(_create_part_studio_path(instance_path), body={"name": name})
+
+
+async def create_part_studio_async(
+    api: AsyncApi, instance_path: InstancePath, name: str
+) -> dict:
+    """Async version of create_part_studio."""
+    assert_workspace(instance_path)
+    return await api.post(_create_part_studio_path(instance_path), body={"name": name})
+
+
+def _create_part_studio_path(instance_path: InstancePath) -> str:
+    return api_path("partstudios", instance_path, InstancePath)
 
 
 def evaluate_feature_script(
@@ -23,12 +38,32 @@ def evaluate_feature_script(
     Returns the printed output of the script parsed as JSON.
     """
     result = api.post(
-        api_path("partstudios", part_studio_path, ElementPath, "featurescript"),
+        _feature_script_path(part_studio_path),
         body={"script": script},
+        # Scripts are evaluated without modifying the part studio
+        idempotent=True,
+        invalidates=False,
     )
     return json.loads(result["console"])
 
 
+async def evaluate_feature_script_async(
+    api: AsyncApi, part_studio_path: ElementPath, script: str
+) -> dict:
+    """Async version of evaluate_feature_script."""
+    result = await api.post(
+        _feature_script_path(part_studio_path),
+        body={"script": script},
+        idempotent=True,
+        invalidates=False,
+    )
+    return json.loads(result["console"])
+
+
+def _feature_script_path(part_studio_path: ElementPath) -> str:
+    return api_path("partstudios", part_studio_path, ElementPath, "featurescript")
+
+
 def add_feature(
     api: Api,
     part_studio_path: ElementPath,
@@ -38,8 +73,33 @@ def add_feature(
 ):
     """Adds a feature to a part studio."""
     assert_instance_type(part_studio_path, InstanceType.WORKSPACE)
+    return api.post(
+        _features_path(part_studio_path),
+        body=_feature_body(name, namespace, feature_type),
+    )
+
 
-    body = {
+async def add_feature_async(
+    api: AsyncApi,
+    part_studio_path: ElementPath,
+    name: str,
+    namespace: str,
+    feature_type: str,
+):
+    """Async version of add_feature."""
+    assert_instance_type(part_studio_path, InstanceType.WORKSPACE)
+    return await api.post(
+        _features_path(part_studio_path),
+        body=_feature_body(name, namespace, feature_type),
+    )
+
+
+def _features_path(part_studio_path: ElementPath) -> str:
+    return api_path("partstudios", part_studio_path, ElementPath, "features")
+
+
+def _feature_body(name: str, namespace: str, feature_type: str) -> dict:
+    return {
         "btType": "BTFeatureDefinitionCall-1406",
         "feature": {
             "btType": "BTMFeature-134",
@@ -48,7 +108,3 @@ def add_feature(
             "featureType": feature_type,
         },
     }
-
-    return api.post(
-        api_path("partstudios", part_studio_path, ElementPath, "features"), body=body
-    )
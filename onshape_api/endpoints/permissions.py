@@ -1,10 +1,17 @@
+from __future__ import annotations
+import asyncio
+from concurrent import futures
 from enum import StrEnum
 import http
+from typing import TYPE_CHECKING, Iterable
 from onshape_api.api.api_base import Api
 from onshape_api.exceptions import ApiError
 from onshape_api.paths.api_path import api_path
 from onshape_api.paths.paths import DocumentPath
 
+if TYPE_CHECKING:
+    from onshape_api.api.async_api_base import AsyncApi
+
 
 class Permission(StrEnum):
     READ = "READ"
@@ -18,30 +25,129 @@ class Permission(StrEnum):
     OWNER = "OWNER"
 
 
-def get_permissions(api: Api, document_path: DocumentPath) -> list[Permission]:
+PERMISSIONS_CACHE_TTL = 30
+"""The number of seconds a user's permissions may be cached for.
+
+Kept short so changes to sharing take effect quickly.
+"""
+
+MAX_BATCH_WORKERS = 8
+"""The default max number of permission checks made concurrently by a batch."""
+
+
+def get_permissions(
+    api: Api,
+    document_path: DocumentPath,
+    cache_ttl: float | None = PERMISSIONS_CACHE_TTL,
+) -> list[Permission]:
+    """
+    Args:
+        cache_ttl: The number of seconds the permissions may be cached for. Cached permissions are scoped to the Api's user.
+    """
+    try:
+        permissions = api.get(_permissions_path(document_path), cache_ttl=cache_ttl)
+    except ApiError as error:
+        return _handle_permissions_error(error)
+    return [Permission(permission) for permission in permissions]
+
+
+async def get_permissions_async(
+    api: AsyncApi,
+    document_path: DocumentPath,
+    cache_ttl: float | None = PERMISSIONS_CACHE_TTL,
+) -> list[Permission]:
+    """Async version of get_permissions."""
     try:
-        permissions = api.get(
-            api_path(
-                "documents",
-                document_path,
-                DocumentPath,
-                "permissionset",
-                skip_document_d=True,
-            )
+        permissions = await api.get(
+            _permissions_path(document_path), cache_ttl=cache_ttl
         )
     except ApiError as error:
-        if error.status_code == http.HTTPStatus.FORBIDDEN:
-            # If a document isn't shared at all, get permissions can return a 403 Forbidden, so report no perms in that case
-            return []
-        else:
-            raise error
+        return _handle_permissions_error(error)
     return [Permission(permission) for permission in permissions]
 
 
+def get_permissions_batch(
+    api: Api,
+    document_paths: Iterable[DocumentPath],
+    max_workers: int = MAX_BATCH_WORKERS,
+) -> dict[str, list[Permission]]:
+    """Fetches the permissions of many documents concurrently.
+
+    Returns a dict mapping document ids to permissions. Each document is only fetched once.
+
+    Args:
+        max_workers: The max number of permissions to fetch at once.
+    """
+    unique_paths = _unique_paths(document_paths)
+    if len(unique_paths) <= 1:
+        return dict(
+            (document_id, get_permissions(api, path))
+            for document_id, path in unique_paths.items()
+        )
+    with futures.ThreadPoolExecutor(max_workers) as executor:
+        results = executor.map(
+            lambda path: get_permissions(api, path), unique_paths.values()
+        )
+        return dict(zip(unique_paths.keys(), results))
+
+
+async def get_permissions_batch_async(
+    api: AsyncApi,
+    document_paths: Iterable[DocumentPath],
+    max_workers: int = MAX_BATCH_WORKERS,
+) -> dict[str, list[Permission]]:
+    """Async version of get_permissions_batch."""
+    unique_paths = _unique_paths(document_paths)
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def get(path: DocumentPath) -> list[Permission]:
+        async with semaphore:
+            return await get_permissions_async(api, path)
+
+    results = await asyncio.gather(*(get(path) for path in unique_paths.values()))
+    return dict(zip(unique_paths.keys(), results))
+
+
+def _unique_paths(document_paths: Iterable[DocumentPath]) -> dict[str, DocumentPath]:
+    return dict((path.document_id, path) for path in document_paths)
+
+
+def _permissions_path(document_path: DocumentPath) -> str:
+    return api_path(
+        "documents",
+        document_path,
+        DocumentPath,
+        "permissionset",
+        skip_document_d=True,
+    )
+
+
+def _handle_permissions_error(error: ApiError) -> list[Permission]:
+    if error.status_code == http.HTTPStatus.FORBIDDEN:
+        # If a document isn't shared at all, get permissions can return a 403 Forbidden, so report no perms in that case
+        return []
+    else:
+        raise error
+
+
 def has_permissions(
     api: Api, document_path: DocumentPath, *needed_permissions: Permission
 ) -> bool:
     permissions = get_permissions(api, document_path)
+    return _has_all(permissions, needed_permissions)
+
+
+async def has_permissions_async(
+    api: AsyncApi, document_path: DocumentPath, *needed_permissions: Permission
+) -> bool:
+    """Async version of has_permissions."""
+    permissions = await get_permissions_async(api, document_path)
+    return _has_all(permissions, needed_permissions)
+
+
+def _has_all(
+    permissions: list[Permission], needed_permissions: Iterable[Permission]
+) -> bool:
     for permission in needed_permissions:
         if permission not in permissions:
             return False
@@ -1,12 +1,37 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
 import re
 from onshape_api.api.api_base import Api
-from onshape_api.endpoints.versions import get_latest_version, get_versions
+from onshape_api.endpoints.versions import (
+    get_latest_version,
+    get_latest_version_async,
+    get_versions,
+    get_versions_async,
+)
 from onshape_api.model.constants import STD_PATH
 
+if TYPE_CHECKING:
+    from onshape_api.api.async_api_base import AsyncApi
+
+STD_VERSIONS_CACHE_TTL = 3600
+"""The number of seconds the list of std versions may be cached for. New std versions are released infrequently."""
+
 
 def get_latest_std_version(api: Api) -> str:
     """Returns the name of the latest version of the Onshape std."""
-    response = get_latest_version(api, STD_PATH)
+    return _parse_latest_version(
+        get_latest_version(api, STD_PATH, cache_ttl=STD_VERSIONS_CACHE_TTL)
+    )
+
+
+async def get_latest_std_version_async(api: AsyncApi) -> str:
+    """Async version of get_latest_std_version."""
+    return _parse_latest_version(
+        await get_latest_version_async(api, STD_PATH, cache_ttl=STD_VERSIONS_CACHE_TTL)
+    )
+
+
+def _parse_latest_version(response: dict) -> str:
     version_number = _extract_version_number(response["name"])
     if version_number == None:
         raise ValueError("Failed to parse Onshape std version: " + response["name"])
@@ -18,8 +43,21 @@ def get_std_versions(api: Api) -> list[str]:
 
     The versions are in reverse chronological order, with the oldest version first.
     """
+    return _parse_versions(
+        get_versions(api, STD_PATH, cache_ttl=STD_VERSIONS_CACHE_TTL)
+    )
+
+
+async def get_std_versions_async(api: AsyncApi) -> list[str]:
+    """Async version of get_std_versions."""
+    return _parse_versions(
+        await get_versions_async(api, STD_PATH, cache_ttl=STD_VERSIONS_CACHE_TTL)
+    )
+
+
+def _parse_versions(response: list[dict]) -> list[str]:
     # Omit "Start" version
-    response = get_versions(api, STD_PATH)[1:]
+    response = response[1:]
     version_numbers = map(
         lambda version: _extract_version_number(version["name"]), response
     )
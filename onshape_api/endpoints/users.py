@@ -1,6 +1,13 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
 from onshape_api.api.api_base import Api
 from onshape_api.paths.api_path import api_path
 
+if TYPE_CHECKING:
+    from onshape_api.api.async_api_base import AsyncApi
+
+_SESSION_INFO_PATH = api_path("users", end_route="sessioninfo")
+
 
 def ping(api: Api, catch: bool = False) -> bool:
     """Pings the Onshape API's users/sessioninfo endpoint.
@@ -11,7 +18,18 @@ def ping(api: Api, catch: bool = False) -> bool:
         catch: True to return False in place of any thrown exceptions.
     """
     try:
-        api.get(api_path("users", end_route="sessioninfo"))
+        api.get(_SESSION_INFO_PATH)
+        return True
+    except Exception as e:
+        if catch:
+            return False
+        raise e
+
+
+async def ping_async(api: AsyncApi, catch: bool = False) -> bool:
+    """Async version of ping."""
+    try:
+        await api.get(_SESSION_INFO_PATH)
         return True
     except Exception as e:
         if catch:
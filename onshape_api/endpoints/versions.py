@@ -1,13 +1,19 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
 from onshape_api.paths.api_path import api_path
 from onshape_api.api.api_base import Api
 from onshape_api.paths.paths import DocumentPath, InstancePath
 
+if TYPE_CHECKING:
+    from onshape_api.api.async_api_base import AsyncApi
+
 
 def get_versions(
     api: Api,
     document_path: DocumentPath,
     offset: int = 0,
     limit: int = 0,
+    cache_ttl: float | None = None,
 ) -> list[dict]:
     """Fetches a list of versions of a document.
 
@@ -16,15 +22,49 @@ def get_versions(
     Args:
         offset: A starting offset to apply. Does not support negative indexing.
         limit: The max number of versions to return.
+        cache_ttl: The number of seconds the response may be cached for. If None, the response isn't cached.
     """
     return api.get(
-        api_path("documents", document_path, DocumentPath, "versions"),
-        query={offset: offset, limit: limit},
+        _versions_path(document_path),
+        cache_ttl=cache_ttl,
+        query=_versions_query(offset, limit),
+    )
+
+
+async def get_versions_async(
+    api: AsyncApi,
+    document_path: DocumentPath,
+    offset: int = 0,
+    limit: int = 0,
+    cache_ttl: float | None = None,
+) -> list[dict]:
+    """Async version of get_versions."""
+    return await api.get(
+        _versions_path(document_path),
+        cache_ttl=cache_ttl,
+        query=_versions_query(offset, limit),
     )
 
 
-def get_latest_version(api: Api, document_path: DocumentPath) -> dict:
-    return get_versions(api, document_path)[-1]
+def _versions_path(document_path: DocumentPath) -> str:
+    return api_path("documents", document_path, DocumentPath, "versions")
+
+
+def _versions_query(offset: int, limit: int) -> dict:
+    return {offset: offset, limit: limit}
+
+
+def get_latest_version(
+    api: Api, document_path: DocumentPath, cache_ttl: float | None = None
+) -> dict:
+    return get_versions(api, document_path, cache_ttl=cache_ttl)[-1]
+
+
+async def get_latest_version_async(
+    api: AsyncApi, document_path: DocumentPath, cache_ttl: float | None = None
+) -> dict:
+    """Async version of get_latest_version."""
+    return (await get_versions_async(api, document_path, cache_ttl=cache_ttl))[-1]
 
 
 def create_version(
@@ -34,12 +74,31 @@ def create_version(
     description: str,
 ) -> dict:
     """Creates a new version of a document from a given instance."""
+    return api.post(
+        _versions_path(instance_path),
+        body=_version_body(instance_path, version_name, description),
+    )
+
+
+async def create_version_async(
+    api: AsyncApi,
+    instance_path: InstancePath,
+    version_name: str,
+    description: str,
+) -> dict:
+    """Async version of create_version."""
+    return await api.post(
+        _versions_path(instance_path),
+        body=_version_body(instance_path, version_name, description),
+    )
+
+
+def _version_body(
+    instance_path: InstancePath, version_name: str, description: str
+) -> dict:
     body = {
         "name": version_name,
         "description": description,
     }
     body.update(InstancePath.to_api_object(instance_path))
-    return api.post(
-        api_path("documents", instance_path, DocumentPath, "versions"),
-        body=body,
-    )
+    return body
@@ -118,19 +118,19 @@ def parse_args() -> argparse.Namespace:
 def main():
     args = parse_args()
     if args.action in ["release", "test-release"]:
-        api = key_api.make_key_api()
-        release(
-            api,
-            args.script,
-            args.description,
-            version_type=args.version,
-            is_prerelease=args.beta,
-            create_frontend_version=args.make_version,
-            test=(args.action == "test-release"),
-        )
+        with key_api.make_key_api() as api:
+            release(
+                api,
+                args.script,
+                args.description,
+                version_type=args.version,
+                is_prerelease=args.beta,
+                create_frontend_version=args.make_version,
+                test=(args.action == "test-release"),
+            )
     elif args.action == "sync-versions":
-        api = key_api.make_key_api()
-        sync_versions(api)
+        with key_api.make_key_api() as api:
+            sync_versions(api)
 
 
 if __name__ == "__main__":
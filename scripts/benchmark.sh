@@ -0,0 +1,3 @@
+#! /bin/sh
+# A simple wrapper for run_benchmarks.py
+python benchmarks/run_benchmarks.py "$@"
\ No newline at end of file
@@ -0,0 +1,3 @@
+#! /bin/sh
+# A simple wrapper for rebuild_link_index.py
+python -m backend.rebuild_link_index "$@"
\ No newline at end of file
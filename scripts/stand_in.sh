@@ -0,0 +1,3 @@
+#! /bin/sh
+# A simple wrapper for stand_in_cli.py
+python stand_in/stand_in_cli.py "$@"
\ No newline at end of file
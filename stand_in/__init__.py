@@ -0,0 +1,2 @@
+from .fixtures import *
+from .server import *
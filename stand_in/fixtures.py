@@ -0,0 +1,180 @@
+"""Stores recorded Onshape responses as json fixture files.
+
+Each fixture is a single json file describing a request (method, path, query and a hash of its body)
+and the response Onshape returned. Fixtures are grouped into a folder per endpoint, e.g. documents/.
+"""
+
+from __future__ import annotations
+import base64
+import dataclasses
+import hashlib
+import json
+import os
+import pathlib
+import re
+import threading
+from typing import Any
+from urllib import parse
+
+__all__ = ["Fixture", "FixtureStore", "normalize_path", "normalize_query", "hash_body"]
+
+API_PREFIX_MATCH = re.compile(r"^/api(/v\d+)?")
+"""Matches the /api/v portion of a request path."""
+
+
+def normalize_path(path: str) -> str:
+    """Removes the /api/v portion of path, so fixtures don't depend on the API version used to record them."""
+    return API_PREFIX_MATCH.sub("", path)
+
+
+def normalize_query(query: str) -> str:
+    """Sorts the parameters of a query string so equivalent queries match."""
+    return parse.urlencode(sorted(parse.parse_qsl(query, keep_blank_values=True)))
+
+
+def hash_body(body: bytes | str) -> str | None:
+    """Returns a hash identifying a request body, or None if body is empty.
+
+    Json bodies are normalized first, so key order and whitespace don't matter.
+    """
+    if len(body) == 0:
+        return None
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True)
+    except ValueError:
+        pass
+    if isinstance(body, str):
+        body = body.encode()
+    return hashlib.sha256(body).hexdigest()
+
+
+@dataclasses.dataclass
+class Fixture:
+    """A recorded request and response.
+
+    Attributes:
+        method: The HTTP method of the request.
+        path: The normalized path of the request, e.g. /documents/d/...
+        query: The normalized query of the request. If None, the fixture matches requests with any query.
+        body_hash: A hash of the request body. If None, the fixture matches requests with any body.
+        status: The status of the response.
+        content_type: The Content-Type of the response.
+        response: The response body. Json is stored parsed, text as a string, and binary data as base64.
+        encoding: How response is stored; one of "json", "text" or "base64".
+    """
+
+    method: str
+    path: str
+    query: str | None = ""
+    body_hash: str | None = None
+    status: int = 200
+    content_type: str = "application/json"
+    response: Any = None
+    encoding: str = "json"
+
+    @staticmethod
+    def from_response(
+        method: str,
+        path: str,
+        query: str,
+        body: bytes | str,
+        status: int,
+        content_type: str,
+        content: bytes,
+    ) -> Fixture:
+        """Constructs a fixture from a raw request and response."""
+        fixture = Fixture(
+            method,
+            normalize_path(path),
+            normalize_query(query),
+            hash_body(body),
+            status,
+            content_type,
+        )
+        try:
+            fixture.response = json.loads(content)
+        except ValueError:
+            try:
+                fixture.response = content.decode()
+                fixture.encoding = "text"
+            except UnicodeDecodeError:
+                fixture.response = base64.b64encode(content).decode()
+                fixture.encoding = "base64"
+        return fixture
+
+    def key(self) -> str:
+        return make_key(self.method, self.path, self.query, self.body_hash)
+
+    def content(self) -> bytes:
+        """Returns the body of the response."""
+        if self.encoding == "base64":
+            return base64.b64decode(self.response)
+        elif self.encoding == "text":
+            return self.response.encode()
+        return json.dumps(self.response).encode()
+
+
+def make_key(method: str, path: str, query: str | None, body_hash: str | None) -> str:
+    return "\n".join(
+        [method.upper(), path, "*" if query is None else query, body_hash or "*"]
+    )
+
+
+class FixtureStore:
+    """A thread safe collection of fixtures, optionally backed by a directory."""
+
+    def __init__(self, directory: str | os.PathLike | None = None) -> None:
+        """
+        Args:
+            directory: The directory to load and save fixtures from. If None, fixtures are only kept in memory.
+        """
+        self.directory = pathlib.Path(directory) if directory is not None else None
+        self._fixtures: dict[str, Fixture] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._fixtures)
+
+    def load(self) -> None:
+        """Loads every fixture in directory."""
+        if self.directory is None or not self.directory.exists():
+            return
+        with self._lock:
+            for file in sorted(self.directory.glob("**/*.json")):
+                fixture = Fixture(**json.loads(file.read_text()))
+                self._fixtures[fixture.key()] = fixture
+
+    def find(
+        self, method: str, path: str, query: str, body: bytes | str
+    ) -> Fixture | None:
+        """Returns the fixture matching a request, or None if there isn't one.
+
+        Fixtures which match the query and body exactly are preferred over fixtures which match any query or body.
+        """
+        path = normalize_path(path)
+        query = normalize_query(query)
+        body_hash = hash_body(body)
+        with self._lock:
+            for fixture_query in [query, None]:
+                for fixture_body_hash in [body_hash, None]:
+                    key = make_key(method, path, fixture_query, fixture_body_hash)
+                    if (fixture := self._fixtures.get(key)) is not None:
+                        return fixture
+            return None
+
+    def add(self, fixture: Fixture, save: bool = True) -> None:
+        """Adds a fixture, replacing any existing fixture for the same request.
+
+        Args:
+            save: Whether to also write the fixture to directory.
+        """
+        key = fixture.key()
+        with self._lock:
+            self._fixtures[key] = fixture
+            if not save or self.directory is None:
+                return
+            folder = self.directory / (fixture.path.strip("/").split("/")[0] or "root")
+            folder.mkdir(parents=True, exist_ok=True)
+            file = folder / (hashlib.sha256(key.encode()).hexdigest()[:16] + ".json")
+            file.write_text(json.dumps(dataclasses.asdict(fixture), indent=4))
@@ -0,0 +1,216 @@
+"""A local stand-in for the Onshape REST API.
+
+In replay mode, requests are answered using recorded fixtures.
+In record mode, requests are forwarded to Onshape and the responses are saved as fixtures.
+Requests are signed without reference to the host, so KeyApi and OAuthApi credentials work unchanged through the stand-in.
+"""
+
+from __future__ import annotations
+import dataclasses
+import random
+import threading
+import time
+
+import flask
+import requests
+from werkzeug import serving
+
+from stand_in.fixtures import Fixture, FixtureStore
+
+__all__ = ["StandInOptions", "StandInStats", "create_app", "StandInServer"]
+
+FORWARDED_HEADERS = ["Authorization", "Date", "On-Nonce", "Content-Type", "Accept"]
+"""Request headers forwarded to Onshape when recording."""
+
+STATS_ROUTE = "/stand-in/stats"
+
+
+@dataclasses.dataclass
+class StandInOptions:
+    """Options controlling how the stand-in responds.
+
+    Attributes:
+        upstream: The url of Onshape, e.g. https://cad.onshape.com. If set, the stand-in records rather than replays.
+        latency: The number of seconds to wait before responding.
+        jitter: The max number of seconds randomly added to latency.
+        error_rate: The fraction of requests which fail with error_status.
+        error_status: The status of injected errors, e.g. 429 or 503.
+        retry_after: If set, injected errors include a Retry-After header with this value.
+        seed: A seed used to make latency and errors reproducible.
+    """
+
+    upstream: str | None = None
+    latency: float = 0
+    jitter: float = 0
+    error_rate: float = 0
+    error_status: int = 503
+    retry_after: int | None = None
+    seed: int | None = None
+
+
+@dataclasses.dataclass
+class StandInStats:
+    """Counts of the requests received by the stand-in.
+
+    Attributes:
+        requests: The total number of requests, including injected errors.
+        misses: The number of requests without a matching fixture.
+        errors: The number of injected errors.
+    """
+
+    requests: int = 0
+    misses: int = 0
+    errors: int = 0
+
+
+def create_app(
+    store: FixtureStore, options: StandInOptions | None = None
+) -> flask.Flask:
+    """Creates a flask app which stands in for Onshape.
+
+    The app also exposes GET /stand-in/stats, which returns StandInStats, and DELETE /stand-in/stats, which resets them.
+    """
+    options = options or StandInOptions()
+    stats = StandInStats()
+    lock = threading.Lock()
+    rng = random.Random(options.seed)
+
+    app = flask.Flask(__name__)
+    app.extensions["stand_in"] = stats
+
+    @app.get(STATS_ROUTE)
+    def get_stats():
+        with lock:
+            return dataclasses.asdict(stats)
+
+    @app.delete(STATS_ROUTE)
+    def reset_stats():
+        with lock:
+            stats.requests = stats.misses = stats.errors = 0
+        return {}
+
+    @app.route(
+        "/<path:path>", methods=["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD"]
+    )
+    def handle_request(path: str):
+        with lock:
+            stats.requests += 1
+            delay = options.latency + rng.uniform(0, options.jitter)
+            inject_error = rng.random() < options.error_rate
+            if inject_error:
+                stats.errors += 1
+        if delay > 0:
+            time.sleep(delay)
+
+        if inject_error:
+            headers = {}
+            if options.retry_after is not None:
+                headers["Retry-After"] = str(options.retry_after)
+            return (
+                {"message": "Injected error", "status": options.error_status},
+                options.error_status,
+                headers,
+            )
+
+        request = flask.request
+        query = request.query_string.decode()
+        body = request.get_data()
+        if options.upstream is not None:
+            return record(store, options.upstream, request.path, query, body)
+
+        fixture = store.find(request.method, request.path, query, body)
+        if fixture is None:
+            with lock:
+                stats.misses += 1
+            return (
+                {
+                    "message": "No fixture for {} {}".format(
+                        request.method, request.full_path
+                    ),
+                    "status": 404,
+                },
+                404,
+            )
+        return flask.Response(
+            fixture.content(), fixture.status, content_type=fixture.content_type
+        )
+
+    return app
+
+
+def record(
+    store: FixtureStore, upstream: str, path: str, query: str, body: bytes
+) -> flask.Response:
+    """Forwards a request to Onshape and records its response."""
+    request = flask.request
+    headers = {
+        name: value
+        for name in FORWARDED_HEADERS
+        if (value := request.headers.get(name)) is not None
+    }
+    res = requests.request(
+        request.method,
+        upstream + path + ("?" + query if query else ""),
+        data=body,
+        headers=headers,
+        allow_redirects=False,
+    )
+    content_type = res.headers.get("Content-Type", "application/json")
+    # Transient failures aren't worth replaying
+    if res.status_code != 429 and res.status_code < 500:
+        store.add(
+            Fixture.from_response(
+                request.method,
+                path,
+                query,
+                body,
+                res.status_code,
+                content_type,
+                res.content,
+            )
+        )
+    response = flask.Response(res.content, res.status_code, content_type=content_type)
+    if location := res.headers.get("Location"):
+        response.headers["Location"] = location
+    return response
+
+
+class StandInServer:
+    """Runs a stand-in app on a background thread.
+
+    May be used as a context manager, e.g. with StandInServer(app) as server: ...
+    """
+
+    def __init__(
+        self, app: flask.Flask, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        """
+        Args:
+            port: The port to listen on. If 0, a free port is chosen.
+        """
+        self._server = serving.make_server(host, port, app, threaded=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """The url to use as the base_url of an Api, e.g. http://127.0.0.1:8080."""
+        return "http://{}:{}".format(self._server.host, self._server.port)
+
+    def serve_forever(self) -> None:
+        """Serves requests on the current thread rather than a background thread."""
+        self._server.serve_forever()
+
+    def start(self) -> StandInServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._thread.join()
+        self._server.server_close()
+
+    def __enter__(self) -> StandInServer:
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
@@ -0,0 +1,90 @@
+"""Defines a command line parser for the `stand-in` command.
+
+To use the stand-in, set API_BASE_URL to its url, e.g. API_BASE_URL=http://localhost:8080.
+"""
+
+import argparse
+
+from stand_in.fixtures import FixtureStore
+from stand_in.server import StandInOptions, create_app
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run a local stand-in for the Onshape API."
+    )
+    parser.add_argument(
+        "-f",
+        "--fixtures",
+        default="stand_in_fixtures",
+        help="the directory fixtures are stored in",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="the host to listen on")
+    parser.add_argument(
+        "-p", "--port", type=int, default=8080, help="the port to listen on"
+    )
+
+    subparsers = parser.add_subparsers(required=True, dest="action")
+    record_parser = subparsers.add_parser(
+        "record",
+        help="forward requests to Onshape and record the responses",
+        description="Forward requests to Onshape and record the responses as fixtures.",
+    )
+    record_parser.add_argument(
+        "--upstream",
+        default="https://cad.onshape.com",
+        help="the url of Onshape",
+    )
+
+    replay_parser = subparsers.add_parser(
+        "replay",
+        help="respond to requests using recorded fixtures",
+        description="Respond to requests using recorded fixtures.",
+    )
+    replay_parser.add_argument(
+        "--latency", type=float, default=0, help="seconds to wait before responding"
+    )
+    replay_parser.add_argument(
+        "--jitter", type=float, default=0, help="max seconds randomly added to latency"
+    )
+    replay_parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0,
+        help="the fraction of requests which fail",
+    )
+    replay_parser.add_argument(
+        "--error-status", type=int, default=503, help="the status of injected errors"
+    )
+    replay_parser.add_argument(
+        "--retry-after",
+        type=int,
+        help="the Retry-After header to send with injected errors",
+    )
+    replay_parser.add_argument(
+        "--seed", type=int, help="a seed used to make latency and errors reproducible"
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    store = FixtureStore(args.fixtures)
+    if args.action == "record":
+        options = StandInOptions(upstream=args.upstream)
+    else:
+        options = StandInOptions(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            retry_after=args.retry_after,
+            seed=args.seed,
+        )
+    app = create_app(store, options)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
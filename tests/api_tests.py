@@ -0,0 +1,447 @@
+import asyncio
+import http
+import io
+import pathlib
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import httpx
+import requests
+
+import onshape_api
+
+from onshape_api.api.api_base import Api
+from onshape_api.api.async_key_api import AsyncKeyApi
+from onshape_api.api.cache import DiskCache, LruCache, TieredCache
+from onshape_api.api.hooks import make_route
+from onshape_api.api.memo import RequestMemo, get_document_key
+from onshape_api.api.rate_limit import TokenBucket, get_shared_rate_limiter
+from onshape_api.api.request_log import log_response, preview_body, redact_headers
+from onshape_api.api.retry import RetryPolicy, parse_retry_after
+from onshape_api.api.single_flight import AsyncSingleFlight, SingleFlight
+from onshape_api.endpoints.documents import get_document_async
+from onshape_api.endpoints.part_studios import evaluate_feature_script
+from onshape_api.exceptions import ApiError
+from onshape_api.paths.paths import DocumentPath, ElementPath
+
+
+def make_response(status: int, text: str = "{}", headers: dict = {}):
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(text.encode())
+    response.headers.update(headers)
+    return response
+
+
+class FakeApi(Api):
+    """An Api which returns queued responses instead of calling Onshape."""
+
+    def __init__(self, *responses: requests.Response, **kwargs):
+        super().__init__(**kwargs)
+        self.responses = list(responses)
+        self.sent = []
+
+    def _send(self, method, url, body, headers):
+        self.sent.append((method, url))
+        return self.responses.pop(0)
+
+
+@mock.patch("time.sleep")
+class TestRetry(unittest.TestCase):
+    def test_get_retries_server_errors(self, sleep):
+        api = FakeApi(make_response(503), make_response(200, '{"id": 1}'))
+        self.assertEqual(api.get("/documents"), {"id": 1})
+        self.assertEqual(len(api.sent), 2)
+
+    def test_post_not_retried_by_default(self, sleep):
+        api = FakeApi(make_response(503), make_response(200))
+        with self.assertRaises(ApiError):
+            api.post("/documents")
+        self.assertEqual(len(api.sent), 1)
+
+    def test_idempotent_post_retried(self, sleep):
+        api = FakeApi(make_response(502), make_response(200))
+        api.post("/documents", idempotent=True)
+        self.assertEqual(len(api.sent), 2)
+
+    def test_throttled_post_retried(self, sleep):
+        api = FakeApi(
+            make_response(429, headers={"Retry-After": "2"}), make_response(200)
+        )
+        api.post("/documents")
+        sleep.assert_called_once_with(2.0)
+
+    def test_max_retries(self, sleep):
+        api = FakeApi(
+            *[make_response(500) for _ in range(3)],
+            retry_policy=RetryPolicy(max_retries=2)
+        )
+        with self.assertRaises(ApiError) as context:
+            api.get("/documents")
+        self.assertEqual(
+            context.exception.status_code, http.HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+        self.assertEqual(len(api.sent), 3)
+
+    def test_large_retry_after_not_retried(self, sleep):
+        api = FakeApi(make_response(429, headers={"Retry-After": "3600"}))
+        with self.assertRaises(ApiError):
+            api.get("/documents")
+        sleep.assert_not_called()
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_backoff_bounds(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+        for attempt in range(6):
+            delay = policy.get_delay(attempt)
+            assert delay is not None
+            self.assertLessEqual(delay, min(5, 2**attempt))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("7"), 7.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+class TestRateLimit(unittest.TestCase):
+    def test_burst_then_spaced(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, places=2)
+
+    def test_shared_limiter(self):
+        first = get_shared_rate_limiter("user", rate=5)
+        self.assertIs(first, get_shared_rate_limiter("user", rate=5))
+        self.assertIsNot(first, get_shared_rate_limiter("other", rate=5))
+
+
+class TestCache(unittest.TestCase):
+    def test_lru_evicts_least_recently_used(self):
+        cache = LruCache(max_bytes=20)
+        cache.set("a", "a" * 8)
+        cache.set("b", "b" * 8)
+        cache.get("a")
+        cache.set("c", "c" * 8)
+        self.assertEqual(cache.get("a"), (True, "a" * 8))
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_expired_entries_missed(self):
+        cache = LruCache(max_bytes=100)
+        cache.set("a", 1, ttl=-1)
+        self.assertEqual(cache.get("a"), (False, None))
+        self.assertEqual(cache.stats.misses, 1)
+
+    def test_disk_tier_promoted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            DiskCache(directory, max_bytes=1000).set("a", {"id": 1})
+            cache = TieredCache(LruCache(1000), DiskCache(directory, max_bytes=1000))
+            self.assertEqual(cache.get("a"), (True, {"id": 1}))
+            self.assertEqual(cache.fast.get("a"), (True, {"id": 1}))
+
+    def test_disk_evicts_in_batches(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = DiskCache(directory, max_bytes=1000)
+            with mock.patch.object(cache, "_evict", wraps=cache._evict) as evict:
+                for i in range(30):
+                    cache.set(str(i), "x" * 50)
+            total = sum(file.stat().st_size for file in cache.directory.glob("*.json"))
+            self.assertLessEqual(total, 1000)
+            self.assertEqual(cache._size, total)
+            # Each eviction frees room for several more sets
+            self.assertLess(evict.call_count, cache.stats.evictions)
+            self.assertEqual(cache.get("29"), (True, "x" * 50))
+            self.assertEqual(cache.get("0"), (False, None))
+
+    def test_api_caches_versions(self):
+        api = FakeApi(
+            make_response(200, '{"id": 1}'),
+            make_response(200, '{"id": 2}'),
+            cache=LruCache(1000),
+        )
+        self.assertEqual(api.get("/documents/d/abc/v/def/e/ghi"), {"id": 1})
+        self.assertEqual(api.get("/documents/d/abc/v/def/e/ghi"), {"id": 1})
+        self.assertEqual(len(api.sent), 1)
+        # Workspaces may change, so they aren't cached
+        api.get("/documents/d/abc/w/def/e/ghi")
+        self.assertEqual(len(api.sent), 2)
+
+
+class TestRequestMemo(unittest.TestCase):
+    def test_document_key(self):
+        self.assertEqual(get_document_key("/documents/d/abc/w/def"), "abc")
+        self.assertEqual(get_document_key("/documents/abc/permissionset"), "abc")
+        self.assertEqual(get_document_key("/versions/d/abc"), "abc")
+        self.assertEqual(
+            get_document_key("/documents/d/abc/w/def/externalreferences"), ""
+        )
+
+    def test_identical_gets_memoized(self):
+        api = FakeApi(make_response(200, '{"id": 1}'), memo=RequestMemo())
+        value = api.get("/documents/abc")
+        value["id"] = 2
+        self.assertEqual(api.get("/documents/abc"), {"id": 1})
+        self.assertEqual(len(api.sent), 1)
+
+    def test_write_invalidates_document(self):
+        api = FakeApi(
+            make_response(200, '{"id": 1}'),
+            make_response(200, '{"id": 2}'),
+            make_response(200),
+            make_response(200, '{"id": 3}'),
+            memo=RequestMemo(),
+        )
+        api.get("/documents/d/abc/versions")
+        api.get("/documents/d/other/versions")
+        api.post("/versions/d/abc")
+        self.assertEqual(api.get("/documents/d/abc/versions"), {"id": 3})
+        self.assertEqual(api.get("/documents/d/other/versions"), {"id": 2})
+        self.assertEqual(len(api.sent), 4)
+
+    def test_script_evaluation_keeps_memo(self):
+        memo = RequestMemo()
+        api = FakeApi(
+            make_response(200, '{"id": 1}'),
+            make_response(200, '{"console": "{}"}'),
+            memo=memo,
+        )
+        api.get("/documents/d/abc/versions")
+        generation = memo.generation()
+        evaluate_feature_script(api, ElementPath("abc", "w", "e"), "function")
+        self.assertEqual(memo.generation(), generation)
+        self.assertEqual(api.get("/documents/d/abc/versions"), {"id": 1})
+        self.assertEqual(len(api.sent), 2)
+
+    def test_raced_write_not_memoized(self):
+        memo = RequestMemo()
+        generation = memo.generation()
+        memo.invalidate("/documents/d/abc")
+        memo.set("key", "/documents/d/abc", {"id": 1}, generation)
+        self.assertEqual(memo.get("key", "/documents/d/abc"), (False, None))
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_coalesced(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return {"id": 1}
+
+        results = []
+        leader = threading.Thread(
+            target=lambda: results.append(single_flight.do("a", fetch))
+        )
+        leader.start()
+        started.wait()
+        follower = threading.Thread(
+            target=lambda: results.append(single_flight.do("a", fetch))
+        )
+        follower.start()
+        # Give the follower time to start waiting on the leader
+        follower.join(0.05)
+        release.set()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"id": 1}, {"id": 1}])
+        self.assertIsNot(results[0], results[1])
+
+    def test_async_calls_coalesced(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return {"id": 1}
+
+        async def run():
+            return await asyncio.gather(
+                single_flight.do("a", fetch), single_flight.do("a", fetch)
+            )
+
+        first, second = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    def test_leader_mutation_not_shared(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        shared = {"id": 1}
+
+        def fetch():
+            started.set()
+            release.wait()
+            return shared
+
+        def lead():
+            result = single_flight.do("a", fetch)
+            for i in range(1000):
+                result[str(i)] = i
+            results["leader"] = result
+
+        results = {}
+        leader = threading.Thread(target=lead)
+        leader.start()
+        started.wait()
+        followers = [
+            threading.Thread(
+                target=lambda i=i: results.update({i: single_flight.do("a", fetch)})
+            )
+            for i in range(4)
+        ]
+        for follower in followers:
+            follower.start()
+        # Give the followers time to start waiting on the leader
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join()
+
+        self.assertIsNot(results["leader"], shared)
+        for i in range(4):
+            self.assertEqual(results[i], {"id": 1})
+
+    def test_async_leader_mutation_not_shared(self):
+        single_flight = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0)
+            return {"id": 1}
+
+        async def lead():
+            result = await single_flight.do("a", fetch)
+            result["mutated"] = True
+            return result
+
+        async def run():
+            return await asyncio.gather(lead(), single_flight.do("a", fetch))
+
+        leader, follower = asyncio.run(run())
+        self.assertEqual(leader, {"id": 1, "mutated": True})
+        self.assertEqual(follower, {"id": 1})
+
+    def test_async_errors_shared(self):
+        single_flight = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0)
+            raise ValueError()
+
+        async def run():
+            return await asyncio.gather(
+                single_flight.do("a", fetch),
+                single_flight.do("a", fetch),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        self.assertIsInstance(results[0], ValueError)
+        self.assertIsInstance(results[1], ValueError)
+
+
+@mock.patch("time.sleep")
+class TestHooks(unittest.TestCase):
+    def test_make_route(self, sleep):
+        path = "/partstudios/d/{}/w/{}/e/{}/features".format(
+            "a" * 24, "b" * 24, "c" * 24
+        )
+        self.assertEqual(
+            make_route(path), "/partstudios/d/{did}/w/{wid}/e/{eid}/features"
+        )
+
+    def test_record_includes_retries(self, sleep):
+        records = []
+        api = FakeApi(
+            make_response(503),
+            make_response(200, '{"id": 1}'),
+            hooks=[records.append],
+        )
+        api.get("/documents/d/" + "a" * 24)
+
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(record.method, "GET")
+        self.assertEqual(record.route, "/documents/d/{did}")
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.retries, 1)
+        self.assertEqual(record.bytes, len('{"id": 1}'))
+
+    def test_failed_request_recorded(self, sleep):
+        records = []
+        api = FakeApi(make_response(404), hooks=[records.append])
+        with self.assertRaises(ApiError):
+            api.post("/documents")
+        self.assertEqual(records[0].status, 404)
+
+
+class TestRequestLog(unittest.TestCase):
+    def test_redact_headers(self):
+        headers = redact_headers(
+            {"Authorization": "On key:HmacSHA256:signature", "Accept": "*/*"}
+        )
+        self.assertEqual(headers, {"Authorization": "On <redacted>", "Accept": "*/*"})
+
+    def test_preview_truncated(self):
+        self.assertEqual(preview_body(b"abcdef", limit=3), "abc... (6 bytes)")
+        self.assertEqual(preview_body("abc", limit=3), "abc")
+
+    def test_success_body_not_read_at_info(self):
+        res = mock.Mock(status_code=200, url="https://cad.onshape.com")
+        type(res).content = mock.PropertyMock(side_effect=AssertionError)
+        with self.assertLogs("onshape_api", "INFO"):
+            log_response(res)
+
+    def test_error_body_logged(self):
+        res = mock.Mock(status_code=404, url="https://cad.onshape.com", content=b"{}")
+        with self.assertLogs("onshape_api", "ERROR") as logs:
+            log_response(res)
+        self.assertIn("details: {}", logs.output[0])
+
+
+class TestAsyncApi(unittest.TestCase):
+    def test_retry_resigns(self):
+        nonces = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonces.append(request.headers["On-Nonce"])
+            if len(nonces) == 1:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"name": "Robot"})
+
+        async def run():
+            async with AsyncKeyApi("access", "secret") as api:
+                api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+                return await get_document_async(api, DocumentPath("1"))
+
+        with mock.patch("asyncio.sleep"):
+            self.assertEqual(asyncio.run(run()), {"name": "Robot"})
+        self.assertEqual(len(nonces), 2)
+        self.assertNotEqual(nonces[0], nonces[1])
+
+    def test_lazy_import(self):
+        self.assertIs(onshape_api.AsyncKeyApi, AsyncKeyApi)
+        # Sync-only users shouldn't need httpx installed
+        code = "import sys, onshape_api, onshape_api.endpoints.documents; assert 'httpx' not in sys.modules"
+        subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            cwd=pathlib.Path(__file__).parent.parent,
+        )
@@ -0,0 +1,140 @@
+import unittest
+
+from backend.common import assembly_data
+from onshape_api.paths.paths import ElementPath, PartPath
+
+
+def make_part(element_id: str, part_id: str, mate_ids: list[str], **kwargs) -> dict:
+    return {
+        "documentId": "d",
+        "elementId": element_id,
+        "partId": part_id,
+        "configuration": "default",
+        "mateConnectors": [{"featureId": mate_id} for mate_id in mate_ids],
+        **kwargs,
+    }
+
+
+def make_instance(instance_id: str, part: dict) -> dict:
+    keys = ["documentId", "elementId", "partId", "configuration", "documentVersion"]
+    return {"id": instance_id, "type": "Part"} | dict(
+        (key, part[key]) for key in keys if key in part
+    )
+
+
+class TestAssembly(unittest.TestCase):
+    def setUp(self):
+        self.first = make_part("e1", "p1", ["m1", "m2"])
+        self.second = make_part("e2", "p1", ["m3"], documentVersion="v")
+        self.third = make_part("e1", "p2", [])
+        self.instances = [
+            make_instance("i1", self.first),
+            make_instance("i2", self.second),
+            make_instance("i3", self.first),
+        ]
+        self.assembly = assembly_data.Assembly(
+            {
+                "parts": [self.first, self.second, self.third],
+                "rootAssembly": {"instances": self.instances},
+            },
+            ElementPath("d", "w", "a"),
+        )
+
+    def test_get_part_from_instance(self):
+        self.assertIs(
+            self.assembly.get_part_from_instance(self.instances[0]), self.first
+        )
+        self.assertIs(
+            self.assembly.get_part_from_instance(self.instances[1]), self.second
+        )
+        self.assertIs(
+            self.assembly.get_part_from_instance(self.instances[2]), self.first
+        )
+        with self.assertRaises(ValueError):
+            self.assembly.get_part_from_instance(
+                make_instance("i4", make_part("e3", "p1", []))
+            )
+
+    def test_get_instance(self):
+        self.assertIs(self.assembly.get_instance("i2"), self.instances[1])
+        self.assertIsNone(self.assembly.get_instance("missing"))
+
+    def test_mate_connector_indexes(self):
+        first_path = PartPath.from_path(ElementPath("d", "w", "e1"), "p1")
+        self.assertEqual(
+            self.assembly.get_part_paths_to_mate_ids(),
+            {
+                first_path: ["m1", "m2"],
+                self.assembly.resolve_part_path(self.second): ["m3"],
+            },
+        )
+        self.assertEqual(
+            self.assembly.get_mate_connector_part_paths("m2"), [first_path]
+        )
+        self.assertEqual(self.assembly.get_mate_connector_part_paths("m4"), [])
+
+    def test_extract_unique_part_studios(self):
+        self.assertEqual(len(self.assembly.extract_unique_part_studios()), 2)
+
+
+def make_mate(feature_id: str, mate_type: str, connectors: list[tuple[str, str]]):
+    return {
+        "featureType": "mate",
+        "featureId": feature_id,
+        "parameters": [
+            {"parameterId": "mateType", "value": mate_type},
+            {
+                "parameterId": "mateConnectorsQuery",
+                "queries": [
+                    {"featureId": mate_id, "path": [instance_id]}
+                    for instance_id, mate_id in connectors
+                ],
+            },
+        ],
+    }
+
+
+class TestAssemblyFeatures(unittest.TestCase):
+    def setUp(self):
+        self.features = assembly_data.AssemblyFeatures(
+            {
+                "features": [
+                    make_mate("f1", "FASTENED", [("i1", "m1"), ("i2", "m3")]),
+                    make_mate("f2", "REVOLUTE", [("i1", "m2")]),
+                    make_mate("f3", "FASTENED", [("i1", "m4")]),
+                    {"featureType": "mateConnector", "featureId": "f4"},
+                ]
+            }
+        )
+
+    def test_fastened_mates(self):
+        self.assertEqual(
+            [feature["featureId"] for feature in self.features.get_fastened_mates()],
+            ["f1", "f3"],
+        )
+
+    def test_used_mate_connectors(self):
+        instance = {"id": "i1"}
+        self.assertEqual(self.features.get_used_mate_connectors(instance), {"m1", "m4"})
+        self.assertTrue(self.features.is_mate_connector_used(instance, "m1"))
+        self.assertFalse(self.features.is_mate_connector_used(instance, "m2"))
+        self.assertFalse(self.features.is_mate_connector_used({"id": "i3"}, "m1"))
+        self.assertEqual(
+            self.features.get_unused_mate_connectors(instance, ["m1", "m2", "m3"]),
+            ["m2", "m3"],
+        )
+
+    def test_get_parameter(self):
+        feature = self.features.get_features()[0]
+        self.assertEqual(
+            assembly_data.get_parameter(feature, "mateType")["value"], "FASTENED"
+        )
+        self.assertIn(
+            "mateConnectorsQuery", self.features.get_feature_parameters(feature)
+        )
+        with self.assertRaises(ValueError):
+            assembly_data.get_parameter(feature, "missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
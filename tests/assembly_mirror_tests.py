@@ -0,0 +1,106 @@
+import os
+import unittest
+from unittest import mock
+
+# The backend reads its credentials on import
+for key in ["OAUTH_CLIENT_ID", "OAUTH_CLIENT_SECRET", "SESSION_SECRET"]:
+    os.environ.setdefault(key, "test")
+
+from backend.common import assembly_data
+from backend.endpoints import assembly_mirror, generate_assembly
+from onshape_api.paths.paths import ElementPath, PartPath
+
+
+def make_fastened_mate(connectors: list[tuple[str, str]]) -> dict:
+    return {
+        "featureType": "mate",
+        "parameters": [
+            {"parameterId": "mateType", "value": "FASTENED"},
+            {
+                "parameterId": "mateConnectorsQuery",
+                "queries": [
+                    {"featureId": mate_id, "path": [instance_id]}
+                    for instance_id, mate_id in connectors
+                ],
+            },
+        ],
+    }
+
+
+def make_candidate(
+    instance_id: str, element_id: str, mate_ids: list[str], features: dict
+) -> assembly_mirror.AssemblyMirrorCandidate:
+    assembly = mock.Mock()
+    assembly.get_part_from_instance.return_value = {
+        "mateConnectors": [{"featureId": mate_id} for mate_id in mate_ids]
+    }
+    assembly.resolve_part_path.return_value = PartPath("d", "w", element_id, "p")
+    return assembly_mirror.AssemblyMirrorCandidate(
+        {"id": instance_id}, assembly, assembly_data.AssemblyFeatures(features)
+    )
+
+
+class TestAssemblyMirror(unittest.TestCase):
+    def setUp(self):
+        self.features = {"features": [make_fastened_mate([("i1", "m1"), ("i2", "m3")])]}
+        self.mirror = assembly_mirror.AssemblyMirror(
+            mock.Mock(), ElementPath("d", "w", "a")
+        )
+
+    def test_mate_connector_used(self):
+        features = assembly_data.AssemblyFeatures(self.features)
+        self.assertTrue(features.is_mate_connector_used({"id": "i1"}, "m1"))
+        self.assertFalse(features.is_mate_connector_used({"id": "i1"}, "m3"))
+        self.assertFalse(features.is_mate_connector_used({"id": "i3"}, "m1"))
+
+    def test_candidate_mate_connectors(self):
+        candidate = make_candidate("i1", "e1", ["m1", "m2"], self.features)
+        self.assertEqual(candidate.mate_connectors, {"m1": True, "m2": False})
+        self.assertFalse(candidate.all_used())
+        self.assertTrue(make_candidate("i2", "e2", ["m3"], self.features).all_used())
+
+    def test_fully_used_candidates_not_evaluated(self):
+        candidates = [
+            make_candidate("i1", "e1", ["m1", "m2"], self.features),
+            make_candidate("i2", "e2", ["m3"], self.features),
+        ]
+        part_studios = self.mirror._collect_part_studios(candidates)
+        self.assertEqual(part_studios, {candidates[0].element_path})
+
+    def test_mate_mirror_eligibility(self):
+        candidate = make_candidate("i1", "e1", ["m1", "m2", "m4"], self.features)
+        self.assertTrue(
+            self.mirror._is_elibible_for_mate_mirror(candidate, {"m2": "m4"})
+        )
+        self.assertFalse(
+            self.mirror._is_elibible_for_mate_mirror(candidate, {"m1": "m2"})
+        )
+        self.assertFalse(self.mirror._is_elibible_for_mate_mirror(candidate, {}))
+
+
+class TestGenerateAssembly(unittest.TestCase):
+    @mock.patch.object(generate_assembly, "assemblies")
+    def test_parts_grouped(self, assemblies):
+        assemblies.create_assembly.return_value = {"id": "a"}
+        assemblies.get_assembly.return_value = {
+            "rootAssembly": {"instances": [{"id": "i1"}, {"id": "i2"}]}
+        }
+        part_studio_path = ElementPath("d", "w", "e")
+        api = mock.Mock()
+
+        assembly_path = generate_assembly.do_generate_assembly(
+            api, part_studio_path, "Assembly"
+        )
+
+        self.assertEqual(str(assembly_path), str(ElementPath("d", "w", "a")))
+        self.assertEqual(
+            [str(arg) for arg in assemblies.add_parts.call_args.args[1:]],
+            [str(assembly_path), str(part_studio_path)],
+        )
+        group_mate = assemblies.add_feature.call_args.args[2]
+        self.assertIn("i1", str(group_mate))
+        self.assertIn("i2", str(group_mate))
+
+
+if __name__ == "__main__":
+    unittest.main()
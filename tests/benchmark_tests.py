@@ -0,0 +1,44 @@
+import tempfile
+import unittest
+
+from benchmarks.run_benchmarks import run_once
+from benchmarks.synthetic import DocumentSize, SyntheticOnshape
+from benchmarks.workflows import WORKFLOWS
+from stand_in.fixtures import FixtureStore
+from stand_in.server import StandInServer, create_app
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_workflows_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FixtureStore(directory)
+            size = DocumentSize(feature_studios=2, parts=3, mates=2, external_refs=2)
+            onshape = SyntheticOnshape(size, store)
+            onshape.generate()
+
+            app = create_app(store)
+            with StandInServer(app) as server:
+                for workflow in WORKFLOWS:
+                    with self.subTest(workflow.name):
+                        _, calls, _ = run_once(
+                            workflow, server.base_url, onshape, trace_memory=False
+                        )
+                        self.assertGreater(calls, 0)
+            self.assertEqual(app.extensions["stand_in"].misses, 0)
+
+    def test_assembly_mirror_evaluates_part_studios(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FixtureStore(directory)
+            size = DocumentSize(feature_studios=1, parts=3, mates=1, external_refs=1)
+            onshape = SyntheticOnshape(size, store)
+            onshape.generate()
+
+            workflow = next(w for w in WORKFLOWS if w.name == "assembly-mirror")
+            app = create_app(store)
+            with StandInServer(app) as server:
+                _, calls, _ = run_once(
+                    workflow, server.base_url, onshape, trace_memory=False
+                )
+            # The assembly, its features, and one evaluation of the part studio
+            self.assertEqual(calls, 3)
+            self.assertEqual(app.extensions["stand_in"].misses, 0)
@@ -0,0 +1,64 @@
+import os
+import unittest
+from unittest import mock
+
+import flask
+
+# The backend reads its credentials on import
+for key in ["OAUTH_CLIENT_ID", "OAUTH_CLIENT_SECRET", "SESSION_SECRET"]:
+    os.environ.setdefault(key, "test")
+
+from backend.common import connect, token_refresh
+
+
+def make_db(session_data: dict | None) -> mock.Mock:
+    db = mock.Mock()
+    doc = db.sessions.document.return_value.get.return_value
+    doc.exists = session_data is not None
+    doc.to_dict.return_value = session_data
+    return db
+
+
+class TestSessionCache(unittest.TestCase):
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        self.app.secret_key = "test"
+        connect._session_cache = connect.LruCache(connect.SESSION_CACHE_BYTES)
+
+    def test_cache_hit_skips_firestore(self):
+        db = make_db({"token": {"access_token": "abc"}})
+        with self.app.test_request_context():
+            connect.get_token(db)
+            self.assertEqual(connect.get_token(db), {"access_token": "abc"})
+        db.sessions.document.return_value.get.assert_called_once()
+
+    def test_save_token_writes_through(self):
+        db = make_db({"token": {"access_token": "old"}})
+        with self.app.test_request_context():
+            connect.get_token(db)
+            connect.save_token(db, {"access_token": "new"})
+            self.assertEqual(connect.get_token(db), {"access_token": "new"})
+        db.sessions.document.return_value.set.assert_called_once_with(
+            {"token": {"access_token": "new"}}
+        )
+
+    def test_missing_session_not_cached(self):
+        db = make_db(None)
+        with self.app.test_request_context():
+            self.assertIsNone(connect.get_token(db))
+            connect.get_token(db)
+        self.assertEqual(db.sessions.document.return_value.get.call_count, 2)
+
+    def test_adopted_token_cached(self):
+        db = make_db({"token": {"access_token": "old"}})
+        new_token = {"access_token": "new"}
+        with self.app.test_request_context():
+            session = connect.get_oauth_session(db)
+            # Another worker has already refreshed and saved the token
+            with mock.patch.object(
+                token_refresh, "acquire_lease", return_value=(False, new_token)
+            ):
+                session.refresh_token(connect.token_url)
+            self.assertEqual(connect.get_token(db), new_token)
+        db.sessions.document.return_value.get.assert_called_once()
+        db.sessions.document.return_value.set.assert_not_called()
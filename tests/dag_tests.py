@@ -0,0 +1,50 @@
+import threading
+import unittest
+
+from backend.common import dag
+
+
+class TestDag(unittest.TestCase):
+    def test_topological_sort(self):
+        dependencies = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+        order = dag.topological_sort(dependencies)
+        for node, node_dependencies in dependencies.items():
+            for dependency in node_dependencies:
+                self.assertLess(order.index(dependency), order.index(node))
+
+    def test_cycle_reported(self):
+        dependencies = {"a": [], "b": ["a", "d"], "c": ["b"], "d": ["c"]}
+        with self.assertRaises(dag.CycleError) as context:
+            dag.topological_sort(dependencies)
+        cycle = context.exception.cycle
+        self.assertEqual(cycle[0], cycle[-1])
+        self.assertEqual(set(cycle), {"b", "c", "d"})
+
+    def test_run_dag_runs_independent_nodes_concurrently(self):
+        dependencies = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+        # b and c can only both pass the barrier if they run at the same time
+        barrier = threading.Barrier(2, timeout=5)
+        finished = []
+
+        def fn(node: str) -> str:
+            if node in ("b", "c"):
+                barrier.wait()
+            finished.append(node)
+            return node.upper()
+
+        results = dag.run_dag(dependencies, fn, max_workers=4)
+        self.assertEqual(results, {"a": "A", "b": "B", "c": "C", "d": "D"})
+        self.assertEqual(finished[0], "a")
+        self.assertEqual(finished[-1], "d")
+
+    def test_run_dag_stops_on_error(self):
+        dependencies = {"a": [], "b": ["a"]}
+        started = []
+
+        def fn(node: str) -> None:
+            started.append(node)
+            raise ValueError(node)
+
+        with self.assertRaises(ValueError):
+            dag.run_dag(dependencies, fn, max_workers=2)
+        self.assertEqual(started, ["a"])
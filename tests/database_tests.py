@@ -0,0 +1,45 @@
+import os
+import threading
+import unittest
+from unittest import mock
+
+import flask
+
+from backend.common import database
+
+
+@mock.patch("google.cloud.firestore.Client")
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        database._reset_client()
+
+    def tearDown(self):
+        database._reset_client()
+
+    def test_client_shared_between_threads(self, client):
+        threads = [threading.Thread(target=database.Database) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        client.assert_called_once()
+
+    def test_one_database_per_request(self, client):
+        app = flask.Flask(__name__)
+        with app.test_request_context():
+            self.assertIs(database.get_database(), database.get_database())
+        with app.test_request_context():
+            first = database.get_database()
+        with app.test_request_context():
+            self.assertIsNot(database.get_database(), first)
+        client.assert_called_once()
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_client_recreated_after_fork(self, client):
+        database.get_client()
+        pid = os.fork()
+        if pid == 0:
+            # Exit without running the test runner's cleanup in the child
+            os._exit(0 if database._client is None else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
@@ -0,0 +1,91 @@
+import threading
+import unittest
+from unittest import mock
+
+from backend.common import evaluate, scripts
+from onshape_api.api.cache import LruCache
+from onshape_api.paths.instance_type import InstanceType
+from onshape_api.paths.paths import ElementPath
+
+BASE_RESULT = {
+    "valid": True,
+    "mates": [
+        {
+            "mateId": "m1",
+            "documentId": "d",
+            "workspaceOrVersion": "v",
+            "workspaceId": "v1",
+            "elementId": "e",
+        }
+    ],
+    "mirrors": [
+        {"endMateId": "m2", "mateToOrigin": True},
+        {"endMateId": "m3", "mateToOrigin": False, "startMateId": "m4"},
+    ],
+}
+"""The output of the base script, see backend/scripts/parseBase.fs."""
+
+
+class TestEvaluate(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        lock = threading.Lock()
+
+        def evaluate_feature_script(api, part_studio_path, script):
+            with lock:
+                self.calls.append(str(part_studio_path))
+            if script == scripts.BASE_SCRIPT:
+                return BASE_RESULT
+            return {"targetMateId": "target " + part_studio_path.element_id}
+
+        patches = [
+            mock.patch.object(
+                evaluate, "evaluate_feature_script", evaluate_feature_script
+            ),
+            mock.patch.object(scripts, "get_script", lambda name: name),
+            mock.patch.object(evaluate, "_evaluation_cache", LruCache(100_000)),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.api = mock.Mock(user_key="user")
+
+    def test_targets_deduplicated(self):
+        first = ElementPath("d", "w", "e1")
+        second = ElementPath("d", "w", "e2")
+        mates_to_targets = {
+            "m1": first,
+            "m2": ElementPath("d", "w", "e1"),
+            "m3": second,
+        }
+        result = evaluate.evaluate_targets(self.api, mates_to_targets)
+        self.assertEqual(
+            result, {"m1": "target e1", "m2": "target e1", "m3": "target e2"}
+        )
+        self.assertEqual(sorted(self.calls), sorted([str(first), str(second)]))
+
+    def test_versions_cached_across_calls(self):
+        version = ElementPath("d", "v", "e1", InstanceType.VERSION)
+        workspace = ElementPath("d", "w", "e1")
+        for _ in range(2):
+            evaluate.evaluate_scripts(self.api, "script", [version, workspace])
+        self.assertEqual(self.calls.count(str(version)), 1)
+        self.assertEqual(self.calls.count(str(workspace)), 2)
+
+    def test_cache_scoped_to_user(self):
+        version = ElementPath("d", "v", "e1", InstanceType.VERSION)
+        evaluate.evaluate_scripts(self.api, "script", [version])
+        evaluate.evaluate_scripts(mock.Mock(user_key="other"), "script", [version])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_base_script_parsed(self):
+        paths = [ElementPath("d", "w", "e1")]
+        self.assertEqual(
+            evaluate.evaluate_assembly_mirror_parts(self.api, paths),
+            ({"m3": "m4"}, {"m2"}),
+        )
+        part_maps = evaluate.evalute_auto_assembly_parts(self.api, paths)
+        self.assertEqual(
+            part_maps.mates_to_targets,
+            {"m1": ElementPath("d", "v1", "e", InstanceType.VERSION)},
+        )
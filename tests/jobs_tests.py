@@ -0,0 +1,204 @@
+import os
+import threading
+import unittest
+from unittest import mock
+
+import flask
+
+# The backend reads its credentials on import
+for key in ["OAUTH_CLIENT_ID", "OAUTH_CLIENT_SECRET", "SESSION_SECRET"]:
+    os.environ.setdefault(key, "test")
+
+from backend.common import backend_exceptions, jobs, metrics
+from backend.endpoints import jobs as jobs_endpoints
+from onshape_api.api.hooks import RequestRecord
+
+
+class TestJobs(unittest.TestCase):
+    def setUp(self):
+        self.store = jobs.MemoryJobStore()
+        patch = mock.patch.object(jobs, "get_store", return_value=self.store)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        self.app = flask.Flask(__name__)
+        self.app.secret_key = "test"
+        self.app.register_blueprint(jobs_endpoints.router)
+        self.job_fn = lambda context: {"value": 1}
+
+        @self.app.errorhandler(backend_exceptions.ClientException)
+        def client_exception(e: backend_exceptions.ClientException):
+            return e.to_dict(), e.status_code
+
+        @self.app.post("/start")
+        def start():
+            return jobs.submit("test", self.job_fn)
+
+        self.client = self.app.test_client()
+
+    def start(self, idempotency_key: str | None = None) -> dict:
+        headers = {jobs.IDEMPOTENCY_HEADER: idempotency_key} if idempotency_key else {}
+        response = self.client.post("/start", headers=headers)
+        self.assertEqual(response.status_code, 202)
+        return response.get_json()
+
+    def wait(self, job_id: str) -> dict:
+        for _ in range(500):
+            job = self.client.get("/jobs/" + job_id).get_json()
+            if job["status"] in jobs.FINISHED:
+                return job
+            threading.Event().wait(0.01)
+        self.fail("Job didn't finish")
+
+    def test_job_succeeds(self):
+        def job_fn(context: jobs.JobContext) -> dict:
+            context.progress("Halfway", 1, 2)
+            return {"value": 1}
+
+        self.job_fn = job_fn
+        job = self.wait(self.start()["jobId"])
+        self.assertEqual(job["status"], jobs.JobStatus.SUCCEEDED)
+        self.assertEqual(job["result"], {"value": 1})
+        self.assertEqual(job["progress"]["completed"], 1)
+
+    def test_job_fails(self):
+        def job_fn(context: jobs.JobContext) -> dict:
+            raise backend_exceptions.ClientException("Bad input.")
+
+        self.job_fn = job_fn
+        with self.assertLogs(jobs.logger, "ERROR"):
+            job = self.wait(self.start()["jobId"])
+        self.assertEqual(job["status"], jobs.JobStatus.FAILED)
+        self.assertEqual(job["error"]["message"], "Bad input.")
+
+    def test_idempotent_submit(self):
+        calls = []
+        self.job_fn = lambda context: calls.append(1) or {}
+        first = self.start("key")
+        self.wait(first["jobId"])
+        second = self.start("key")
+        self.assertEqual(first["jobId"], second["jobId"])
+        self.assertEqual(second["status"], jobs.JobStatus.SUCCEEDED)
+        self.assertEqual(len(calls), 1)
+        self.assertNotEqual(self.start("other key")["jobId"], first["jobId"])
+
+    def test_failed_job_restarted(self):
+        calls = []
+
+        def job_fn(context: jobs.JobContext) -> dict:
+            calls.append(1)
+            if len(calls) == 1:
+                raise backend_exceptions.ClientException("Bad input.")
+            return {}
+
+        self.job_fn = job_fn
+        with self.assertLogs(jobs.logger, "ERROR"):
+            first = self.wait(self.start("key")["jobId"])
+        self.assertEqual(first["status"], jobs.JobStatus.FAILED)
+        second = self.wait(self.start("key")["jobId"])
+        self.assertEqual(second["status"], jobs.JobStatus.SUCCEEDED)
+        self.assertEqual(second["createdAt"], first["createdAt"])
+        self.assertEqual(len(calls), 2)
+
+    def test_concurrent_restarts_coalesced(self):
+        self.store.create("job", {"status": jobs.JobStatus.FAILED, "createdAt": 1})
+        barrier = threading.Barrier(8)
+        restarted = []
+
+        def restart():
+            barrier.wait()
+            restarted.append(self.store.restart("job", jobs._new_job("test", "s"))[0])
+
+        threads = [threading.Thread(target=restart) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(restarted.count(True), 1)
+        self.assertEqual(self.store.get("job")["createdAt"], 1)
+
+    def test_cancel(self):
+        started = threading.Event()
+        cancelled = threading.Event()
+
+        def job_fn(context: jobs.JobContext) -> dict:
+            started.set()
+            cancelled.wait(5)
+            context.check_cancelled()
+            return {}
+
+        self.job_fn = job_fn
+        job_id = self.start()["jobId"]
+        started.wait(5)
+        response = self.client.post("/jobs/{}/cancel".format(job_id))
+        self.assertTrue(response.get_json()["cancelRequested"])
+        cancelled.set()
+        self.assertEqual(self.wait(job_id)["status"], jobs.JobStatus.CANCELLED)
+
+    def test_job_calls_reported(self):
+        registry = metrics.init_app(self.app)
+        record = RequestRecord("GET", "/documents/d/{did}", 200, 0.05, 100, 0)
+
+        @self.app.post("/start-with-calls")
+        def start_with_calls():
+            # Like connect.get_api, the Api is created by the request and handed to the job
+            [hook] = metrics.get_request_hooks()
+            hook(record)
+            return jobs.submit("test", lambda context: hook(record) or {})
+
+        with self.assertLogs(metrics.logger, "INFO") as logs:
+            job_id = self.client.post("/start-with-calls").get_json()["jobId"]
+            self.wait(job_id)
+        job_logs = [line for line in logs.output if '"method": "JOB"' in line]
+        self.assertEqual(len(job_logs), 1)
+        self.assertIn('"onshape_calls": 1', job_logs[0])
+        self.assertIn(
+            'onshape_requests_total{method="GET",route="/documents/d/{did}",status="200"} 2',
+            registry.render(),
+        )
+
+    def test_cancel_flag_cached(self):
+        store = mock.Mock()
+        store.get.return_value = {"cancelRequested": False}
+        context = jobs._StoredJobContext(store, "job")
+        for _ in range(10):
+            context.check_cancelled()
+        self.assertEqual(store.get.call_count, 1)
+        context.cancel()
+        with self.assertRaises(jobs.JobCancelled):
+            context.check_cancelled()
+        self.assertEqual(store.get.call_count, 1)
+
+    def test_cancel_from_other_worker_noticed(self):
+        store = mock.Mock()
+        store.get.return_value = {"cancelRequested": False}
+        context = jobs._StoredJobContext(store, "job")
+        with mock.patch.object(jobs, "CANCEL_CHECK_INTERVAL", 0):
+            context.check_cancelled()
+            store.get.return_value = {"cancelRequested": True}
+            with self.assertRaises(jobs.JobCancelled):
+                context.check_cancelled()
+
+    def test_other_session_cannot_see_job(self):
+        job_id = self.start()["jobId"]
+        self.wait(job_id)
+        other_client = self.app.test_client()
+        self.assertEqual(other_client.get("/jobs/" + job_id).status_code, 404)
+
+    def test_events_streamed(self):
+        def job_fn(context: jobs.JobContext) -> dict:
+            context.progress("First", 1, 2)
+            context.progress("Second", 2, 2)
+            return {}
+
+        self.job_fn = job_fn
+        job_id = self.start()["jobId"]
+        self.wait(job_id)
+        response = self.client.get(
+            "/jobs/{}/events".format(job_id), headers={"Last-Event-ID": "1"}
+        )
+        body = response.get_data(as_text=True)
+        self.assertEqual(response.mimetype, "text/event-stream")
+        self.assertNotIn("First", body)
+        self.assertIn("Second", body)
+        self.assertIn("event: status", body)
@@ -0,0 +1,226 @@
+import itertools
+import os
+import unittest
+from unittest import mock
+
+from google.cloud import firestore
+
+# The backend reads its credentials on import
+for key in ["OAUTH_CLIENT_ID", "OAUTH_CLIENT_SECRET", "SESSION_SECRET"]:
+    os.environ.setdefault(key, "test")
+
+from backend.common import backend_exceptions
+from backend.endpoints import linked_documents
+from backend.endpoints.linked_documents import LinkType
+from onshape_api.paths.paths import InstancePath
+
+
+class FakeLinkedDocuments:
+    """Stands in for the linked-documents collection, applying transaction writes immediately."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, dict] = {}
+        self.reads = 0
+        self.linked_documents = mock.Mock()
+        self.linked_documents.document.side_effect = lambda db_id: db_id
+        self.db = mock.Mock()
+        self.db.get_all.side_effect = self.get_all
+        self.db.transaction.return_value = self
+
+    def get_all(self, refs, transaction=None):
+        self.reads += 1
+        for db_id in refs:
+            snapshot = mock.Mock(id=db_id, exists=db_id in self.data)
+            snapshot.to_dict.return_value = dict(self.data.get(db_id, {}))
+            yield snapshot
+
+    def set(self, db_id: str, update: dict, merge: bool) -> None:
+        doc = self.data.setdefault(db_id, {})
+        for field, value in update.items():
+            if isinstance(value, firestore.ArrayUnion):
+                current = doc.get(field, [])
+                doc[field] = current + [v for v in value.values if v not in current]
+            elif isinstance(value, firestore.ArrayRemove):
+                doc[field] = [v for v in doc.get(field, []) if v not in value.values]
+            else:
+                doc[field] = value
+
+
+class TestLinkIndex(unittest.TestCase):
+    def setUp(self):
+        patch = mock.patch.object(
+            linked_documents.firestore, "transactional", lambda fn: fn
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.db = FakeLinkedDocuments()
+
+    def assert_index_matches_links(self):
+        for field, link_type in [
+            ("descendants", LinkType.CHILDREN),
+            ("ancestors", LinkType.PARENTS),
+        ]:
+            links = dict(
+                (db_id, data.get(link_type, [])) for db_id, data in self.db.data.items()
+            )
+            expected = linked_documents.compute_closures(links.keys(), links, {})
+            for db_id, data in self.db.data.items():
+                self.assertEqual(sorted(data.get(field, [])), expected[db_id])
+
+    def test_compute_closures(self):
+        children = {"a": ["b", "c"], "b": ["d"], "c": ["d"], "d": []}
+        closures = linked_documents.compute_closures(children.keys(), children, {})
+        self.assertEqual(closures["a"], ["b", "c", "d"])
+        self.assertEqual(closures["d"], [])
+
+    def test_compute_closures_uses_known(self):
+        closures = linked_documents.compute_closures(
+            ["a"], {"a": ["b"]}, {"b": ["c", "d"]}
+        )
+        self.assertEqual(closures, {"a": ["b", "c", "d"]})
+
+    def test_link_and_unlink(self):
+        # A diamond with a tail, so unlinking one side of the diamond keeps the other path
+        edges = [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d"), ("d", "e")]
+        for parent, child in edges:
+            linked_documents.link_documents(self.db, parent, child)
+            self.assert_index_matches_links()
+        self.assertEqual(self.db.data["a"]["descendants"], ["b", "c", "d", "e"])
+
+        linked_documents.unlink_documents(self.db, "b", "d")
+        self.assert_index_matches_links()
+        self.assertEqual(sorted(self.db.data["e"]["ancestors"]), ["a", "c", "d"])
+
+        linked_documents.unlink_documents(self.db, "c", "d")
+        self.assert_index_matches_links()
+        self.assertEqual(self.db.data["a"]["descendants"], ["b", "c"])
+
+    def test_link_rejects_cycle(self):
+        for parent, child in itertools.pairwise("abc"):
+            linked_documents.link_documents(self.db, parent, child)
+        with self.assertRaises(backend_exceptions.ClientException):
+            linked_documents.link_documents(self.db, "c", "a")
+        self.assert_index_matches_links()
+
+    def test_link_indexes_unindexed_documents(self):
+        # a was linked to p before the index existed
+        self.db.data = {"a|w": {"parents": ["p|w"]}, "p|w": {"children": ["a|w"]}}
+        linked_documents.link_documents(self.db, "q|w", "a|w")
+        self.assertEqual(self.db.data["a|w"]["ancestors"], ["p|w", "q|w"])
+        self.assertTrue(self.db.data["a|w"]["indexed"])
+        graph = linked_documents.get_link_graph(
+            self.db, InstancePath("a", "w"), LinkType.PARENTS  # type: ignore
+        )
+        self.assertEqual(graph, {"a|w": ["p|w", "q|w"], "p|w": [], "q|w": []})
+
+    def test_link_rejects_cycle_without_index(self):
+        self.db.data = {
+            "a": {"children": ["b"]},
+            "b": {"parents": ["a"], "children": ["c"]},
+            "c": {"parents": ["b"]},
+        }
+        with self.assertRaises(backend_exceptions.ClientException):
+            linked_documents.link_documents(self.db, "c", "a")
+
+    def test_unlink_indexes_unindexed_documents(self):
+        self.db.data = {
+            "a": {"children": ["b", "c"]},
+            "b": {"parents": ["a"], "children": ["c"]},
+            "c": {"parents": ["a", "b"]},
+        }
+        linked_documents.unlink_documents(self.db, "b", "c")
+        self.assertEqual(self.db.data["c"]["ancestors"], ["a"])
+        self.assertEqual(self.db.data["b"]["descendants"], [])
+        self.assertEqual(self.db.data["a"]["descendants"], ["b", "c"])
+
+    def test_rebuild_marks_indexed(self):
+        self.db.data = {"a": {"children": ["b"]}, "b": {"parents": ["a"]}}
+        self.db.linked_documents.stream.return_value = [
+            mock.Mock(id=db_id, **{"to_dict.return_value": dict(data)})
+            for db_id, data in self.db.data.items()
+        ]
+        self.db.db.batch.return_value = self.db
+        self.db.commit = lambda: None
+        self.assertEqual(linked_documents.rebuild_link_index(self.db), 2)
+        self.assert_index_matches_links()
+        self.assertTrue(all(data["indexed"] for data in self.db.data.values()))
+
+    def test_get_link_graph_ignores_partial_index(self):
+        self.db.data = {
+            "a|w": {"parents": ["p|w", "q|w"], "ancestors": ["q|w"]},
+            "p|w": {"children": ["a|w"]},
+            "q|w": {"children": ["a|w"]},
+        }
+        graph = linked_documents.get_link_graph(
+            self.db, InstancePath("a", "w"), LinkType.PARENTS  # type: ignore
+        )
+        self.assertEqual(graph, {"a|w": ["p|w", "q|w"], "p|w": [], "q|w": []})
+
+    def test_get_link_graph_uses_index(self):
+        for parent, child in [("a|w", "b|w"), ("b|w", "c|w"), ("a|w", "d|w")]:
+            linked_documents.link_documents(self.db, parent, child)
+        self.db.reads = 0
+        graph = linked_documents.get_link_graph(
+            self.db, InstancePath("a", "w"), LinkType.CHILDREN  # type: ignore
+        )
+        self.assertEqual(
+            graph, {"a|w": ["b|w", "d|w"], "b|w": ["c|w"], "c|w": [], "d|w": []}
+        )
+        self.assertEqual(self.db.reads, 2)
+
+    def test_get_link_graph_without_index(self):
+        self.db.data = {"c|w": {"parents": ["b|w"]}, "b|w": {"parents": ["a|w"]}}
+        graph = linked_documents.get_link_graph(
+            self.db, InstancePath("c", "w"), LinkType.PARENTS  # type: ignore
+        )
+        self.assertEqual(graph, {"c|w": ["b|w"], "b|w": ["a|w"], "a|w": []})
+
+
+class TestMakeDocuments(unittest.TestCase):
+    def setUp(self):
+        self.metadata_calls = []
+        self.workspaces = [{"id": "w2", "name": "Second"}]
+
+        def get_document(api, path):
+            return {
+                "name": "Document " + path.document_id,
+                "defaultWorkspace": {"id": "w1", "name": "Main"},
+            }
+
+        def get_instance_metadata(api, path):
+            self.metadata_calls.append(path.instance_id)
+            return {"properties": [{"name": "Name", "value": "From metadata"}]}
+
+        patches = [
+            mock.patch.object(linked_documents, "has_permissions", return_value=True),
+            mock.patch.object(linked_documents.documents, "get_document", get_document),
+            mock.patch.object(
+                linked_documents.documents,
+                "get_workspaces",
+                lambda api, path, cache_ttl=None: self.workspaces,
+            ),
+            mock.patch.object(
+                linked_documents, "get_instance_metadata", get_instance_metadata
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_order_preserved(self):
+        paths = [InstancePath(str(i), "w1") for i in range(20)]
+        result = linked_documents.make_documents(mock.Mock(), paths, max_workers=4)
+        self.assertEqual(
+            [doc["documentId"] for doc in result], [str(i) for i in range(20)]
+        )
+        self.assertTrue(all(doc["workspaceName"] == "Main" for doc in result))
+
+    def test_workspace_name_from_listing(self):
+        [doc] = linked_documents.make_documents(mock.Mock(), [InstancePath("d", "w2")])
+        self.assertEqual(doc["workspaceName"], "Second")
+        self.assertEqual(self.metadata_calls, [])
+
+    def test_workspace_name_falls_back_to_metadata(self):
+        [doc] = linked_documents.make_documents(mock.Mock(), [InstancePath("d", "w3")])
+        self.assertEqual(doc["workspaceName"], "From metadata")
+        self.assertEqual(self.metadata_calls, ["w3"])
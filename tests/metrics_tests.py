@@ -0,0 +1,73 @@
+import unittest
+
+import flask
+
+from backend.common import metrics
+from onshape_api.api.hooks import RequestRecord
+
+
+def make_app(**kwargs) -> flask.Flask:
+    app = flask.Flask(__name__)
+    metrics.init_app(app, **kwargs)
+
+    @app.get("/api/documents/<document_id>")
+    def get_document(document_id: str):
+        for hook in metrics.get_request_hooks():
+            hook(RequestRecord("GET", "/documents/d/{did}", 200, 0.05, 100, 0))
+            hook(RequestRecord("GET", "/documents/d/{did}", 200, 0.15, 100, 1))
+        return {}
+
+    return app
+
+
+class TestMetrics(unittest.TestCase):
+    def test_server_timing(self):
+        client = make_app().test_client()
+        response = client.get("/api/documents/abc")
+        server_timing = response.headers["Server-Timing"]
+        self.assertIn('onshape;dur=200.0;desc="2 calls"', server_timing)
+
+    def test_prometheus_metrics(self):
+        client = make_app().test_client()
+        client.get("/api/documents/abc")
+        text = client.get("/metrics").get_data(as_text=True)
+
+        self.assertIn(
+            'onshape_requests_total{method="GET",route="/documents/d/{did}",status="200"} 2',
+            text,
+        )
+        self.assertIn(
+            'onshape_request_duration_seconds_bucket{method="GET",route="/documents/d/{did}",le="0.1"} 1',
+            text,
+        )
+        self.assertIn(
+            'backend_onshape_calls_count{method="GET",endpoint="/api/documents/<document_id>"} 1',
+            text,
+        )
+
+    def test_metrics_served_to_non_local_clients(self):
+        # Behind the App Engine front end, clients are never on the same machine
+        client = make_app().test_client()
+        response = client.get("/metrics", environ_base={"REMOTE_ADDR": "10.0.0.1"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_metrics_hidden_in_production(self):
+        client = make_app(serve=False).test_client()
+        self.assertEqual(client.get("/metrics").status_code, 404)
+
+    def test_metrics_require_token(self):
+        client = make_app(token="secret", serve=False).test_client()
+        environ = {"REMOTE_ADDR": "10.0.0.1"}
+        self.assertEqual(client.get("/metrics", environ_base=environ).status_code, 404)
+        response = client.get(
+            "/metrics",
+            environ_base=environ,
+            headers={"Authorization": "Bearer wrong"},
+        )
+        self.assertEqual(response.status_code, 404)
+        response = client.get(
+            "/metrics",
+            environ_base=environ,
+            headers={"Authorization": "Bearer secret"},
+        )
+        self.assertEqual(response.status_code, 200)
@@ -1,6 +1,6 @@
 import unittest
 
-from onshape_api.paths.paths import DocumentPath, ElementPath, InstancePath
+from onshape_api.paths.paths import DocumentPath, ElementPath, InstancePath, PartPath
 
 inst_path = InstancePath("1", "2")
 same_path = InstancePath("1", "2")
@@ -8,6 +8,7 @@ diff_path = InstancePath("1", "5")
 
 doc_path = DocumentPath("1")
 element_path = ElementPath("1", "2", "5")
+part_path = PartPath("1", "2", "5", "6")
 
 
 class TestPathMethods(unittest.TestCase):
@@ -42,3 +43,10 @@ class TestPathMethods(unittest.TestCase):
         self.assertFalse(doc_path in {inst_path})
         self.assertFalse(inst_path in [element_path])
         self.assertFalse(inst_path in {element_path})
+
+    def test_subclass_eq(self):
+        self.assertTrue(element_path == ElementPath("1", "2", "5"))
+        self.assertFalse(element_path == ElementPath("1", "3", "5"))
+        self.assertTrue(part_path == PartPath("1", "2", "5", "6"))
+        self.assertFalse(part_path == PartPath("1", "2", "5", "7"))
+        self.assertTrue(part_path in {PartPath("1", "2", "5", "6")})
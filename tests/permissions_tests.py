@@ -0,0 +1,35 @@
+import unittest
+
+from backend.common.backend_exceptions import (
+    MissingPermission,
+    require_permissions_batch,
+)
+from onshape_api.endpoints.permissions import Permission, get_permissions_batch
+from onshape_api.api.cache import LruCache
+from onshape_api.paths.paths import DocumentPath
+from tests.api_tests import FakeApi, make_response
+
+
+class TestPermissions(unittest.TestCase):
+    def test_batch_fetches_each_document_once(self):
+        api = FakeApi(make_response(200, '["READ"]'), make_response(200, '["READ"]'))
+        permissions = get_permissions_batch(
+            api, [DocumentPath("a"), DocumentPath("b"), DocumentPath("a")]
+        )
+        self.assertEqual(permissions, {"a": [Permission.READ], "b": [Permission.READ]})
+        self.assertEqual(len(api.sent), 2)
+
+    def test_batch_reports_missing_permission(self):
+        api = FakeApi(make_response(200, '["READ"]'), make_response(200, '["READ"]'))
+        with self.assertRaises(MissingPermission) as context:
+            require_permissions_batch(
+                api, [DocumentPath("a"), DocumentPath("b")], Permission.WRITE
+            )
+        # The first document in the batch is reported
+        self.assertEqual(context.exception.document_id, "a")
+
+    def test_permissions_cached(self):
+        api = FakeApi(make_response(200, '["READ"]'), cache=LruCache(1000))
+        for _ in range(2):
+            get_permissions_batch(api, [DocumentPath("a")])
+        self.assertEqual(len(api.sent), 1)
@@ -0,0 +1,109 @@
+import os
+import threading
+import unittest
+from unittest import mock
+
+# The backend reads its credentials on import
+for key in ["OAUTH_CLIENT_ID", "OAUTH_CLIENT_SECRET", "SESSION_SECRET"]:
+    os.environ.setdefault(key, "test")
+
+from backend.common import backend_exceptions
+from backend.endpoints import references
+from onshape_api.exceptions import ApiError
+from onshape_api.paths.paths import InstancePath
+
+EXTERNAL_REFERENCES = {
+    "latestVersions": [
+        {"documentId": "child1", "id": "v1-new"},
+        {"documentId": "child2", "id": "v2-new"},
+    ],
+    "elementExternalReferences": {
+        "e1": [
+            {
+                "documentId": "child1",
+                "id": "v1-old",
+                "isOutOfDate": True,
+                "referencedElements": ["a", "b"],
+            },
+            {
+                "documentId": "child2",
+                "id": "v2-old",
+                "isOutOfDate": True,
+                "referencedElements": ["c"],
+            },
+        ],
+        "e2": [
+            {
+                "documentId": "child2",
+                "id": "v2-old",
+                "isOutOfDate": True,
+                "referencedElements": ["c"],
+            }
+        ],
+        "e3": [
+            {
+                "documentId": "child1",
+                "id": "v1-new",
+                "isOutOfDate": False,
+                "referencedElements": ["a"],
+            }
+        ],
+    },
+}
+
+
+class TestUpdateReferences(unittest.TestCase):
+    def test_plan_groups_updates_by_element(self):
+        plan = references.plan_reference_updates(EXTERNAL_REFERENCES)
+        self.assertEqual(sorted(plan.keys()), ["e1", "e2"])
+        self.assertEqual(len(plan["e1"]), 3)
+        self.assertEqual(
+            [update.version_id for update in plan["e1"]],
+            ["v1-new", "v1-new", "v2-new"],
+        )
+
+    def test_plan_filters_child_documents(self):
+        plan = references.plan_reference_updates(EXTERNAL_REFERENCES, ["child1"])
+        self.assertEqual(list(plan.keys()), ["e1"])
+        self.assertEqual(len(plan["e1"]), 2)
+
+    def test_failures_reported_per_element(self):
+        calls = []
+        lock = threading.Lock()
+
+        def update_references(api, target_path, reference_updates):
+            with lock:
+                calls.append(target_path.element_id)
+            if target_path.element_id == "e2":
+                raise ApiError("Invalid reference")
+
+        with mock.patch.object(
+            references.documents,
+            "get_external_references",
+            return_value=EXTERNAL_REFERENCES,
+        ), mock.patch.object(
+            references.documents, "update_references", update_references
+        ), self.assertLogs(
+            references.logger, "WARNING"
+        ):
+            report = references.do_update_references(
+                mock.Mock(), InstancePath("parent", "w")
+            )
+
+        self.assertEqual(sorted(calls), ["e1", "e2"])
+        self.assertEqual(report.updated_elements, ["e1"])
+        self.assertEqual(report.failed_elements, {"e2": "Invalid reference"})
+        self.assertEqual(report.failures_to_json()[0]["documentId"], "parent")
+
+
+class TestPushDependencies(unittest.TestCase):
+    def test_parents_depend_on_children(self):
+        parents = {"c": ["b", "a"], "b": ["a"], "a": []}
+        self.assertEqual(
+            references.get_push_dependencies(parents),
+            {"c": [], "b": ["c"], "a": ["c", "b"]},
+        )
+
+    def test_missing_parent_rejected(self):
+        with self.assertRaises(backend_exceptions.ClientException):
+            references.get_push_dependencies({"c": ["b"]})
@@ -0,0 +1,72 @@
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from backend.common import scripts
+
+
+class TestScripts(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = pathlib.Path(directory.name)
+
+    def write(self, name: str, code: str) -> None:
+        (self.directory / (name + ".fs")).write_text(code)
+
+    def test_minify(self):
+        code = "function(context is Context, args)\n{\n    // A comment\n    print('// not a comment');  /* block\n comment */\n\n}\n"
+        self.assertEqual(
+            scripts.minify(code),
+            "function(context is Context, args)\n{\nprint('// not a comment');\n}",
+        )
+
+    def test_validate(self):
+        scripts.validate("valid", "function(context, args) { print('}'); }")
+        for code in [
+            "",
+            "print('a');",
+            "function(context, args) { print('a');",
+            "function(context, args) { print('a'); }}",
+            "function(context, args) { print('a); }",
+        ]:
+            with self.assertRaises(scripts.ScriptError):
+                scripts.validate("invalid", code)
+
+    def test_load(self):
+        self.write(
+            "a", "function(context, args)\n{\n    // Prints a\n    print('a');\n}"
+        )
+        self.write("b", "function(context, args) { print('b'); }")
+        registry = scripts.ScriptRegistry.load(self.directory)
+        self.assertEqual(registry.names, ["a", "b"])
+        script = registry.get("a")
+        self.assertEqual(script.code, "function(context, args)\n{\nprint('a');\n}")
+        self.assertEqual(len(script.hash), 64)
+        self.assertNotEqual(script.hash, registry.get("b").hash)
+        with self.assertRaises(scripts.ScriptError):
+            registry.get("c")
+
+    def test_load_fails_fast(self):
+        with self.assertRaises(scripts.ScriptError):
+            scripts.ScriptRegistry.load(self.directory)
+        self.write("a", "function(context, args) { print('a'); }")
+        self.write("b", "function(context, args) { print('b');")
+        with self.assertRaises(scripts.ScriptError):
+            scripts.ScriptRegistry.load(self.directory)
+
+    def test_repo_scripts_load(self):
+        scripts.ScriptRegistry.load().require(scripts.REQUIRED_SCRIPTS)
+
+    def test_missing_required_script_fails_fast(self):
+        self.write("a", "function(context, args) { print('a'); }")
+        registry = scripts.ScriptRegistry.load(self.directory)
+        registry.require(["a"])
+        with mock.patch.object(scripts, "_registry", registry):
+            with self.assertRaisesRegex(scripts.ScriptError, "parseBase"):
+                scripts.init_app(mock.Mock())
+
+
+if __name__ == "__main__":
+    unittest.main()
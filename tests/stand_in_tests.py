@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from onshape_api.api.key_api import KeyApi
+from onshape_api.endpoints.documents import get_document
+from onshape_api.exceptions import ApiError
+from onshape_api.paths.paths import DocumentPath
+from stand_in.fixtures import Fixture, FixtureStore
+from stand_in.server import StandInOptions, StandInServer, create_app
+
+
+def make_store() -> FixtureStore:
+    store = FixtureStore()
+    store.add(Fixture("GET", "/documents/abc", response={"name": "Robot"}))
+    return store
+
+
+class TestStandIn(unittest.TestCase):
+    def test_replay(self):
+        with StandInServer(create_app(make_store())) as server:
+            with KeyApi("access", "secret", base_url=server.base_url) as api:
+                self.assertEqual(
+                    get_document(api, DocumentPath("abc")), {"name": "Robot"}
+                )
+                with self.assertRaises(ApiError):
+                    get_document(api, DocumentPath("missing"))
+
+    def test_record(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FixtureStore(directory)
+            with StandInServer(create_app(make_store())) as upstream:
+                options = StandInOptions(upstream=upstream.base_url)
+                with StandInServer(create_app(store, options)) as server:
+                    with KeyApi("access", "secret", base_url=server.base_url) as api:
+                        get_document(api, DocumentPath("abc"))
+
+            fixture = FixtureStore(directory).find(
+                "GET", "/api/v8/documents/abc", "", ""
+            )
+            self.assertIsNotNone(fixture)
+            self.assertEqual(fixture.response, {"name": "Robot"})
+
+    @mock.patch("time.sleep")
+    def test_injected_errors_retried(self, sleep):
+        options = StandInOptions(error_rate=1, error_status=503)
+        app = create_app(make_store(), options)
+        with StandInServer(app) as server:
+            with KeyApi("access", "secret", base_url=server.base_url) as api:
+                with self.assertRaises(ApiError):
+                    get_document(api, DocumentPath("abc"))
+        # The first attempt plus the default three retries
+        self.assertEqual(app.extensions["stand_in"].errors, 4)
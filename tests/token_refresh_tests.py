@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from backend.common import token_refresh
+from onshape_api.api.async_oauth_api import AsyncOAuthApi
+
+
+class FakeSessions:
+    """Stands in for the sessions collection, implementing the lease like the Firestore transaction."""
+
+    def __init__(self, token: dict) -> None:
+        self.token = token
+        self.lease: str | None = None
+        self.lock = threading.Lock()
+
+    def acquire_lease(self, db, session_id, owner, old_token):
+        with self.lock:
+            if token_refresh.is_newer_token(self.token, old_token):
+                return (False, self.token)
+            if self.lease is not None and self.lease != owner:
+                return (False, self.token)
+            self.lease = owner
+            return (True, self.token)
+
+    def release_lease(self, db, session_id):
+        with self.lock:
+            self.lease = None
+
+    def save(self, token: dict) -> None:
+        with self.lock:
+            self.token = token
+            self.lease = None
+
+
+class TestTokenRefresh(unittest.TestCase):
+    def setUp(self):
+        self.old_token = {"access_token": "old", "refresh_token": "refresh"}
+        self.sessions = FakeSessions(self.old_token)
+        patches = [
+            mock.patch.object(
+                token_refresh, "acquire_lease", self.sessions.acquire_lease
+            ),
+            mock.patch.object(
+                token_refresh, "release_lease", self.sessions.release_lease
+            ),
+            mock.patch.object(token_refresh, "POLL_INTERVAL", 0.01),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def refresh_once(self, refresh) -> dict:
+        return token_refresh.refresh_once(
+            mock.Mock(), "session", self.old_token, refresh, self.sessions.save
+        )
+
+    def test_concurrent_refreshes_coalesced(self):
+        refreshes = []
+
+        def refresh():
+            refreshes.append(1)
+            time.sleep(0.05)
+            return {"access_token": "new"}
+
+        tokens = []
+        threads = [
+            threading.Thread(target=lambda: tokens.append(self.refresh_once(refresh)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(refreshes), 1)
+        self.assertEqual(tokens, [{"access_token": "new"}] * 8)
+
+    def test_sync_and_async_refreshes_coalesced(self):
+        refreshes = []
+
+        def refresh():
+            refreshes.append(1)
+            time.sleep(0.05)
+            return {"access_token": "new"}
+
+        async def refresh_async(old_token):
+            return await token_refresh.refresh_once_async(
+                mock.Mock(), "session", old_token, refresh, self.sessions.save
+            )
+
+        tokens = []
+
+        async def run():
+            async with AsyncOAuthApi(
+                self.old_token, "id", "secret", "url", token_refresher=refresh_async
+            ) as api:
+                thread = threading.Thread(
+                    target=lambda: tokens.append(self.refresh_once(refresh))
+                )
+                thread.start()
+                await api.refresh_token()
+                await asyncio.to_thread(thread.join)
+                tokens.append(api.token)
+
+        asyncio.run(run())
+        self.assertEqual(len(refreshes), 1)
+        self.assertEqual(tokens, [{"access_token": "new"}] * 2)
+
+    def test_waits_for_other_worker(self):
+        self.sessions.lease = "other worker"
+        timer = threading.Timer(0.05, self.sessions.save, [{"access_token": "new"}])
+        timer.start()
+        refresh = mock.Mock()
+        self.assertEqual(self.refresh_once(refresh), {"access_token": "new"})
+        refresh.assert_not_called()
+
+    def test_adopted_token_reported(self):
+        self.sessions.token = {"access_token": "new"}
+        save = mock.Mock()
+        adopt = mock.Mock()
+        token = token_refresh.refresh_once(
+            mock.Mock(), "session", self.old_token, mock.Mock(), save, adopt
+        )
+        self.assertEqual(token, {"access_token": "new"})
+        adopt.assert_called_once_with({"access_token": "new"})
+        save.assert_not_called()
+
+    def test_failed_refresh_releases_lease(self):
+        refresh = mock.Mock(side_effect=ValueError)
+        with self.assertRaises(ValueError):
+            self.refresh_once(refresh)
+        self.assertIsNone(self.sessions.lease)